@@ -0,0 +1,84 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : bench_import_time.py
+# Author    : ForesightInitiative
+# Version   : 1.0.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Import-time budget of the command line interface.
+
+Imports metadata_converter in a fresh interpreter with `python -X importtime`
+and checks that
+    - the cumulative import time stays within the budget (default 200 ms)
+    - pandas, openpyxl and NumPy are not imported at start-up
+The slowest imports are listed. The script exits with status 1 when the
+budget is exceeded, so it can run in pre-commit and CI hooks.
+
+Run from the repository root:
+    python benchmarks/bench_import_time.py [budget_in_ms]
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the import-time budget.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import os
+import subprocess
+import sys
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET_MS = 200
+HEAVY_MODULES = ("pandas", "openpyxl", "numpy")
+REPEAT = 5
+
+#! <%GTREE 2 Measure the imports%>
+def import_times(module_name):
+    """
+    :return: List of (module, self_us, cumulative_us) in import order.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        cwd=REPOSITORY_ROOT, capture_output=True, text=True, check=True
+    )
+    times = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times.append((name.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+#! <%GTREE 3 Run the check%>
+def main(budget_ms=DEFAULT_BUDGET_MS, module_name="metadata_converter"):
+    # best of several runs, the first one also pays for writing the .pyc files
+    runs = [import_times(module_name) for _ in range(REPEAT)]
+    totals = [next(cumulative for name, _, cumulative in times if name == module_name) for times in runs]
+    best = runs[totals.index(min(totals))]
+    total_ms = min(totals) / 1000
+
+    heavy = sorted({name.split(".")[0] for name, _, _ in best if name.split(".")[0] in HEAVY_MODULES})
+
+    print(f"import {module_name}: {total_ms:.1f} ms (budget {budget_ms} ms)")
+    print("slowest imports (self time):")
+    for name, self_us, _ in sorted(best, key=lambda item: item[1], reverse=True)[:10]:
+        print(f"    {self_us / 1000:7.1f} ms  {name}")
+
+    failures = []
+    if total_ms > budget_ms:
+        failures.append(f"import time {total_ms:.1f} ms exceeds the budget of {budget_ms} ms")
+    if heavy:
+        failures.append(f"heavy modules imported at start-up: {', '.join(heavy)}")
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main(float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS))
+
+#============================   End Of File   ================================
@@ -0,0 +1,175 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : bench_pipeline.py
+# Author    : ForesightInitiative
+# Version   : 1.1.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Benchmark suite for every stage of the conversion pipeline on synthetic
+workbooks (benchmarks/synthetic_workbooks.py) of increasing size.
+
+Timed stages (best of --repeat runs, in seconds):
+    read_excel          ExcelReader.read_excel and parsing every sheet (raw grid)
+    read_cells          ExcelReader.read_cells of the cells the mapping refers to
+    convert_mapping     ConvertMappingExcel.convert_excel_mapping (no mapping cache)
+    validate_excel      ExcelToOimsMappingValidator.validate_excel_against_mapping
+    validate_mapping    ExcelToOimsMappingValidator.validate_mapping_against_schema
+    map_cold            Mapper.map_to_json with a fresh registry (plan compiled)
+    map_warm            Mapper.map_to_json with the compiled plan reused
+    validate_output     OutputValidator.validate of the mapped document (compiled once)
+    write_output        OimsJsonWriter.write of the mapped document
+The stages after read_excel work on an already parsed workbook, so they time
+only their own work. The scaling table shows the seconds per stage for every
+number of variable rows and, for the largest size, the time per 1,000 rows.
+
+Run from the repository root:
+    python benchmarks/bench_pipeline.py [--rows 1000,5000,20000] [--row-sheets N] [--column-sheets M]
+                                        [--pairs P] [--repeat R] [--json results.json]
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the pipeline benchmark suite.
+- Version 1.1.0: validate_output stage.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from synthetic_workbooks import DEFAULT_SCHEMA_ID, MAPPING_CLASSIFICATION_ID, SyntheticWorkbooks
+from modules.convert_mapping_excel import ConvertMappingExcel
+from modules.mapper import Mapper
+from modules.mapper_registry import MapperRegistry
+from oims_structures.schema_index import SchemaIndex
+from utils.excel_reader import ExcelReader
+from utils.json_writer import OimsJsonWriter
+from utils.workbook_session import WorkbookSession
+from validators.excel_to_oims_mapping_validator import ExcelToOimsMappingValidator
+from validators.output_validator import OutputValidator
+
+STAGES = (
+    "read_excel", "read_cells", "convert_mapping", "validate_excel",
+    "validate_mapping", "map_cold", "map_warm", "validate_output", "write_output",
+)
+
+#! <%GTREE 2 Helpers%>
+def best_of(function, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+def parse_all_sheets(path):
+    session = WorkbookSession(path)
+    for sheetname in session.sheet_names:
+        session.parse(sheetname, header=None)
+    return session
+
+def quietly(function):
+    """Run a stage without its progress prints."""
+    def wrapper():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return function()
+    return wrapper
+
+#! <%GTREE 3 Benchmark one workbook size%>
+def bench_size(generator, work_dir, variable_rows, row_sheets, column_sheets, pairs, repeat):
+    generated = generator.generate(work_dir, row_sheets, column_sheets, pairs, variable_rows)
+    schema_index = SchemaIndex.load(generator.schema_path)
+    validator = ExcelToOimsMappingValidator()
+    timings = {}
+
+    timings["read_excel"], session = best_of(lambda: parse_all_sheets(generated["primary"]), repeat)
+    mapping_json_path = os.path.join(work_dir, "mapping.json")
+    timings["convert_mapping"], mapping = best_of(
+        quietly(lambda: ConvertMappingExcel().convert_excel_mapping(generated["mapping"], output_json_path=mapping_json_path)),
+        repeat,
+    )
+    cell_addresses = ExcelReader.collect_cell_addresses(mapping)
+    timings["read_cells"], _ = best_of(lambda: ExcelReader(generated["primary"]).read_cells(cell_addresses), repeat)
+    timings["validate_excel"], _ = best_of(
+        quietly(lambda: validator.validate_excel_against_mapping(session, mapping)), repeat
+    )
+    timings["validate_mapping"], _ = best_of(
+        quietly(lambda: validator.validate_mapping_against_schema(mapping, schema_index)), repeat
+    )
+
+    def map_to_json(mapper):
+        return mapper.map_to_json(session, mapping, schema_index, MAPPING_CLASSIFICATION_ID, "SYNTHETIC", DEFAULT_SCHEMA_ID)
+
+    timings["map_cold"], _ = best_of(lambda: map_to_json(Mapper(registry=MapperRegistry())), repeat)
+    warm_mapper = Mapper(registry=MapperRegistry())
+    map_to_json(warm_mapper)
+    timings["map_warm"], output_data = best_of(lambda: map_to_json(warm_mapper), repeat)
+
+    output_validator = OutputValidator.compile(schema_index)
+    timings["validate_output"], _ = best_of(lambda: output_validator.validate(output_data), repeat)
+
+    output_path = os.path.join(work_dir, "output.json")
+    timings["write_output"], bytes_written = best_of(lambda: OimsJsonWriter(output_path).write(output_data), repeat)
+
+    return {
+        "variable_rows": variable_rows,
+        "sheets": len(generated["sheets"]),
+        "primary_bytes": os.path.getsize(generated["primary"]),
+        "output_bytes": bytes_written,
+        "seconds": {stage: round(timings[stage], 6) for stage in STAGES},
+    }
+
+#! <%GTREE 4 Report%>
+def print_table(results):
+    sizes = [result["variable_rows"] for result in results]
+    print(f"{'stage':<18}" + "".join(f"{size:>12}" for size in sizes) + f"{'ms/1k rows':>12}")
+    largest = results[-1]
+    for stage in STAGES:
+        row = f"{stage:<18}" + "".join(f"{result['seconds'][stage]:>12.4f}" for result in results)
+        per_thousand = largest["seconds"][stage] * 1000 / max(largest["variable_rows"] / 1000, 1e-9)
+        print(row + f"{per_thousand:>12.2f}")
+    print(f"{'total':<18}" + "".join(f"{sum(result['seconds'].values()):>12.4f}" for result in results))
+    print(f"{'output MB':<18}" + "".join(f"{result['output_bytes'] / 1e6:>12.2f}" for result in results))
+
+#! <%GTREE 5 Run the benchmark%>
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time every pipeline stage on synthetic workbooks.")
+    parser.add_argument("--rows", default="1000,5000,20000", help="Comma separated variable rows per size.")
+    parser.add_argument("--row-sheets", type=int, default=3)
+    parser.add_argument("--column-sheets", type=int, default=1)
+    parser.add_argument("--pairs", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the results to this JSON file.")
+    arguments = parser.parse_args(argv)
+
+    generator = SyntheticWorkbooks(seed=arguments.seed)
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for variable_rows in (int(rows) for rows in arguments.rows.split(",")):
+            results.append(bench_size(
+                generator, work_dir, variable_rows, arguments.row_sheets,
+                arguments.column_sheets, arguments.pairs, arguments.repeat,
+            ))
+
+    print(f"sheets: {results[0]['sheets']}, attribute pairs per sheet: {arguments.pairs}, best of {arguments.repeat}")
+    print_table(results)
+    if arguments.json:
+        with open(arguments.json, "w", encoding="utf-8") as json_file:
+            json.dump({"parameters": vars(arguments), "results": results}, json_file, indent=4)
+
+if __name__ == "__main__":
+    main()
+
+#============================   End Of File   ================================
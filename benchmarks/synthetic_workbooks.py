@@ -0,0 +1,275 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : synthetic_workbooks.py
+# Author    : ForesightInitiative
+# Version   : 1.1.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Generator of synthetic primary metadata workbooks with their mapping workbook
+and settings file, built against an OIMS metadata schema (default
+json/Dataset_meta_metadata_v2_1_0.json).
+
+A generated primary workbook holds
+    - MetadataFileDescriptors: the OIMS_header file descriptors (attributes_in_rows)
+    - Descriptive1..N: sheets with one attribute per row (attributes_in_rows),
+      cycling through the content objects the schema suggests
+    - Variables1..M: variable-level sheets with one attribute per column and
+      one variable per row (attributes_in_columns)
+The values follow the data_type of each schema attribute, and the mapping
+workbook has the layout ConvertMappingExcel reads ("mappings",
+"mapping_metadata" and one attribute-pair sheet per mapped sheet).
+
+Run from the repository root:
+    python benchmarks/synthetic_workbooks.py OUTPUT_DIR [--row-sheets N] [--column-sheets M]
+                                             [--pairs P] [--rows R] [--seed S]
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the synthetic workbook generator.
+- Version 1.1.0: The generated settings also disable the parsed sheet cache.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+
+import openpyxl
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from oims_structures.converter_data import OIMS_HEADER_SUBSECTIONS
+from oims_structures.schema_index import SchemaIndex
+from utils.excel_address import format_cell
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SCHEMA_PATH = os.path.join(REPOSITORY_ROOT, "json", "Dataset_meta_metadata_v2_1_0.json")
+DEFAULT_SCHEMA_ID = "Foresight data metametadata"
+MAPPING_CLASSIFICATION_ID = "EXCEL_TO_OIMS_MAPPING_BASE"
+ATTRIBUTE_PAIR_COLUMNS = (
+    "information_type", "excel_field_name", "excel_field_name_loc",
+    "excel_value_loc_range_start", "oims_attribute_id", "user_comments",
+)
+FILE_DESCRIPTORS = ("metadata_name", "metadata_description", "current_version", "metadata_version_status", "contact_name", "contact_email")
+VARIABLE_CONTENT_OBJECT = "DataQualityVariableLevel"
+
+#! <%GTREE 2 Schema attributes%>
+def primitive_attributes(schema_index):
+    """
+    :return: Dictionary {content object: [attribute, ...]} of the primitive (non-compound) attributes.
+    """
+    attributes = {}
+    for content_object, attribute_names in schema_index.by_content_object.items():
+        content_object = (content_object or "").strip()
+        primitives = [
+            schema_index.attribute(name) for name in attribute_names
+            if schema_index.attribute(name).get("data_type_class") == "primitive"
+        ]
+        if content_object and primitives:
+            attributes.setdefault(content_object, []).extend(primitives)
+    return attributes
+
+def entity_class_of(attributes):
+    for attribute in attributes:
+        entity_classes = attribute.get("valid_entity_class") or []
+        if entity_classes:
+            return entity_classes[0]
+    return "dataset"
+
+def take(attributes, count):
+    """The first `count` attributes, cycling when there are fewer."""
+    return [attributes[i % len(attributes)] for i in range(count)]
+
+#! <%GTREE 3 Values%>
+def synthetic_value(attribute, row, rng):
+    data_type = attribute.get("data_type")
+    name = attribute["attribute_name"]
+    if data_type == "number" or data_type == "percentage":
+        return round(rng.random() * 100, 3)
+    if data_type == "integer":
+        return rng.randint(0, 1000)
+    if data_type == "boolean":
+        return rng.random() < 0.5
+    if data_type == "date":
+        return datetime.datetime(2020, 1, 1) + datetime.timedelta(days=rng.randint(0, 2000))
+    if data_type == "url":
+        return f"https://example.org/{name}/{row}"
+    if data_type == "email":
+        return f"user{row}@example.org"
+    if data_type == "controlled_vocabulary":
+        return rng.choice(["option_a", "option_b", "option_c"])
+    return f"{name} value {row}"
+
+#! <%GTREE 4 Workbook generation%>
+class SyntheticWorkbooks:
+    def __init__(self, schema_path=DEFAULT_SCHEMA_PATH, seed=0):
+        self.schema_path = schema_path
+        self.schema_index = SchemaIndex.load(schema_path)
+        self.attributes = primitive_attributes(self.schema_index)
+        self.seed = seed
+
+    def layout(self, row_sheets, column_sheets, pairs_per_sheet):
+        """
+        :return: List of sheet descriptions (name, section, target, entity class, orientation, attributes).
+        """
+        sheets = [{
+            "sheetname": "MetadataFileDescriptors",
+            "oims_section": "OIMS_header",
+            "target": "file_descriptors",
+            "entity_class": None,
+            "table_orientation": "attributes_in_rows",
+            "attributes": [
+                {"attribute_name": name, "data_type": "string"}
+                for name in FILE_DESCRIPTORS if name in OIMS_HEADER_SUBSECTIONS["file_descriptors"]
+            ],
+        }]
+
+        row_objects = sorted(name for name in self.attributes if name != VARIABLE_CONTENT_OBJECT)
+        for i in range(row_sheets):
+            content_object = row_objects[i % len(row_objects)]
+            sheets.append({
+                "sheetname": f"Descriptive{i + 1}",
+                "oims_section": "OIMS_content",
+                "target": content_object,
+                "entity_class": entity_class_of(self.attributes[content_object]),
+                "table_orientation": "attributes_in_rows",
+                "attributes": take(self.attributes[content_object], pairs_per_sheet),
+            })
+
+        # variable-level attributes first, then other primitives to reach pairs_per_sheet columns
+        column_attributes = list(self.attributes.get(VARIABLE_CONTENT_OBJECT, []))
+        for content_object in row_objects:
+            column_attributes.extend(self.attributes[content_object])
+        for i in range(column_sheets):
+            sheets.append({
+                "sheetname": f"Variables{i + 1}",
+                "oims_section": "OIMS_content",
+                "target": VARIABLE_CONTENT_OBJECT,
+                "entity_class": "variable",
+                "table_orientation": "attributes_in_columns",
+                "attributes": column_attributes[:pairs_per_sheet],
+            })
+        return sheets
+
+    def write_primary(self, path, sheets, variable_rows):
+        """
+        Write the primary metadata workbook.
+
+        :return: Dictionary {sheetname: [attribute pair, ...]} with the cell locations used.
+        """
+        rng = random.Random(self.seed)
+        workbook = openpyxl.Workbook(write_only=True)
+        attribute_pairs = {}
+        for sheet in sheets:
+            worksheet = workbook.create_sheet(sheet["sheetname"])
+            pairs = []
+            if sheet["table_orientation"] == "attributes_in_rows":
+                worksheet.append(["Field", "Value"])
+                for i, attribute in enumerate(sheet["attributes"]):
+                    field_name = attribute["attribute_name"].replace("_", " ").capitalize()
+                    worksheet.append([field_name, synthetic_value(attribute, i, rng)])
+                    pairs.append((field_name, format_cell(i + 1, 0), format_cell(i + 1, 1), attribute["attribute_name"]))
+            else:
+                field_names = [attribute["attribute_name"] for attribute in sheet["attributes"]]
+                worksheet.append(field_names)
+                for row in range(variable_rows):
+                    worksheet.append([synthetic_value(attribute, row, rng) for attribute in sheet["attributes"]])
+                for col, field_name in enumerate(field_names):
+                    pairs.append((field_name, format_cell(0, col), format_cell(1, col), field_name))
+            attribute_pairs[sheet["sheetname"]] = pairs
+        workbook.save(path)
+        return attribute_pairs
+
+    def write_mapping(self, path, sheets, attribute_pairs):
+        workbook = openpyxl.Workbook(write_only=True)
+        mappings = workbook.create_sheet("mappings")
+        mappings.append(["sheetname", "oims_section", "oims_subsection", "oims_content_object", "entity_class", "table_orientation"])
+        for sheet in sheets:
+            header = sheet["oims_section"] == "OIMS_header"
+            mappings.append([
+                sheet["sheetname"], sheet["oims_section"],
+                sheet["target"] if header else None,
+                None if header else sheet["target"],
+                sheet["entity_class"], sheet["table_orientation"],
+            ])
+
+        mapping_metadata = workbook.create_sheet("mapping_metadata")
+        mapping_metadata.append(["Property", "value"])
+        for name, value in (
+            ("schema_name", "Synthetic mapping"), ("schema_description", "Generated for benchmarks"),
+            ("schema_version", "1.0"), ("schema_url", "https://example.org/schema"),
+            ("pid_scheme", "handle"), ("pid", "synthetic/1"),
+            ("metadata_name", "Synthetic mapping"), ("metadata_description", "Generated for benchmarks"),
+            ("current_version", "1.0.0"), ("metadata_version_status", "draft"),
+            ("contact_name", "Benchmark"), ("contact_role", "generator"), ("contact_email", "benchmark@example.org"),
+            ("validated_oims_metadata_schema", self.schema_index.metadata_name),
+        ):
+            mapping_metadata.append([name, value])
+
+        for sheet in sheets:
+            pairs_sheet = workbook.create_sheet(sheet["sheetname"])
+            pairs_sheet.append(list(ATTRIBUTE_PAIR_COLUMNS))
+            for field_name, field_location, value_location, attribute_name in attribute_pairs[sheet["sheetname"]]:
+                pairs_sheet.append(["metadata_field_value", field_name, field_location, value_location, attribute_name, None])
+        workbook.save(path)
+
+    def generate(self, output_dir, row_sheets=3, column_sheets=1, pairs_per_sheet=10, variable_rows=1000):
+        """
+        Generate a primary workbook, its mapping workbook and a settings file.
+
+        :return: Dictionary with the paths ("primary", "mapping", "settings") and the sheet layout.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        name = f"synthetic_{row_sheets}x{column_sheets}_{pairs_per_sheet}p_{variable_rows}r"
+        primary_path = os.path.join(output_dir, name + ".xlsx")
+        mapping_path = os.path.join(output_dir, name + "_mapping.xlsx")
+        settings_path = os.path.join(output_dir, name + "_settings.json")
+
+        sheets = self.layout(row_sheets, column_sheets, pairs_per_sheet)
+        attribute_pairs = self.write_primary(primary_path, sheets, variable_rows)
+        self.write_mapping(mapping_path, sheets, attribute_pairs)
+
+        output_path = os.path.join(output_dir, name + "_oims.json")
+        settings = {
+            "path_to_primary_metadata": primary_path,
+            "mapping_classification_id": MAPPING_CLASSIFICATION_ID,
+            "mapping_id": "SYNTHETIC",
+            "oims_metadata_schema_id": DEFAULT_SCHEMA_ID,
+            "path_to_oims_metadata_schema_file": self.schema_path,
+            "path_to_mapping_file": mapping_path,
+            "path_to_output_oims_metadata_file": output_path,
+            "output_json_path": output_path,
+            "report_path": os.path.join(output_dir, name + "_report.txt"),
+            "mapping_cache_dir": None,
+            "sheet_cache_dir": None,
+        }
+        with open(settings_path, "w", encoding="utf-8") as settings_file:
+            json.dump(settings, settings_file, indent=4)
+        return {"primary": primary_path, "mapping": mapping_path, "settings": settings_path, "sheets": sheets}
+
+#! <%GTREE 5 Command line%>
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic primary metadata and mapping workbooks.")
+    parser.add_argument("output_dir")
+    parser.add_argument("--row-sheets", type=int, default=3, help="Sheets with attributes in rows.")
+    parser.add_argument("--column-sheets", type=int, default=1, help="Variable sheets with attributes in columns.")
+    parser.add_argument("--pairs", type=int, default=10, help="Attribute pairs per sheet.")
+    parser.add_argument("--rows", type=int, default=1000, help="Variable rows per column-oriented sheet.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--schema", default=DEFAULT_SCHEMA_PATH)
+    arguments = parser.parse_args()
+
+    generated = SyntheticWorkbooks(arguments.schema, arguments.seed).generate(
+        arguments.output_dir, arguments.row_sheets, arguments.column_sheets, arguments.pairs, arguments.rows
+    )
+    for key in ("primary", "mapping", "settings"):
+        print(f"{key}: {generated[key]}")
+
+#============================   End Of File   ================================
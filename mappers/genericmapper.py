@@ -0,0 +1,505 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : genericmapper.py
+# Author    : ForesightInitiative
+# Version   : 1.4.2
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+GenericMapper is the FALLBACK_MAPPER: it converts any primary metadata
+workbook for which the mapping describes where each attribute lives.
+
+It works in two phases:
+1. compile: the "metadata" items of the mapping are turned into a flat
+   MappingPlan with one SheetGroup per (sheet, OIMS target). A group holds
+   the cell fetches (as index arrays) and the attribute assignments for
+   attributes_in_rows sheets, or the column fetches for
+   attributes_in_columns sheets.
+2. execute: the plan is run against a workbook. Each group fetches its cells
+   and produces a fragment of the output; the fragments are assembled into
+   the OIMS document.
+
+execute_stream() is the low-memory variant of execute(): the header groups
+run first, and the content objects are produced by a generator as the
+output is written, so only the content objects that are still open are held
+at any time. The output is the same as with execute().
+
+Plans are immutable, picklable and cached on the (long-lived) mapper
+instance, so converting further workbooks with the same mapping only costs
+the cell fetches and the output assembly.
+
+Output structure:
+{
+    "OIMS": {
+        "OIMS_header": {
+            "mapping_info": [{...}],
+            "<oims_subsection>": {"<oims_attribute_id>": value, ...}
+        },
+        "OIMS_content": [
+            {
+                "OIMS_content_object": "<oims_content_object>",
+                "OIMS_content_object_properties": {
+                    "entity_class": "<entity_class>",
+                    "<oims_attribute_id>": value, ...             # attributes_in_rows
+                    "metadata": [{"<oims_attribute_id>": value}]  # attributes_in_columns, one entity per row
+                }
+            }
+        ]
+    }
+}
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the plan-compiling generic mapper.
+- Version 1.1.0: Columnar path for attributes_in_columns sheets: the mapped columns are
+                 cleaned and coerced to their schema data_type in bulk (utils/column_types.py).
+- Version 1.2.0: execute_fragments() reuses the fragments of unchanged sheets (incremental conversion).
+- Version 1.3.0: execute_stream() yields the content objects while the output is written
+                 (low-memory mode); multi-value attributes are read from a CellLookup too.
+- Version 1.4.0: execute_sheet() runs the groups of one sheet (per-sheet scheduling).
+- Version 1.4.1: The plan cache is keyed by the schema content instead of its name.
+- Version 1.4.2: The mapping digest of the plan cache key is computed once per frozen mapping.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+#! <%GTREE 1.1 Load standard python libraries%>
+import datetime
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+#! <%GTREE 1.2 Load OIMS converter tool libraries%>
+from modules.mapper_registry import register_mapper
+from modules.resource_cache import content_sha256
+from oims_structures.schema_index import SchemaIndex
+from utils.column_types import coerce_column
+from utils.excel_address import compile_locations, gather, parse_range
+from utils.frame_records import records_without_missing
+from utils.instrumentation import instrumentation_of
+
+__tool_version__ = "1.1.0"
+
+# number of compiled plans kept per mapper instance
+PLAN_CACHE_SIZE = 32
+
+#! <%GTREE 2 Plan structures%>
+# attributes_in_rows: the value of oims_attribute_id is the cell fetches[fetch_index]
+AttributeAssign = namedtuple("AttributeAssign", ["oims_attribute_id", "fetch_index", "multiple"])
+
+# attributes_in_columns: the values of oims_attribute_id run down column `col` from `start_row`
+ColumnFetch = namedtuple("ColumnFetch", ["oims_attribute_id", "col", "start_row", "data_type"])
+
+SheetGroup = namedtuple(
+    "SheetGroup",
+    ["sheetname", "oims_section", "target", "entity_class", "table_orientation",
+     "rows", "cols", "assigns", "columns"]
+)
+
+MappingPlan = namedtuple("MappingPlan", ["groups"])
+
+# fragment of the output produced by one SheetGroup
+Fragment = namedtuple("Fragment", ["sheetname", "oims_section", "target", "entity_class", "properties", "entities"])
+
+#! <%GTREE 3 Value helpers%>
+def clean_value(value):
+    """
+    Convert a cell value into a JSON-friendly value; empty cells become None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, float) and value != value:
+        return None
+    if isinstance(value, np.generic):
+        return clean_value(value.item())
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    if isinstance(value, datetime.datetime):
+        if value.time() == datetime.time(0):
+            return value.date().isoformat()
+        return value.replace(microsecond=0).isoformat()
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if type(value).__name__ in ("NAType", "NaTType"):
+        # pandas.NA / pandas.NaT, checked by name to keep pandas out of the import
+        return None
+    return value
+
+def mapping_fingerprint(mapping):
+    """
+    :return: Digest identifying a mapping, used as key of the plan cache
+             (remembered by the frozen mappings of the resource cache).
+    """
+    return content_sha256(mapping)
+
+#! <%GTREE 4 GenericMapper Class%>
+@register_mapper()
+class GenericMapper:
+    # the plan can run on a CellLookup (ExcelReader.read_cells) as well as on a WorkbookSession
+    supports_cell_lookup = True
+
+    #! <%GTREE 4.1 Initialization%>
+    def __init__(self):
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+
+    #! <%GTREE 4.2 Entry point used by modules/mapper.py%>
+    def map_data(self, excel_data, mapping, schema):
+        """
+        :param excel_data: WorkbookSession (or CellLookup) with the primary metadata.
+        :param mapping: OIMS mapping dictionary.
+        :param schema: SchemaIndex or schema dictionary.
+        :return: OIMS document dictionary.
+        """
+        return self.execute(self.get_plan(mapping, schema), excel_data)
+
+    def stream_data(self, excel_data, mapping, schema):
+        """
+        Low-memory variant of map_data: OIMS_content is a generator that maps
+        the content objects while they are written (see execute_stream).
+        """
+        return self.execute_stream(self.get_plan(mapping, schema), excel_data)
+
+    #! <%GTREE 4.3 Cached compilation%>
+    def get_plan(self, mapping, schema=None):
+        """
+        :return: The compiled MappingPlan for a mapping, from the cache when possible.
+        """
+        schema_index = None
+        if schema is not None:
+            schema_index = schema if isinstance(schema, SchemaIndex) else SchemaIndex(schema)
+        # the plan embeds the "multiple" flags and data types of the schema
+        key = (mapping_fingerprint(mapping), schema_index.content_sha256() if schema_index else None)
+
+        with self._lock:
+            if key in self._plans:
+                self._plans.move_to_end(key)
+                return self._plans[key]
+
+        plan = self.compile(mapping, schema_index)
+        with self._lock:
+            self._plans[key] = plan
+            while len(self._plans) > PLAN_CACHE_SIZE:
+                self._plans.popitem(last=False)
+        return plan
+
+    #! <%GTREE 4.4 Compile phase%>
+    @classmethod
+    def compile(cls, mapping, schema_index=None):
+        """
+        Turn the "metadata" items of a mapping into a MappingPlan.
+
+        :param mapping: OIMS mapping dictionary.
+        :param schema_index: Optional SchemaIndex, used for the "multiple" flag and data types of attributes.
+        :return: MappingPlan instance.
+        """
+        metadata = mapping["OIMS"]["OIMS_content"]["OIMS_content"][0]["OIMS_content_object_properties"]["metadata"]
+
+        grouped_items = OrderedDict()
+        for metadata_item in metadata:
+            if metadata_item.get("oims_section") == "OIMS_header":
+                target = metadata_item.get("oims_subsection")
+            else:
+                target = metadata_item.get("oims_content_object")
+            key = (metadata_item["sheetname"], metadata_item.get("oims_section"), target)
+            grouped_items.setdefault(key, []).append(metadata_item)
+
+        groups = []
+        for (sheetname, oims_section, target), metadata_items in grouped_items.items():
+            groups.append(cls._compile_group(sheetname, oims_section, target, metadata_items, schema_index))
+        return MappingPlan(tuple(groups))
+
+    @staticmethod
+    def _compile_group(sheetname, oims_section, target, metadata_items, schema_index):
+        table_orientation = metadata_items[0].get("table_orientation")
+        entity_class = metadata_items[0].get("entity_class")
+
+        locations, assigns, columns = [], [], []
+        for metadata_item in metadata_items:
+            for attribute_pair in metadata_item.get("attribute_pairs", []):
+                if attribute_pair.get("information_type", "metadata_field_value") != "metadata_field_value":
+                    continue
+                oims_attribute_id = attribute_pair.get("oims_attribute_id")
+                value_location = attribute_pair.get("excel_value_loc_range_start")
+                if not oims_attribute_id or not value_location:
+                    continue
+
+                attribute = schema_index.attribute(oims_attribute_id) if schema_index else None
+                if table_orientation == "attributes_in_columns":
+                    (start_row, col), _ = parse_range(value_location)
+                    data_type = attribute.get("data_type") if attribute else None
+                    columns.append(ColumnFetch(oims_attribute_id, col, start_row, data_type))
+                else:
+                    multiple = bool(attribute.get("multiple")) if attribute else False
+                    assigns.append(AttributeAssign(oims_attribute_id, len(locations), multiple))
+                    locations.append(value_location)
+
+        rows, cols = compile_locations(locations)
+        return SheetGroup(
+            sheetname, oims_section, target, entity_class, table_orientation,
+            rows, cols, tuple(assigns), tuple(columns)
+        )
+
+    #! <%GTREE 4.5 Execute phase%>
+    def execute(self, plan, workbook, file_path=None):
+        """
+        Run a compiled plan against a workbook.
+
+        :param plan: MappingPlan.
+        :param workbook: WorkbookSession (or CellLookup) with the primary metadata.
+        :param file_path: Path of the workbook for the mapping_info (default: the session's file_path).
+        :return: OIMS document dictionary.
+        """
+        fragments = self.execute_fragments(plan, workbook)
+        return self.assemble(fragments, file_path or getattr(workbook, "file_path", None))
+
+    def execute_fragments(self, plan, workbook, sheets=None, previous_fragments=None):
+        """
+        Run the groups of a plan and return their fragments, in plan order.
+
+        :param sheets: Optional collection of sheet names to (re-)map; the
+                       fragments of the other groups are taken from previous_fragments.
+        :param previous_fragments: Fragments of an earlier execution of the same plan.
+        :return: List of Fragment (None for sheets that are not in the workbook).
+        """
+        instrumentation = instrumentation_of(workbook)
+        fragments = []
+        for index, group in enumerate(plan.groups):
+            if sheets is not None and previous_fragments is not None and group.sheetname not in sheets:
+                fragments.append(previous_fragments[index])
+                instrumentation.count("fragments_reused")
+                continue
+            fragments.append(self._run_group(group, workbook, instrumentation))
+        return fragments
+
+    def execute_sheet(self, plan, workbook, sheetname):
+        """
+        Run the groups of a plan that read one sheet (modules/sheet_scheduler.py
+        runs the sheets of a workbook in parallel and assembles the fragments
+        in plan order).
+
+        :return: List of (group index, Fragment) tuples.
+        """
+        instrumentation = instrumentation_of(workbook)
+        return [
+            (index, self._run_group(group, workbook, instrumentation))
+            for index, group in enumerate(plan.groups) if group.sheetname == sheetname
+        ]
+
+    def _run_group(self, group, workbook, instrumentation):
+        with instrumentation.sheet(group.sheetname):
+            fragment = self.execute_group(group, workbook)
+        if fragment is not None:
+            instrumentation.count("attribute_pairs_mapped", len(group.assigns) + len(group.columns))
+            if fragment.entities is not None:
+                instrumentation.count("entities_mapped", len(fragment.entities))
+                instrumentation.count("values_mapped", sum(len(entity) for entity in fragment.entities))
+            else:
+                instrumentation.count("values_mapped", len(fragment.properties))
+        return fragment
+
+    def execute_stream(self, plan, workbook, file_path=None):
+        """
+        Run a compiled plan with the content objects produced on demand.
+
+        The header groups are executed immediately. OIMS_content is a
+        generator: a content object is yielded as soon as the last group that
+        contributes to it has run, in the same order as execute(). The
+        workbook must stay open until the generator is exhausted.
+
+        :return: OIMS document dictionary whose OIMS_content is a generator.
+        """
+        instrumentation = instrumentation_of(workbook)
+        header_fragments = [
+            self._run_group(group, workbook, instrumentation)
+            for group in plan.groups if group.oims_section == "OIMS_header"
+        ]
+        oims_header = self._oims_header(file_path or getattr(workbook, "file_path", None))
+        self.assemble_content(header_fragments, oims_header)
+        oims_content = self._stream_content(plan, workbook, instrumentation)
+        return {"OIMS": {"OIMS_header": oims_header, "OIMS_content": oims_content}}
+
+    def _stream_content(self, plan, workbook, instrumentation):
+        # attributes_in_rows groups with the same target and entity class fill one content object
+        last_group = {}
+        for index, group in enumerate(plan.groups):
+            if group.oims_section != "OIMS_header" and group.table_orientation != "attributes_in_columns":
+                last_group[(group.target, group.entity_class)] = index
+
+        # [content object, index of the last group that contributes to it], in output order
+        pending = []
+        content_objects = {}
+        for index, group in enumerate(plan.groups):
+            if group.oims_section == "OIMS_header":
+                continue
+            fragment = self._run_group(group, workbook, instrumentation)
+            if fragment is not None and fragment.entities is not None:
+                properties = {"entity_class": fragment.entity_class, "metadata": fragment.entities}
+                pending.append([{"OIMS_content_object": fragment.target, "OIMS_content_object_properties": properties}, index])
+            elif fragment is not None:
+                key = (fragment.target, fragment.entity_class)
+                if key not in content_objects:
+                    content_objects[key] = {"entity_class": fragment.entity_class}
+                    content_object = {"OIMS_content_object": fragment.target, "OIMS_content_object_properties": content_objects[key]}
+                    pending.append([content_object, last_group[key]])
+                content_objects[key].update(fragment.properties)
+            # do not keep the entities of a written content object alive while the next group runs
+            del fragment
+
+            while pending and pending[0][1] <= index:
+                yield pending.pop(0)[0]
+        for content_object, _ in pending:
+            yield content_object
+
+    def execute_group(self, group, workbook):
+        """
+        Fetch the cells of one SheetGroup.
+
+        :return: Fragment, or None if the sheet is not in the workbook.
+        """
+        if group.sheetname not in workbook.sheet_names:
+            return None
+
+        if hasattr(workbook, "value"):
+            # CellLookup from ExcelReader.read_cells: only the referenced cells are available
+            grid = None
+        else:
+            grid = workbook.parse(group.sheetname, header=None).to_numpy(dtype=object)
+
+        if group.table_orientation == "attributes_in_columns":
+            return self._execute_columns(group, workbook, grid)
+        return self._execute_rows(group, workbook, grid)
+
+    def _execute_rows(self, group, workbook, grid):
+        if grid is not None:
+            values = gather(grid, group.rows, group.cols)
+        else:
+            values = [workbook.value(group.sheetname, row, col) for row, col in zip(group.rows, group.cols)]
+
+        properties = OrderedDict()
+        for assign in group.assigns:
+            if assign.multiple:
+                row, col = int(group.rows[assign.fetch_index]), int(group.cols[assign.fetch_index])
+                if grid is not None:
+                    value = self._values_to_the_right(grid[row, col:] if row < grid.shape[0] else ())
+                else:
+                    value = self._values_to_the_right(workbook.values_to_the_right(group.sheetname, row, col))
+                value = [item for item in (clean_value(item) for item in value) if item is not None] or None
+            else:
+                value = clean_value(values[assign.fetch_index])
+            if value is not None:
+                properties[assign.oims_attribute_id] = value
+        return Fragment(group.sheetname, group.oims_section, group.target, group.entity_class, dict(properties), None)
+
+    @staticmethod
+    def _values_to_the_right(row_values):
+        # a range start holds the first of several values, which continue to the right until the first empty cell
+        values = []
+        for value in row_values:
+            if clean_value(value) is None:
+                break
+            values.append(value)
+        return values
+
+    def _execute_columns(self, group, workbook, grid):
+        if not group.columns:
+            return Fragment(group.sheetname, group.oims_section, group.target, group.entity_class, None, [])
+
+        # one object block with a column per mapped attribute, aligned on the first value row
+        start_row = min(column.start_row for column in group.columns)
+        if grid is not None:
+            number_of_rows = max(grid.shape[0] - start_row, 0)
+        else:
+            lookup_columns = [self._lookup_column(workbook, group.sheetname, column) for column in group.columns]
+            number_of_rows = max(
+                column.start_row - start_row + len(values)
+                for column, values in zip(group.columns, lookup_columns)
+            )
+        block = np.full((number_of_rows, len(group.columns)), None, dtype=object)
+        for i, column in enumerate(group.columns):
+            offset = column.start_row - start_row
+            if grid is not None:
+                if column.col < grid.shape[1]:
+                    block[offset:, i] = grid[column.start_row:, column.col]
+            elif lookup_columns[i]:
+                block[offset:offset + len(lookup_columns[i]), i] = lookup_columns[i]
+
+        # clean and coerce per column, then emit one entity per non-empty row
+        frame = pd.DataFrame({
+            i: coerce_column(pd.Series(block[:, i], dtype=object), column.data_type)
+            for i, column in enumerate(group.columns)
+        })
+        frame.columns = [column.oims_attribute_id for column in group.columns]
+        entities = [entity for entity in records_without_missing(frame) if entity]
+        return Fragment(group.sheetname, group.oims_section, group.target, group.entity_class, None, entities)
+
+    @staticmethod
+    def _lookup_column(workbook, sheetname, column):
+        cells = workbook.column(sheetname, column.col, column.start_row)
+        if not cells:
+            return []
+        return [cells.get(row) for row in range(column.start_row, max(cells) + 1)]
+
+    #! <%GTREE 4.6 Assemble the output%>
+    def assemble(self, fragments, file_path=None):
+        """
+        Assemble fragments (in mapping order) into an OIMS document.
+
+        :param fragments: List of Fragment (None entries are skipped).
+        :param file_path: Path of the converted workbook, recorded in mapping_info.
+        :return: OIMS document dictionary.
+        """
+        oims_header = self._oims_header(file_path)
+        return {"OIMS": {"OIMS_header": oims_header, "OIMS_content": self.assemble_content(fragments, oims_header)}}
+
+    def _oims_header(self, file_path):
+        return {
+            "mapping_info": [
+                {
+                    "mapper_tool_name": type(self).__name__,
+                    "tool_version": __tool_version__,
+                    "input_parameters": [
+                        {
+                            "input_parameter_name": "path_to_primary_metadata",
+                            "input_parameter_value": file_path
+                        }
+                    ]
+                }
+            ]
+        }
+
+    @staticmethod
+    def assemble_content(fragments, oims_header):
+        """
+        Merge header fragments into oims_header and build the list of content
+        objects. attributes_in_rows fragments that target the same content
+        object and entity class are merged into one content object.
+        """
+        oims_content = []
+        content_objects = {}
+        for fragment in fragments:
+            if fragment is None:
+                continue
+            if fragment.oims_section == "OIMS_header":
+                oims_header.setdefault(fragment.target, {}).update(fragment.properties or {})
+                continue
+
+            if fragment.entities is not None:
+                properties = {"entity_class": fragment.entity_class, "metadata": fragment.entities}
+                oims_content.append({"OIMS_content_object": fragment.target, "OIMS_content_object_properties": properties})
+                continue
+
+            key = (fragment.target, fragment.entity_class)
+            if key not in content_objects:
+                content_objects[key] = {"entity_class": fragment.entity_class}
+                oims_content.append({"OIMS_content_object": fragment.target, "OIMS_content_object_properties": content_objects[key]})
+            content_objects[key].update(fragment.properties)
+        return oims_content
+
+#============================   End Of File   ================================
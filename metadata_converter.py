@@ -13,34 +13,63 @@ version 1.0.0.1  2024-12-10 Updated to align with the new project structure and
 # version history information   :
 """
 - Version 1.0.0: Initial implementation of the metadata conversion tool.
+- Version 1.1.0: Command line interface with subcommands (convert, batch, validate,
+                 compile-mapping, check-settings); pandas, openpyxl and NumPy are
+                 only imported by the commands that need them.
+- Version 1.2.0: serve command for the local conversion service.
+- Version 1.3.0: Incremental reconversion of changed sheets (setting incremental_conversion).
+- Version 1.4.0: Stage and sheet timings and counters in a JSON run report.
+- Version 1.5.0: Peak memory per stage in the run report (optionally traced with
+                 tracemalloc) and the max_memory_mb budget with a low-memory mode.
+- Version 1.6.0: Messages go through the queued converter logging (utils/logger.py)
+                 with the run id and workbook of the run instead of print().
+- Version 1.7.0: Sharded and JSON Lines output of OIMS_content (setting output_mode).
+- Version 1.8.0: Generated metadata is checked against the schema before it is
+                 written (setting output_validation).
+- Version 1.9.0: Schemas and mappings come from the process-wide resource cache
+                 (setting resource_cache).
+- Version 1.10.0: Sheets are validated and mapped on a pool of workers (settings
+                  sheet_workers, sheet_executor).
+- Version 1.11.0: Parsed sheets are cached on disk by workbook hash (settings
+                  sheet_cache_dir, sheet_cache_max_mb).
+- Version 1.11.1: The parsed sheet cache is opt-in.
+- Version 1.11.2: Schema index snapshots go to a cache folder (setting schema_index_cache_dir).
+- Version 1.11.3: check-settings reports unreadable settings files instead of failing.
 """
 #=============================================================================
 #<%/REGION File header%>
 
 #! <%GTREE 1 Initialization%>
 #! <%GTREE 1.1 Load standard python Libraries%>
+import datetime
 import os
-import json
+import time
+import uuid
 #! <%GTREE 1.2 Load OIMS converter tool libraries%>
+# Modules that pull in pandas, openpyxl or NumPy (Excel reading, mapping
+# conversion, validation, mapping) are imported in the methods that use them,
+# so CLI commands that never touch Excel start quickly.
 #! <%GTREE 1.2.1 Load main modules%>
-from modules.mapper import Mapper
-from modules.convert_mapping_excel import ConvertMappingExcel
+from modules.mapping_cache import MappingCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_ENTRIES
+from modules.resource_cache import RESOURCE_CACHE
 
 #! <%GTREE 1.2.2 Load utilities%>
 from utils.settings_reader import SettingsReader
-from utils.excel_reader import ExcelReader
 from utils.json_reader import JsonReader
 from utils.reporter import Reporter
-from utils.logger import SetupLogger
+from utils.json_writer import OimsJsonWriter, LOW_MEMORY_STREAM_DEPTH, STREAM_DEPTH
+from utils.sharded_writer import ShardedOimsWriter, DEFAULT_SHARDS, OUTPUT_MODES
+from oims_structures.schema_index import SchemaIndex, DEFAULT_SNAPSHOT_DIR
+from utils.logger import SetupLogger, log_context, logging_options
+from utils.instrumentation import Instrumentation, timed_stage
+from utils.memory_usage import current_rss_mb, estimate_workbook_mb
 
 #! <%GTREE 1.2.3 Load specific mappers%>
 #specific mappers are loaded dynamically
 
 #! <%GTREE 1.2.4 Load validators%>
 #_from validators.input_validator import InputValidator
-#_
-from validators.excel_to_oims_mapping_validator import ExcelToOimsMappingValidator
-#_from validators.output_validator import OutputValidator
+# validators.output_validator is imported by validate_outputs
 
 
 #! <%GTREE 1.2.5 Load data%>
@@ -50,69 +79,335 @@ from oims_structures.converter_data import (
     KNOWN_SCHEMAS,
 )
 
+OUTPUT_VALIDATION_MODES = ("report", "strict", "off")
+
 #! <%GTREE 2 Main Converter Class%>
 class MetadataConverter:
     #! <%GTREE 2.1 Initialization%>
-    def __init__(self, settings_path=None, settings=None):
-        print(f"settings_path: {settings_path}")
-        print(f"settings: {settings}")
+    def __init__(self, settings_path=None, settings=None, mapping=None, schema=None, validation_plan=None):
+        """
+        :param settings_path: Path to the settings file.
+        :param settings: Settings dictionary (takes precedence over settings_path).
+        :param mapping: Optional mapping that was already loaded (and validated against the schema).
+        :param schema: Optional schema that was already loaded (dictionary or SchemaIndex).
+        :param validation_plan: Optional ValidationPlan compiled from the mapping and schema.
+        """
+        self.settings_path = None
         if settings:
             self.settings = settings
         elif settings_path:
             self.settings_path=settings_path
             self.settings = SettingsReader(self.settings_path).read_settings()
-        self.logger = SetupLogger()
+        self.logger = SetupLogger(**logging_options(getattr(self, "settings", {})))
+        self.logger.debug("settings_path: %s", settings_path)
+        self.logger.debug("settings: %s", getattr(self, "settings", None))
+        self.run_id = uuid.uuid4().hex[:12]
+        self.mapping = mapping
+        self.schema_index = None
+        self.schema = None
+        if schema is not None:
+            self.schema_index = schema if isinstance(schema, SchemaIndex) else SchemaIndex(schema)
+            self.schema = self.schema_index.schema
+        self.validation_plan = validation_plan
+        # validation violations and mapping fragments of the sheets when they ran on a pool
+        self.sheet_results = None
+        # compiled from the schema by validate_outputs, violations of the last output
+        self.output_validator = None
+        self.output_violations = None
+        self.instrumentation = Instrumentation(trace_memory=bool(getattr(self, "settings", {}).get("trace_memory")))
+        # set by load_inputs when the workbook would not fit in "max_memory_mb"
+        self.low_memory = False
+        self.estimated_memory_mb = None
 
 
     #! <%GTREE 2.2 Load Inputs%>
-    #! <%GTREE 2.2 Load Inputs%>
+    @timed_stage("load_inputs")
     def load_inputs(self):
+        """
+        Load the mapping and schema and open the primary metadata workbook in
+        a WorkbookSession. The session parses each sheet at most once and is
+        shared by validate_inputs and convert_data. In low-memory mode the
+        workbook is opened with open_low_memory_workbook instead.
+        """
+        from utils.excel_reader import ExcelReader
+        from utils.workbook_session import WorkbookSession
+
         self.logger.info("Loading input files...")
-        self.excel_data = ExcelReader(self.settings["path_to_primary_metadata"]).read_excel()
+        if self.mapping is None or self.schema is None:
+            self.load_mapping_and_schema()
+        self.low_memory = self.exceeds_memory_budget()
+        if self.low_memory:
+            self.excel_data = self.open_low_memory_workbook()
+        else:
+            self.excel_data = WorkbookSession(
+                excel_reader=ExcelReader(self.settings["path_to_primary_metadata"], sheet_cache=self.build_sheet_cache()),
+                instrumentation=self.instrumentation
+            )
+
+    #! <%GTREE 2.2.2 Memory budget%>
+    def exceeds_memory_budget(self):
+        """
+        Compare the expected memory of a standard conversion (the memory in use
+        plus the estimate for the workbook) with the setting "max_memory_mb".
+
+        :return: True if the conversion should run in low-memory mode.
+        """
+        max_memory_mb = self.settings.get("max_memory_mb")
+        if not max_memory_mb:
+            return False
+        self.estimated_memory_mb = (current_rss_mb() or 0.0) + estimate_workbook_mb(self.settings["path_to_primary_metadata"])
+        if self.estimated_memory_mb <= max_memory_mb:
+            return False
+        self.logger.info(
+            f"Estimated memory {self.estimated_memory_mb:.0f} MB exceeds max_memory_mb={max_memory_mb}, "
+            f"converting in low-memory mode."
+        )
+        return True
+
+    def open_low_memory_workbook(self):
+        """
+        Open the workbook for the low-memory mode. If the mapper can work on
+        the referenced cells only, those cells are streamed with openpyxl in
+        read-only mode (ExcelReader.read_cells) and no sheet is ever held as a
+        DataFrame. Otherwise a WorkbookSession keeps one parsed sheet at a time.
+
+        :return: CellLookup or WorkbookSession.
+        """
+        from modules.mapper_registry import MAPPER_REGISTRY
+        from utils.excel_reader import ExcelReader
+        from utils.workbook_session import WorkbookSession
+
+        excel_reader = ExcelReader(self.settings["path_to_primary_metadata"], sheet_cache=self.build_sheet_cache())
+        mapper = MAPPER_REGISTRY.get_mapper(self.mapping_classification_id, self.mapping_id, self.schema_id)
+        if not getattr(mapper, "supports_cell_lookup", False):
+            return WorkbookSession(excel_reader=excel_reader, instrumentation=self.instrumentation, max_frames=1)
+
+        cell_lookup = excel_reader.read_cells(ExcelReader.collect_cell_addresses(self.mapping))
+        cell_lookup.instrumentation = self.instrumentation
+        self.instrumentation.count("cells_read", cell_lookup.stats()["cells_read"])
+        return cell_lookup
+
+    #! <%GTREE 2.2.1 Load mapping and schema%>
+    def load_mapping_and_schema(self):
+        """
+        Load the mapping (converting an Excel mapping if needed) and the schema.
+        In batch mode this runs once and the result is shared with all workbooks.
+        Both come from the process-wide resource cache (modules/resource_cache.py)
+        unless the setting "resource_cache" is false; cached objects are read-only.
+        """
         mapping_file_path = self.settings["path_to_mapping_file"]
         if mapping_file_path.endswith(".json"):
-            self.mapping = JsonReader(mapping_file_path).read_json()
-            boolean_convert_excel_mapping = False
-            print("using settings file in json format")
+            self.logger.debug("using mapping file in json format")
+            load_mapping = lambda path: JsonReader(path).read_json()
         elif mapping_file_path.endswith(".xlsx"):
-            self.mapping_excel = ExcelReader(mapping_file_path).read_excel()
-            boolean_convert_excel_mapping = True
+            self.logger.debug("trying to use mapping file in xlsx format")
+            load_mapping = self.load_excel_mapping
         else:
             raise ValueError(f"Unsupported mapping file format: {mapping_file_path}")
 
-        self.schema = JsonReader(self.settings["path_to_oims_metadata_schema_file"]).read_json()
+        # compiled schema index, reused from its snapshot in the cache folder when unchanged
+        schema_path = self.settings["path_to_oims_metadata_schema_file"]
+        snapshot_dir = self.settings.get("schema_index_cache_dir", DEFAULT_SNAPSHOT_DIR)
+        load_schema_index = lambda path: SchemaIndex.load(path, snapshot_dir=snapshot_dir)
+        if self.settings.get("resource_cache", True):
+            self.schema_index = RESOURCE_CACHE.get_or_load(
+                "schema", self.settings.get("oims_metadata_schema_id"), schema_path, load_schema_index
+            )
+            self.mapping = RESOURCE_CACHE.get_or_load(
+                "mapping", self.settings.get("mapping_id"), mapping_file_path, load_mapping
+            )
+        else:
+            self.schema_index = load_schema_index(schema_path)
+            self.mapping = load_mapping(mapping_file_path)
+        self.schema = self.schema_index.schema
+
+    def load_excel_mapping(self, mapping_file_path):
+        from utils.excel_reader import ExcelReader
+        from utils.workbook_session import WorkbookSession
 
-        if boolean_convert_excel_mapping:
-            print("trying to use settings file in xlsx format")
-            self.mapping = self.convert_excel_mapping(mapping_file_path)
+        self.mapping_excel = WorkbookSession(excel_reader=ExcelReader(mapping_file_path))
+        return self.convert_excel_mapping(mapping_file_path)
 
     #! <%GTREE 2.3 Validate Inputs%>
-    def validate_inputs(self):
+    @timed_stage("validate_inputs")
+    def validate_inputs(self, validate_mapping=True, sheets=None):
+        """
+        :param validate_mapping: Also validate the mapping against the schema
+                                 (skipped in batch mode where this is done once up front).
+        :param sheets: Optional collection of sheet names to validate (incremental conversion).
+        """
+        from validators.excel_to_oims_mapping_validator import ExcelToOimsMappingValidator
+        from validators.validation_plan import MappingValidationError, ValidationPlan
+
         self.logger.info("Validating inputs...")
         # InputValidator.validate_settings(self.settings)
-        ExcelToOimsMappingValidator.validate_excel_against_mapping(self.excel_data, self.mapping)
-        ExcelToOimsMappingValidator.validate_mapping_against_schema(self.mapping, self.schema)
+        if self.validation_plan is None:
+            self.validation_plan = ValidationPlan.compile(self.mapping, self.schema_index)
+        validator = ExcelToOimsMappingValidator()
+        scheduler = self.sheet_scheduler() if sheets is None else None
+        if scheduler is not None:
+            # the sheets are mapped in the same pass; convert_data assembles the fragments
+            mapper = self.mapper()
+            self.sheet_results = scheduler.run(
+                self.settings["path_to_primary_metadata"],
+                self.validation_plan,
+                mapper,
+                mapper.get_plan(self.mapping, self.schema_index),
+                self.instrumentation,
+                sheet_cache=self.build_sheet_cache()
+            )
+            if self.sheet_results.violations:
+                raise MappingValidationError(self.sheet_results.violations)
+        else:
+            validator.validate_excel_against_mapping(self.excel_data, self.mapping, plan=self.validation_plan, sheets=sheets)
+        if validate_mapping:
+            validator.validate_mapping_against_schema(self.mapping, self.schema_index, plan=self.validation_plan)
+
+    #! <%GTREE 2.3.1 Per-sheet scheduling%>
+    def mapper(self):
+        from modules.mapper_registry import MAPPER_REGISTRY
+
+        return MAPPER_REGISTRY.get_mapper(self.mapping_classification_id, self.mapping_id, self.schema_id)
+
+    def sheet_scheduler(self):
+        """
+        With "sheet_workers" above 1 the sheets are validated and mapped on a
+        pool of "sheet_executor" workers (modules/sheet_scheduler.py), except
+        in low-memory mode and for mappers that cannot map sheet by sheet.
+        There are never more workers than CPUs: every worker opens the
+        workbook itself, which only pays off when the workers run side by side.
+
+        :return: SheetScheduler, or None to process the sheets one after the other.
+        """
+        from modules.sheet_scheduler import SheetScheduler
+
+        workers = min(self.settings.get("sheet_workers", 1), os.cpu_count() or 1)
+        if workers <= 1 or self.low_memory:
+            return None
+        if not SheetScheduler.supports(self.mapper()):
+            self.logger.info("%s cannot map sheet by sheet, processing the sheets one after the other.", type(self.mapper()).__name__)
+            return None
+        return SheetScheduler(workers, self.settings.get("sheet_executor", "process"))
 
     #! <%GTREE 2.4 Convert Data%>
+    @timed_stage("convert_data")
     def convert_data(self):
+        from modules.mapper import Mapper
+
         self.logger.info("Converting data...")
-        return Mapper().map_to_json(
+        if self.sheet_results is not None:
+            # mapped sheet by sheet by validate_inputs, assembled in mapping order
+            return self.mapper().assemble(self.sheet_results.fragments, self.settings["path_to_primary_metadata"])
+        # in low-memory mode the content objects are mapped while they are written
+        output_data = Mapper().map_to_json(
             self.excel_data,
             self.mapping,
-            self.schema,
+            self.schema_index,
             self.mapping_classification_id,
             self.mapping_id,
             self.schema_id,
+            stream=self.low_memory,
         )
+        self.logger.info(f"Workbook sheet cache: {self.excel_data.stats()}")
+        return output_data
 
     #! <%GTREE 2.5 Generate Outputs%>
+    @timed_stage("generate_outputs")
     def generate_outputs(self, output_data):
-        output_path = self.settings["output_json_path"]
-        with open(output_path, "w") as json_file:
-            json.dump(output_data, json_file, indent=4)
-        self.logger.info(f"Output saved to {output_path}")
+        """
+        Write the OIMS output incrementally: the header first, then the
+        content objects one at a time (OIMS_content may be a generator).
+        Settings "output_compact" and "json_encoder" select the output format.
+        In low-memory mode the content objects are streamed entity by entity.
+        With "output_mode" "jsonl" or "sharded" the content objects are written
+        to JSON Lines shards and the output file holds the header and a
+        manifest with the offset of every content object (utils/sharded_writer.py).
+        """
+        output_data = self.validate_outputs(output_data)
+        output_path = self.settings.get("output_json_path") or self.settings["path_to_output_oims_metadata_file"]
+        output_mode = self.settings.get("output_mode", "single")
+        if output_mode == "single":
+            writer = OimsJsonWriter(
+                output_path,
+                compact=self.settings.get("output_compact", False),
+                encoder=self.settings.get("json_encoder", "json"),
+                stream_depth=LOW_MEMORY_STREAM_DEPTH if self.low_memory else STREAM_DEPTH
+            )
+        else:
+            writer = ShardedOimsWriter(
+                output_path,
+                mode=output_mode,
+                shards=self.settings.get("output_shards", DEFAULT_SHARDS),
+                compact=self.settings.get("output_compact", False)
+            )
+        bytes_written = writer.write(output_data)
+        self.instrumentation.count("bytes_written", bytes_written)
+        self.logger.info(f"Output saved to {output_path} ({bytes_written} bytes)")
+        self.report_output_violations()
+        return bytes_written
+
+    #! <%GTREE 2.5.1 Validate Outputs%>
+    def validate_outputs(self, output_data):
+        """
+        Check the generated metadata against the requirement levels and data
+        types of the schema (validators/output_validator.py). Setting
+        "output_validation":
+        - "report" (default): the violations are logged and listed in the run report
+        - "strict": any violation stops the run before the output is written
+        - "off": no checks
+        A streamed OIMS_content (low-memory mode) is checked while it is
+        written; in "strict" mode it is collected first.
+
+        :param output_data: OIMS document dictionary.
+        :return: The document to write (OIMS_content wrapped when it is checked while written).
+        :raises OutputValidationError: In "strict" mode, with all violations.
+        """
+        mode = self.settings.get("output_validation", "report")
+        self.output_violations = None
+        if mode == "off":
+            return output_data
+        from validators.output_validator import OutputValidator, OutputValidationError
+
+        if self.output_validator is None:
+            self.output_validator = OutputValidator.compile(self.schema_index)
+        self.output_violations = []
+        oims = output_data["OIMS"]
+        content = oims.get("OIMS_content", [])
+        if isinstance(content, list) or mode == "strict":
+            with self.instrumentation.stage("validate_outputs"):
+                content = list(content)
+                self.output_violations.extend(self.output_validator.validate({"OIMS": {"OIMS_content": content}}))
+            if mode == "strict" and self.output_violations:
+                self.report_output_violations()
+                raise OutputValidationError(self.output_violations)
+        else:
+            content = self._validated_stream(content)
+        return {"OIMS": {**oims, "OIMS_content": content}}
+
+    def _validated_stream(self, content):
+        row_attributes = {}
+        for position, content_object in enumerate(content):
+            with self.instrumentation.stage("validate_outputs"):
+                self.output_violations.extend(
+                    self.output_validator.check_content_object(position, content_object, row_attributes)
+                )
+            yield content_object
+        self.output_violations.extend(self.output_validator.check_row_attributes(row_attributes))
+
+    def report_output_violations(self):
+        """
+        Log the violations found by validate_outputs and count them.
+        """
+        if self.output_violations is None:
+            return
+        self.instrumentation.count("output_violations", len(self.output_violations))
+        for violation in self.output_violations:
+            self.logger.warning("Output validation: %s", violation.message)
+        if self.output_violations:
+            self.logger.warning("Output validation found %s violation(s).", len(self.output_violations))
 
     #! <%GTREE 2.6 validate aettings%>
+    @timed_stage("validate_settings")
     def validate_settings(self):
         """
         Validate the settings file and the input/output paths.
@@ -122,7 +417,8 @@ class MetadataConverter:
         """
         try:
             # Load settings
-            self.settings = SettingsReader(self.settings_path).read_settings()
+            if self.settings_path:
+                self.settings = SettingsReader(self.settings_path).read_settings()
 
             # Check file paths
             required_paths = [
@@ -155,12 +451,31 @@ class MetadataConverter:
             self.mapping_id = self.settings["mapping_id"]
             self.schema_id = self.settings["oims_metadata_schema_id"]
 
+            max_memory_mb = self.settings.get("max_memory_mb")
+            if max_memory_mb is not None and (isinstance(max_memory_mb, bool) or not isinstance(max_memory_mb, (int, float)) or max_memory_mb <= 0):
+                raise ValueError(f"max_memory_mb must be a positive number of megabytes, got {max_memory_mb!r}.")
+            sheet_cache_max_mb = self.settings.get("sheet_cache_max_mb")
+            if sheet_cache_max_mb is not None and (isinstance(sheet_cache_max_mb, bool) or not isinstance(sheet_cache_max_mb, (int, float)) or sheet_cache_max_mb <= 0):
+                raise ValueError(f"sheet_cache_max_mb must be a positive number of megabytes, got {sheet_cache_max_mb!r}.")
+            if self.settings.get("output_mode", "single") not in OUTPUT_MODES:
+                raise ValueError(f"Unsupported output_mode '{self.settings['output_mode']}'. Use one of {', '.join(OUTPUT_MODES)}.")
+            sheet_workers = self.settings.get("sheet_workers", 1)
+            if isinstance(sheet_workers, bool) or not isinstance(sheet_workers, int) or sheet_workers < 1:
+                raise ValueError(f"sheet_workers must be a positive integer, got {sheet_workers!r}.")
+            if "sheet_executor" in self.settings:
+                from modules.sheet_scheduler import SHEET_EXECUTORS
+
+                if self.settings["sheet_executor"] not in SHEET_EXECUTORS:
+                    raise ValueError(f"Unsupported sheet_executor '{self.settings['sheet_executor']}'. Use one of {', '.join(SHEET_EXECUTORS)}.")
+            if self.settings.get("output_validation", "report") not in OUTPUT_VALIDATION_MODES:
+                raise ValueError(f"Unsupported output_validation '{self.settings['output_validation']}'. Use one of {', '.join(OUTPUT_VALIDATION_MODES)}.")
+
             if self.mapping_classification_id not in KNOWN_MAPPING_CLASSIFICATIONS:
-                print(f"Unknown mapping classification ID: {self.mapping_classification_id}. Using generic conversion.")
+                self.logger.info("Unknown mapping classification ID: %s. Using generic conversion.", self.mapping_classification_id)
             if self.mapping_id not in KNOWN_MAPPINGS:
-                print(f"Unknown mapping ID: {self.mapping_id}. Using generic conversion.")
+                self.logger.info("Unknown mapping ID: %s. Using generic conversion.", self.mapping_id)
             if self.schema_id not in KNOWN_SCHEMAS:
-                print(f"Unknown OIMS metadata schema ID: {self.schema_id}. Validation will not be performed.")
+                self.logger.info("Unknown OIMS metadata schema ID: %s. Validation will not be performed.", self.schema_id)
 
             # Set internal flags for generic conversion or validation
             self.generic_conversion = (
@@ -179,23 +494,277 @@ class MetadataConverter:
         :param mapping_excel_path: Path to the Excel mapping file.
         :return: Dictionary representation of the converted JSON mapping.
         """
-        print("Converting mapping file in Excel format to JSON format")
-        mapping_converter = ConvertMappingExcel()
-        return mapping_converter.convert_excel_mapping(mapping_excel_path)
+        from modules.convert_mapping_excel import ConvertMappingExcel
+
+        self.logger.info("Converting mapping file in Excel format to JSON format")
+        mapping_converter = ConvertMappingExcel(mapping_cache=self.build_mapping_cache())
+        return mapping_converter.convert_excel_mapping(
+            mapping_excel_path,
+            excel_data=getattr(self, "mapping_excel", None)
+        )
+
+    #! <%GTREE 2.7.1 compiled mapping cache%>
+    def build_mapping_cache(self):
+        """
+        Create the on-disk cache for compiled Excel mappings from the settings.
+        Setting "mapping_cache_dir" to null disables the cache.
+
+        :return: MappingCache instance or None.
+        """
+        cache_dir = self.settings.get("mapping_cache_dir", DEFAULT_CACHE_DIR)
+        if not cache_dir:
+            return None
+        return MappingCache(
+            cache_dir=cache_dir,
+            max_entries=self.settings.get("mapping_cache_max_entries", DEFAULT_MAX_ENTRIES)
+        )
+
+    #! <%GTREE 2.7.2 parsed sheet cache%>
+    def build_sheet_cache(self):
+        """
+        Create the on-disk cache for the parsed sheets of the primary metadata
+        workbook from the settings. The cache is only used when "sheet_cache_dir"
+        is set.
+
+        :return: SheetCache instance or None.
+        """
+        from utils.sheet_cache import SheetCache, DEFAULT_MAX_MB
+
+        cache_dir = self.settings.get("sheet_cache_dir")
+        if not cache_dir:
+            return None
+        return SheetCache(cache_dir=cache_dir, max_mb=self.settings.get("sheet_cache_max_mb", DEFAULT_MAX_MB))
 
     #! <%GTREE 2.8 Run Conversion Process%>
     def run(self):
-        self.validate_settings()
-        self.load_inputs()
-        self.validate_inputs()
-        output_data = self.convert_data()
-        self.generate_outputs(output_data)
-        Reporter.generate_report(self.settings["report_path"])
-
-#! <%GTREE 3 Main Function%>
+        """
+        Run the conversion and write the report: the text report at
+        "report_path" and the JSON run report (stage and sheet timings,
+        counters) next to it. A failed run is reported before the error is raised.
+        Everything logged during the run carries its run id and workbook.
+        """
+        started = time.perf_counter()
+        workbook = os.path.basename(self.settings.get("path_to_primary_metadata") or "")
+        with log_context(run_id=self.run_id, workbook=workbook):
+            self._run(started)
+
+    def _run(self, started):
+        try:
+            self.validate_settings()
+            self.load_inputs()
+            if self.settings.get("incremental_conversion", False):
+                from modules.incremental_conversion import IncrementalConversion
+
+                with self.instrumentation.stage("incremental_conversion"):
+                    output_data = IncrementalConversion(self).convert()
+            else:
+                self.validate_inputs()
+                output_data = self.convert_data()
+            self.generate_outputs(output_data)
+        except Exception as e:
+            if getattr(self, "settings", None) and self.settings.get("report_path"):
+                Reporter.generate_report(self.settings["report_path"], self.run_report(started, e))
+            raise
+        else:
+            Reporter.generate_report(self.settings["report_path"], self.run_report(started))
+        finally:
+            # stops tracemalloc when the run started it ("trace_memory")
+            self.instrumentation.close()
+
+    #! <%GTREE 2.9 Run report%>
+    def run_report(self, started, error=None):
+        """
+        :param started: time.perf_counter() at the start of the run.
+        :param error: Exception that stopped the run, if any.
+        :return: Dictionary with the status, timings and counters of the run.
+        """
+        report = {
+            "run_id": self.run_id,
+            "generated_on": datetime.datetime.now().isoformat(timespec="seconds"),
+            "status": "failed" if error else "success",
+            "input": self.settings.get("path_to_primary_metadata"),
+            "output": self.settings.get("output_json_path") or self.settings.get("path_to_output_oims_metadata_file"),
+            "wall_seconds": round(time.perf_counter() - started, 6),
+        }
+        if error is not None:
+            report["error"] = f"{type(error).__name__}: {error}"
+        report.update(self.instrumentation.report())
+        report["memory"]["mode"] = "low_memory" if self.low_memory else "standard"
+        if self.settings.get("max_memory_mb"):
+            report["memory"]["max_memory_mb"] = self.settings["max_memory_mb"]
+            report["memory"]["estimated_memory_mb"] = (
+                None if self.estimated_memory_mb is None else round(self.estimated_memory_mb, 1)
+            )
+        if getattr(self, "excel_data", None) is not None:
+            report["workbook_cache"] = self.excel_data.stats()
+        report["resource_cache"] = RESOURCE_CACHE.stats()
+        if self.output_violations is not None:
+            report["output_validation"] = {
+                "mode": self.settings.get("output_validation", "report"),
+                "violations": [
+                    {
+                        "position": violation.position,
+                        "content_object": violation.content_object,
+                        "attribute": violation.attribute,
+                        "check": violation.check,
+                        "message": violation.message,
+                        "entities": len(violation.entities),
+                    }
+                    for violation in self.output_violations
+                ],
+            }
+        return report
+
+#! <%GTREE 3 Command line interface%>
+DEFAULT_SETTINGS_PATH = "config/settings.json"
+COMMANDS = ("convert", "batch", "validate", "compile-mapping", "check-settings", "serve")
+
+#! <%GTREE 3.1 Commands%>
+def command_convert(arguments):
+    MetadataConverter(settings_path=arguments.settings).run()
+    return 0
+
+def command_batch(arguments):
+    from modules.batch_converter import BatchConverter
+
+    batch_settings = SettingsReader(arguments.settings).read_settings()
+    summary = BatchConverter(batch_settings, max_workers=arguments.workers).run(arguments.inputs, arguments.output_dir)
+    return 1 if summary.get("failed") else 0
+
+def command_validate(arguments):
+    """Report every violation of the mapping (against the schema) and of the workbook (against the mapping)."""
+    from validators.validation_plan import ValidationPlan
+
+    converter = MetadataConverter(settings_path=arguments.settings)
+    converter.validate_settings()
+    converter.load_mapping_and_schema()
+    plan = ValidationPlan.compile(converter.mapping, converter.schema_index)
+    violations = plan.check_schema()
+    if not arguments.mapping_only:
+        from utils.excel_reader import ExcelReader
+        from utils.workbook_session import WorkbookSession
+
+        workbook = WorkbookSession(excel_reader=ExcelReader(converter.settings["path_to_primary_metadata"], sheet_cache=converter.build_sheet_cache()))
+        violations.extend(plan.apply(workbook))
+
+    for violation in violations:
+        print(f"- {violation.message}")
+    print(f"{len(violations)} validation error(s)." if violations else "Validation passed.")
+    return 1 if violations else 0
+
+def command_compile_mapping(arguments):
+    from modules.convert_mapping_excel import ConvertMappingExcel
+
+    mapping_cache = MappingCache(cache_dir=arguments.cache_dir) if arguments.cache_dir else None
+    ConvertMappingExcel(mapping_cache=mapping_cache).convert_excel_mapping(arguments.mapping, output_json_path=arguments.output)
+    return 0
+
+def command_check_settings(arguments):
+    try:
+        MetadataConverter(settings_path=arguments.settings).validate_settings()
+    except (OSError, ValueError) as e:
+        print(e)
+        return 1
+    print(f"Settings OK: {arguments.settings}")
+    return 0
+
+def command_serve(arguments):
+    from modules.conversion_server import ConversionService
+
+    if arguments.config:
+        service = ConversionService(SettingsReader(arguments.config).read_settings())
+    else:
+        service = ConversionService.from_settings_file(arguments.settings)
+    if arguments.port is not None:
+        service.server_settings["port"] = arguments.port
+    service.serve_forever()
+    return 0
+
+#! <%GTREE 3.2 Argument parser%>
+def build_argument_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Convert MS Excel primary metadata into OIMS-compatible JSON.",
+        epilog="Without a command the former interface is used: [--settings FILE] [--batch INPUTS --output-dir DIR --workers N]."
+    )
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    def add_settings_argument(command_parser):
+        command_parser.add_argument("--settings", default=DEFAULT_SETTINGS_PATH, help="Path to the settings file.")
+
+    convert_parser = commands.add_parser("convert", help="Convert one primary metadata workbook.")
+    add_settings_argument(convert_parser)
+    convert_parser.set_defaults(handler=command_convert)
+
+    batch_parser = commands.add_parser("batch", help="Convert many workbooks with the same mapping and schema.")
+    add_settings_argument(batch_parser)
+    batch_parser.add_argument("inputs", help="Folder or glob pattern of primary metadata workbooks.")
+    batch_parser.add_argument("--output-dir", help="Output folder (default: setting batch_output_dir).")
+    batch_parser.add_argument("--workers", type=int, help="Number of worker processes.")
+    batch_parser.set_defaults(handler=command_batch)
+
+    validate_parser = commands.add_parser("validate", help="Validate the mapping and the primary metadata without converting.")
+    add_settings_argument(validate_parser)
+    validate_parser.add_argument("--mapping-only", action="store_true", help="Only validate the mapping against the schema.")
+    validate_parser.set_defaults(handler=command_validate)
+
+    compile_parser = commands.add_parser("compile-mapping", help="Convert an Excel mapping file to JSON.")
+    compile_parser.add_argument("mapping", help="Path to the Excel mapping file.")
+    compile_parser.add_argument("--output", help="Path of the JSON mapping (default: next to the Excel file).")
+    compile_parser.add_argument("--cache-dir", help="Compiled mapping cache folder (default: no cache).")
+    compile_parser.set_defaults(handler=command_compile_mapping)
+
+    check_parser = commands.add_parser("check-settings", help="Check the settings file and the paths it refers to.")
+    add_settings_argument(check_parser)
+    check_parser.set_defaults(handler=command_check_settings)
+
+    serve_parser = commands.add_parser("serve", help="Run the local conversion service (keeps mappings and schemas loaded).")
+    serve_group = serve_parser.add_mutually_exclusive_group()
+    serve_group.add_argument("--config", help="Server configuration file (see modules/conversion_server.py).")
+    serve_group.add_argument("--settings", default=DEFAULT_SETTINGS_PATH, help="Serve a single settings file as profile 'default'.")
+    serve_parser.add_argument("--port", type=int, help="Port (overrides the configuration).")
+    serve_parser.set_defaults(handler=command_serve)
+    return parser
+
+def translate_legacy_arguments(argv):
+    """
+    Map the former interface (metadata_converter.py [--settings FILE] [--batch INPUTS ...])
+    onto the convert and batch commands.
+    """
+    import argparse
+
+    legacy_parser = argparse.ArgumentParser(add_help=False)
+    legacy_parser.add_argument("--settings", default=DEFAULT_SETTINGS_PATH)
+    legacy_parser.add_argument("--batch")
+    legacy_parser.add_argument("--output-dir")
+    legacy_parser.add_argument("--workers")
+    arguments = legacy_parser.parse_args(argv)
+
+    if arguments.batch:
+        translated = ["batch", arguments.batch, "--settings", arguments.settings]
+        if arguments.output_dir:
+            translated += ["--output-dir", arguments.output_dir]
+        if arguments.workers:
+            translated += ["--workers", arguments.workers]
+        return translated
+    return ["convert", "--settings", arguments.settings]
+
+def main(argv=None):
+    """
+    :param argv: Command line arguments (default: sys.argv[1:]).
+    :return: Exit code.
+    """
+    import sys
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv = translate_legacy_arguments(argv)
+    arguments = build_argument_parser().parse_args(argv)
+    return arguments.handler(arguments)
+
+#! <%GTREE 4 Main Function%>
 if __name__ == "__main__":
-    settings_file = "config/settings.json"
-    converter = MetadataConverter(settings_path=settings_file)
-    converter.run()
+    raise SystemExit(main())
 
 #============================   End Of File   ================================
\ No newline at end of file
@@ -0,0 +1,222 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : batch_converter.py
+# Author    : ForesightInitiative
+# Version   : 1.3.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# documentation   :
+"""
+Batch conversion of many primary metadata workbooks that share one mapping and
+one schema.
+
+The mapping and the schema are loaded and validated once in the parent
+process and the workbook checks are compiled into one ValidationPlan. The
+workbooks are then converted by a pool of worker processes; each worker
+receives the mapping, the schema and the plan once, when it starts. One OIMS JSON
+file is written per workbook and a summary of successes and failures is
+written to batch_summary.json in the output folder.
+
+The batch settings are the standard settings (see utils/settings_reader.py)
+without the per-workbook paths. Optional keys:
+  "batch_output_dir":  folder for the converted files (default: ./output)
+  "batch_workers":     number of worker processes (default: number of CPUs)
+
+The workers log through a queue to the parent process (utils/logger.py), which
+is the only process that writes to the console and the log file.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the batch conversion mode.
+- Version 1.1.0: Stage timings and counters per workbook in batch_summary.json.
+- Version 1.2.0: Workers log through the parent's logging queue, tagged with their run id and workbook.
+- Version 1.3.0: The sheets of a workbook are processed one after the other (sheet_workers = 1).
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+#! <%GTREE 1.1 Load standard python Libraries%>
+import datetime
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+#! <%GTREE 1.2 Load OIMS converter tool libraries%>
+from utils.logger import configure_logging, get_logger, log_context, logging_options, process_logging
+from validators.excel_to_oims_mapping_validator import ExcelToOimsMappingValidator
+from validators.validation_plan import ValidationPlan
+
+BATCH_SUMMARY_FILE = "batch_summary.json"
+
+logger = get_logger("BatchConverter")
+
+#! <%GTREE 2 Worker process%>
+# mapping, schema and validation plan shared by all conversions in a worker process
+_worker_state = {}
+
+def _initialize_worker(mapping, schema, validation_plan, log_queue, log_level, log_sampling):
+    configure_logging(level=log_level, sampling=log_sampling, log_queue=log_queue)
+    _worker_state["mapping"] = mapping
+    _worker_state["schema"] = schema
+    _worker_state["validation_plan"] = validation_plan
+
+def _convert_workbook(settings):
+    """
+    Convert one workbook in a worker process.
+
+    :param settings: Settings dictionary for this workbook.
+    :return: Dictionary with the result of the conversion.
+    """
+    from metadata_converter import MetadataConverter
+
+    started = time.perf_counter()
+    result = {
+        "input": settings["path_to_primary_metadata"],
+        "output": settings["path_to_output_oims_metadata_file"],
+    }
+    converter = None
+    try:
+        converter = MetadataConverter(
+            settings=settings,
+            mapping=_worker_state["mapping"],
+            schema=_worker_state["schema"],
+            validation_plan=_worker_state["validation_plan"]
+        )
+        with log_context(run_id=converter.run_id, workbook=os.path.basename(settings["path_to_primary_metadata"])):
+            converter.validate_settings()
+            converter.load_inputs()
+            converter.validate_inputs(validate_mapping=False)
+            output_data = converter.convert_data()
+            converter.generate_outputs(output_data)
+        result["status"] = "success"
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["duration_seconds"] = round(time.perf_counter() - started, 3)
+    if converter is not None:
+        # stage and sheet timings and counters (utils/instrumentation.py)
+        result.update(converter.instrumentation.report())
+        converter.instrumentation.close()
+    return result
+
+#! <%GTREE 3 BatchConverter Class%>
+class BatchConverter:
+    #! <%GTREE 3.1 Initialization%>
+    def __init__(self, settings, max_workers=None):
+        """
+        :param settings: Batch settings dictionary.
+        :param max_workers: Number of worker processes (overrides "batch_workers").
+        """
+        self.settings = settings
+        self.max_workers = max_workers or settings.get("batch_workers") or os.cpu_count()
+
+    #! <%GTREE 3.2 Collect input workbooks%>
+    @staticmethod
+    def collect_workbooks(inputs):
+        """
+        :param inputs: Folder with workbooks or glob pattern.
+        :return: Sorted list of workbook paths (Excel lock files are skipped).
+        """
+        if os.path.isdir(inputs):
+            pattern = os.path.join(inputs, "*.xlsx")
+        else:
+            pattern = inputs
+        return sorted(
+            path for path in glob.glob(pattern, recursive=True)
+            if os.path.isfile(path) and not os.path.basename(path).startswith("~$")
+        )
+
+    #! <%GTREE 3.3 Load and validate mapping and schema once%>
+    def prepare(self):
+        """
+        Load the mapping and the schema, compile the validation plan and
+        validate the mapping against the schema once for the whole batch.
+
+        :return: Tuple (mapping, schema index, validation plan).
+        """
+        from metadata_converter import MetadataConverter
+
+        for path in ["path_to_oims_metadata_schema_file", "path_to_mapping_file"]:
+            if not os.path.exists(self.settings[path]):
+                raise FileNotFoundError(f"Required file path '{path}' does not exist.")
+
+        converter = MetadataConverter(settings=self.settings)
+        converter.load_mapping_and_schema()
+        validation_plan = ValidationPlan.compile(converter.mapping, converter.schema_index)
+        ExcelToOimsMappingValidator().validate_mapping_against_schema(
+            converter.mapping, converter.schema_index, plan=validation_plan
+        )
+        return converter.mapping, converter.schema_index, validation_plan
+
+    #! <%GTREE 3.4 Build the per-workbook settings%>
+    def workbook_settings(self, workbook_path, output_dir):
+        output_path = os.path.join(output_dir, os.path.splitext(os.path.basename(workbook_path))[0] + ".json")
+        settings = dict(self.settings)
+        settings["path_to_primary_metadata"] = workbook_path
+        settings["path_to_output_oims_metadata_file"] = output_path
+        settings["output_json_path"] = output_path
+        # the workbooks already run in parallel
+        settings["sheet_workers"] = 1
+        return settings
+
+    #! <%GTREE 3.5 Run the batch%>
+    def run(self, inputs, output_dir=None):
+        """
+        Convert all workbooks matched by `inputs`.
+
+        :param inputs: Folder with workbooks or glob pattern.
+        :param output_dir: Output folder (default: "batch_output_dir" setting or ./output).
+        :return: Summary dictionary (also written to batch_summary.json).
+        """
+        output_dir = output_dir or self.settings.get("batch_output_dir", "output")
+        os.makedirs(output_dir, exist_ok=True)
+
+        workbooks = self.collect_workbooks(inputs)
+        if not workbooks:
+            raise FileNotFoundError(f"No workbooks found for '{inputs}'.")
+        output_names = [os.path.splitext(os.path.basename(path))[0] for path in workbooks]
+        duplicates = sorted({name for name in output_names if output_names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Workbooks with the same name would overwrite each other's output: {duplicates}")
+
+        started = time.perf_counter()
+        mapping, schema, validation_plan = self.prepare()
+
+        results = []
+        log_options = logging_options(self.settings)
+        with process_logging() as log_queue, ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_initialize_worker,
+            initargs=(mapping, schema, validation_plan, log_queue, log_options["level"], log_options["sampling"])
+        ) as executor:
+            futures = [
+                executor.submit(_convert_workbook, self.workbook_settings(path, output_dir))
+                for path in workbooks
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                logger.info("[%s/%s] %s: %s", len(results), len(workbooks), result["status"], result["input"])
+
+        results.sort(key=lambda result: result["input"])
+        summary = {
+            "generated_on": datetime.datetime.now().isoformat(timespec="seconds"),
+            "mapping": self.settings["path_to_mapping_file"],
+            "schema": self.settings["path_to_oims_metadata_schema_file"],
+            "workers": self.max_workers,
+            "total": len(results),
+            "succeeded": sum(result["status"] == "success" for result in results),
+            "failed": sum(result["status"] == "failed" for result in results),
+            "duration_seconds": round(time.perf_counter() - started, 3),
+            "results": results,
+        }
+        with open(os.path.join(output_dir, BATCH_SUMMARY_FILE), "w") as summary_file:
+            json.dump(summary, summary_file, indent=4)
+        logger.info("Batch finished: %s succeeded, %s failed.", summary["succeeded"], summary["failed"])
+        return summary
+
+#============================   End Of File   ================================
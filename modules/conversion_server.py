@@ -0,0 +1,409 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : conversion_server.py
+# Author    : ForesightInitiative
+# Version   : 1.2.2
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# documentation   :
+"""
+Long-running local conversion service (standard library HTTP server).
+
+At start-up the service loads, for every profile in its configuration, the
+settings, the mapping, the schema and the compiled validation plan (see
+BatchConverter.prepare). Conversions then only read the uploaded workbook.
+
+Endpoints:
+  GET  /health                        status, profiles, active and queued conversions,
+                                      resource cache statistics
+  POST /convert?profile=<name>        body: the .xlsx workbook
+                                      (or, if "allow_paths" is true, a JSON body {"path": "<workbook path>"})
+                                      response: the OIMS JSON document
+  POST /reload                        reload the profiles whose settings, mapping or schema files changed
+
+Conversions run on a pool of "workers" threads. At most "max_queue"
+further requests wait for a worker; beyond that the service answers
+503 with a Retry-After header. A request that times out answers 504, but
+its conversion keeps its slot until it finishes (a conversion still waiting
+for a worker is cancelled), so timeouts never admit more work. An uploaded
+workbook belongs to its conversion and is removed when the conversion ends.
+
+Server configuration (JSON):
+{
+    "host": "127.0.0.1",
+    "port": 8765,
+    "workers": 4,
+    "max_queue": 16,
+    "request_timeout": 300,
+    "max_upload_mb": 50,
+    "allow_paths": false,
+    "profiles": {"default": "config/settings.json"}
+}
+Each profile refers to a standard settings file (see utils/settings_reader.py).
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the conversion service.
+- Version 1.1.0: Service and request messages go through the queued converter logging.
+- Version 1.2.0: Resource cache statistics in /health.
+- Version 1.2.1: A timed-out conversion keeps its slot until it ends.
+- Version 1.2.2: The upload is removed when its conversion ends, not when the request
+                 times out; an invalid Content-Length answers 400.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+#! <%GTREE 1.1 Load standard python Libraries%>
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+#! <%GTREE 1.2 Load OIMS converter tool libraries%>
+from modules.batch_converter import BatchConverter
+from modules.resource_cache import RESOURCE_CACHE
+from utils.logger import get_logger, log_context
+from utils.settings_reader import SettingsReader
+
+logger = get_logger("ConversionService")
+
+DEFAULT_SERVER_SETTINGS = {
+    "host": "127.0.0.1",
+    "port": 8765,
+    "workers": 4,
+    "max_queue": 16,
+    "request_timeout": 300,
+    "max_upload_mb": 50,
+    "allow_paths": False,
+}
+DEFAULT_PROFILE = "default"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+#! <%GTREE 2 Helpers%>
+class ServiceError(Exception):
+    """Error answered to the client with an HTTP status."""
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _remove_upload(upload_dir):
+    if upload_dir:
+        shutil.rmtree(upload_dir, ignore_errors=True)
+
+#! <%GTREE 3 Profiles%>
+class ConversionProfile:
+    """Settings, mapping, schema and validation plan of one profile, kept warm."""
+    def __init__(self, name, settings_path):
+        self.name = name
+        self.settings_path = settings_path
+        self.settings = SettingsReader(settings_path).read_settings()
+        self.fingerprint = self.current_fingerprint(self.settings)
+        self.mapping, self.schema_index, self.validation_plan = BatchConverter(self.settings).prepare()
+        self.loaded_at = time.time()
+
+    def current_fingerprint(self, settings=None):
+        """
+        :return: Digest of the settings, mapping and schema files.
+        """
+        settings = settings or SettingsReader(self.settings_path).read_settings()
+        paths = (self.settings_path, settings["path_to_mapping_file"], settings["path_to_oims_metadata_schema_file"])
+        return hashlib.sha256("".join(file_digest(path) for path in paths).encode("ascii")).hexdigest()
+
+    def describe(self):
+        return {
+            "settings": self.settings_path,
+            "mapping": self.settings["path_to_mapping_file"],
+            "schema": self.settings["path_to_oims_metadata_schema_file"],
+            "fingerprint": self.fingerprint,
+            "loaded_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.loaded_at)),
+        }
+
+#! <%GTREE 4 ConversionService Class%>
+class ConversionService:
+    #! <%GTREE 4.1 Initialization%>
+    def __init__(self, server_settings):
+        """
+        :param server_settings: Server configuration dictionary (see the module documentation).
+        """
+        self.server_settings = {**DEFAULT_SERVER_SETTINGS, **server_settings}
+        if not self.server_settings.get("profiles"):
+            raise ValueError("The server configuration has no profiles.")
+
+        self.profiles = {}
+        self._profiles_lock = threading.Lock()
+        for name, settings_path in self.server_settings["profiles"].items():
+            logger.info("Loading profile '%s' from %s", name, settings_path)
+            self.profiles[name] = ConversionProfile(name, settings_path)
+
+        workers = self.server_settings["workers"]
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="conversion")
+        # admission control: conversions running plus conversions waiting for a worker
+        self._slots = threading.BoundedSemaphore(workers + self.server_settings["max_queue"])
+        self._counter_lock = threading.Lock()
+        self.active = 0
+        self.admitted = 0
+        self.finished = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_settings_file(cls, settings_path):
+        """Service with a single "default" profile for one settings file."""
+        return cls({"profiles": {DEFAULT_PROFILE: settings_path}})
+
+    #! <%GTREE 4.2 Status%>
+    def status(self):
+        with self._counter_lock:
+            admitted, active = self.admitted, self.active
+            counters = {"finished": self.finished, "rejected": self.rejected}
+        with self._profiles_lock:
+            profiles = {name: profile.describe() for name, profile in self.profiles.items()}
+        return {
+            "status": "ok",
+            "workers": self.server_settings["workers"],
+            "max_queue": self.server_settings["max_queue"],
+            "active": active,
+            "queued": admitted - active,
+            **counters,
+            "profiles": profiles,
+            "resource_cache": RESOURCE_CACHE.stats(),
+        }
+
+    #! <%GTREE 4.3 Reload changed profiles%>
+    def reload(self):
+        """
+        Reload every profile whose settings, mapping or schema file changed.
+        A profile that fails to reload keeps serving its previous version.
+
+        :return: Dictionary with the reloaded, unchanged and failed profiles.
+        """
+        result = {"reloaded": [], "unchanged": [], "failed": {}}
+        with self._profiles_lock:
+            profiles = dict(self.profiles)
+        for name, profile in profiles.items():
+            try:
+                if profile.current_fingerprint() == profile.fingerprint:
+                    result["unchanged"].append(name)
+                    continue
+                reloaded_profile = ConversionProfile(name, profile.settings_path)
+            except Exception as e:
+                result["failed"][name] = f"{type(e).__name__}: {e}"
+                continue
+            with self._profiles_lock:
+                self.profiles[name] = reloaded_profile
+            result["reloaded"].append(name)
+        return result
+
+    #! <%GTREE 4.4 Convert a workbook%>
+    def profile(self, profile_name):
+        """
+        :raises ServiceError: 404 for an unknown profile.
+        """
+        with self._profiles_lock:
+            profile = self.profiles.get(profile_name)
+        if profile is None:
+            raise ServiceError(HTTPStatus.NOT_FOUND, f"Unknown profile '{profile_name}'.")
+        return profile
+
+    def convert(self, profile_name, workbook_path, upload_dir=None):
+        """
+        Convert a workbook with a profile on the worker pool.
+
+        :param upload_dir: Folder of an uploaded workbook; the conversion owns it
+                           and removes it when it ends (or is not admitted).
+        :return: The OIMS JSON document as bytes, formatted as the profile's settings ask.
+        :raises ServiceError: 404 for an unknown profile, 503 when the queue is full,
+                              504 on timeout, 422 when the conversion fails.
+        """
+        try:
+            profile = self.profile(profile_name)
+            self._admit()
+        except BaseException:
+            _remove_upload(upload_dir)
+            raise
+        try:
+            future = self.executor.submit(self._convert_on_worker, profile, workbook_path)
+        except BaseException:
+            self._conversion_ended(upload_dir)
+            raise
+        # the slot and the upload are released when the conversion ends, not when the request gives up on it
+        future.add_done_callback(lambda _: self._conversion_ended(upload_dir))
+        try:
+            return future.result(timeout=self.server_settings["request_timeout"])
+        except FutureTimeoutError:
+            # a conversion still waiting for a worker is dropped
+            future.cancel()
+            raise ServiceError(HTTPStatus.GATEWAY_TIMEOUT, "Conversion timed out.")
+
+    def _admit(self):
+        """
+        :raises ServiceError: 503 when the queue is full.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._counter_lock:
+                self.rejected += 1
+            raise ServiceError(HTTPStatus.SERVICE_UNAVAILABLE, "Conversion queue is full.", {"Retry-After": "1"})
+        with self._counter_lock:
+            self.admitted += 1
+
+    def _conversion_ended(self, upload_dir):
+        _remove_upload(upload_dir)
+        with self._counter_lock:
+            self.admitted -= 1
+        self._slots.release()
+
+    def _convert_on_worker(self, profile, workbook_path):
+        from metadata_converter import MetadataConverter
+
+        with self._counter_lock:
+            self.active += 1
+        output_dir = tempfile.mkdtemp(prefix="oims_service_")
+        try:
+            output_path = os.path.join(output_dir, "output.json")
+            settings = dict(profile.settings)
+            settings["path_to_primary_metadata"] = workbook_path
+            settings["path_to_output_oims_metadata_file"] = output_path
+            settings["output_json_path"] = output_path
+            # the response is one OIMS document
+            settings["output_mode"] = "single"
+
+            converter = MetadataConverter(
+                settings=settings,
+                mapping=profile.mapping,
+                schema=profile.schema_index,
+                validation_plan=profile.validation_plan
+            )
+            try:
+                with log_context(run_id=converter.run_id, workbook=profile.name):
+                    converter.validate_settings()
+                    converter.load_inputs()
+                    converter.validate_inputs(validate_mapping=False)
+                    converter.generate_outputs(converter.convert_data())
+            except Exception as e:
+                raise ServiceError(HTTPStatus.UNPROCESSABLE_ENTITY, f"{type(e).__name__}: {e}")
+            with open(output_path, "rb") as output_file:
+                return output_file.read()
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+            with self._counter_lock:
+                self.active -= 1
+                self.finished += 1
+
+    #! <%GTREE 4.5 Serve%>
+    def serve_forever(self):
+        host, port = self.server_settings["host"], self.server_settings["port"]
+        server = ThreadingHTTPServer((host, port), ConversionRequestHandler)
+        server.service = self
+        logger.info("OIMS conversion service listening on http://%s:%s", host, server.server_address[1])
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.executor.shutdown(wait=True)
+
+#! <%GTREE 5 HTTP request handler%>
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    server_version = "OIMSConversionService/1.0"
+
+    def log_message(self, format, *args):
+        # request lines go to the converter logging instead of stderr
+        logger.info("%s - " + format, self.address_string(), *args)
+
+    #! <%GTREE 5.1 Routing%>
+    def do_GET(self):
+        self._dispatch({"/health": self._health})
+
+    def do_POST(self):
+        self._dispatch({"/convert": self._convert, "/reload": self._reload})
+
+    def _dispatch(self, routes):
+        url = urlparse(self.path)
+        handler = routes.get(url.path)
+        try:
+            if handler is None:
+                raise ServiceError(HTTPStatus.NOT_FOUND, f"Unknown endpoint '{url.path}'.")
+            handler(parse_qs(url.query))
+        except ServiceError as e:
+            self._send_json(e.status, {"error": str(e)}, e.headers)
+        except Exception as e:
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"})
+
+    #! <%GTREE 5.2 Endpoints%>
+    def _health(self, query):
+        self._send_json(HTTPStatus.OK, self.server.service.status())
+
+    def _reload(self, query):
+        self._send_json(HTTPStatus.OK, self.server.service.reload())
+
+    def _convert(self, query):
+        service = self.server.service
+        profile_name = query.get("profile", [DEFAULT_PROFILE])[0]
+        service.profile(profile_name)
+        body = self._read_body(service.server_settings["max_upload_mb"])
+
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            if not service.server_settings["allow_paths"]:
+                raise ServiceError(HTTPStatus.FORBIDDEN, "Converting workbooks by path is disabled (allow_paths).")
+            try:
+                workbook_path = json.loads(body)["path"]
+            except (ValueError, KeyError, TypeError):
+                raise ServiceError(HTTPStatus.BAD_REQUEST, 'Expected a JSON body {"path": "<workbook path>"}.')
+            self._send_bytes(HTTPStatus.OK, service.convert(profile_name, workbook_path))
+            return
+
+        if not body:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "Expected the workbook in the request body.")
+        upload_dir = tempfile.mkdtemp(prefix="oims_upload_")
+        try:
+            workbook_path = os.path.join(upload_dir, "upload.xlsx")
+            with open(workbook_path, "wb") as workbook_file:
+                workbook_file.write(body)
+        except BaseException:
+            _remove_upload(upload_dir)
+            raise
+        # the conversion removes the upload when it ends, which can be after a 504
+        self._send_bytes(HTTPStatus.OK, service.convert(profile_name, workbook_path, upload_dir=upload_dir))
+
+    #! <%GTREE 5.3 Request and response helpers%>
+    def _read_body(self, max_upload_mb):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length header.")
+        if length > max_upload_mb * 1024 * 1024:
+            raise ServiceError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Upload exceeds {max_upload_mb} MB.")
+        return self.rfile.read(length) if length else b""
+
+    def _send_bytes(self, status, body, headers=None, content_type="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, data, headers=None):
+        self._send_bytes(status, json.dumps(data, indent=4).encode("utf-8"), headers)
+
+#============================   End Of File   ================================
@@ -17,6 +17,13 @@ need to develop the code
 """
 - Version 1.0.0: Initial implementation of the conversion utility to convert a
                  mapping file in excel format into an OIMS-compatioble JSON file.
+- Version 1.0.1: mapping_metadata properties are read from a single-pass
+                 property index and written as text.
+- Version 1.0.2: A cached mapping is dated like a fresh conversion and the
+                 sibling JSON file is rewritten when it differs from it.
+- Version 1.0.3: Optional mapping_metadata properties (descriptions, schema url
+                 and pid, version status, contact) may be empty; they are then
+                 left out of the header.
 """
 #=============================================================================
 #<%/REGION File header%>
@@ -30,30 +37,57 @@ import os
 from datetime import datetime
 
 from validators.base_validators import BaseValidators
+from utils.workbook_session import WorkbookSession
+from utils.frame_records import records_without_missing
+from utils.json_writer import OimsJsonWriter
+from utils.logger import get_logger, log_context
+
+logger = get_logger("ConvertMappingExcel")
+
+#! <%GTREE 1.2 tool version as a variable%>
+__tool_version__ = "1.0.3"
+
 #! <%GTREE 2 Convert Excel mapping to OIMS class%>
 class ConvertMappingExcel:
+    #! <%GTREE 2.0 Initialization%>
+    def __init__(self, mapping_cache=None):
+        """
+        :param mapping_cache: Optional MappingCache; compiled mappings are then
+                              reused as long as the workbook bytes and the tool version do not change.
+        """
+        self.mapping_cache = mapping_cache
+
     #! <%GTREE 2.1 main method%>
-    def convert_excel_mapping(self, mapping_excel_path, output_json_path=None):
-        #! <%GTREE 2.1.1 tool version as a variable%>
-        __tool_version__ = "1.0.0"
+    def convert_excel_mapping(self, mapping_excel_path, output_json_path=None, excel_data=None):
         """
         Convert an Excel mapping file into the OIMS standard JSON format.
 
         :param mapping_excel_path: Path to the Excel mapping file.
         :param output_json_path: Path to save the converted JSON file.
+        :param excel_data: Optional WorkbookSession on the mapping file; sheets are parsed once.
         :return: Dictionary representation of the OIMS mapping.
         """
-        #! <%GTREE 2.1.2 load Excel sheets%>
-        # Load Excel sheets
-        excel_data = pd.ExcelFile(mapping_excel_path)
-        mappings_df = excel_data.parse('mappings')
-        mapping_metadata_df = excel_data.parse('mapping_metadata')
-
-        #! <%GTREE 2.1.3 Determine output path and write to JSON%>
+        #! <%GTREE 2.1.1 Determine output path%>
         #
         if not output_json_path:
             output_json_path = os.path.splitext(mapping_excel_path)[0] + ".json"
 
+        #! <%GTREE 2.1.2 reuse a cached compiled mapping%>
+        cache_key = None
+        if self.mapping_cache is not None:
+            cache_key = self.mapping_cache.key(mapping_excel_path, __tool_version__)
+            cached_mapping = self.mapping_cache.get(cache_key)
+            if cached_mapping is not None:
+                return self.reuse_cached_mapping(cached_mapping, mapping_excel_path, output_json_path)
+
+        #! <%GTREE 2.1.3 load Excel sheets%>
+        # Load Excel sheets
+        if excel_data is None:
+            excel_data = WorkbookSession(mapping_excel_path)
+        mappings_df = excel_data.parse('mappings')
+        mapping_metadata_df = excel_data.parse('mapping_metadata')
+        mapping_properties = MappingProperties(mapping_metadata_df)
+
         #! <%GTREE 2.1.4 build header section%>
         # Build OIMS Header
         oims_header = {
@@ -71,8 +105,8 @@ class ConvertMappingExcel:
                     }
                 ]
             },
-            "metadata_schema": self.build_metadata_schema(mapping_metadata_df),
-            "file_descriptors": self.build_file_descriptors(mapping_metadata_df)
+            "metadata_schema": self.build_metadata_schema(mapping_properties),
+            "file_descriptors": self.build_file_descriptors(mapping_properties)
         }
 
         #! <%GTREE 2.1.5 build content section%>
@@ -91,7 +125,7 @@ class ConvertMappingExcel:
                 )
             except ValueError as e:
                 # Handle missing mandatory fields with a descriptive error
-                print(f"Validation error: {e}")
+                logger.warning("Validation error: %s", e)
                 continue  # Skip the invalid row and proceed with the next
 
 
@@ -123,9 +157,7 @@ class ConvertMappingExcel:
                     "OIMS_content_object": "mapping",
                     "OIMS_content_object_properties": {
                         "validated_oims_metadata_schema":[
-                            mapping_metadata_df.loc[
-                                mapping_metadata_df["Property"] == "validated_oims_metadata_schema", "value"
-                            ].values[0]
+                            mapping_properties.get_str("validated_oims_metadata_schema")
                         ],
                         "metadata_class":["mappings"],
                         "metadata":oims_content_object_metadata_blocks
@@ -143,127 +175,219 @@ class ConvertMappingExcel:
         }
 
         #! <%GTREE 2.1.6 save output to json and return the mapping in oims format%>
-        with open(output_json_path, "w") as json_file:
-            json.dump(oims_data, json_file, indent=4)
-        print(f"Converted OIMS JSON saved to: {output_json_path}")
+        OimsJsonWriter(output_json_path).write(oims_data)
+        logger.info("Converted OIMS JSON saved to: %s", output_json_path)
+
+        if cache_key is not None:
+            self.mapping_cache.put(cache_key, oims_data)
 
         return oims_data
 
+    #! <%GTREE 2.1.7 return a mapping from the cache%>
+    def reuse_cached_mapping(self, oims_data, mapping_excel_path, output_json_path):
+        """
+        Return a cached compiled mapping. The input parameters in the header are
+        set to the current paths and the version date to today, as in a fresh
+        conversion. The sibling JSON file is written if it is missing or differs
+        from the mapping (e.g. after the workbook was reverted to an earlier,
+        cached version).
+
+        :param oims_data: Cached OIMS mapping.
+        :param mapping_excel_path: Path to the Excel mapping file.
+        :param output_json_path: Path of the converted JSON file.
+        :return: Dictionary representation of the OIMS mapping.
+        """
+        oims_header = oims_data["OIMS"]["OIMS_header"]
+        oims_header["file_descriptors"]["metadata_version"]["version_date"] = datetime.now().strftime("%Y-%m-%d")
+        oims_header["mapping_info"]["input_parameters"] = [
+            {
+                "input_parameter_name": "mapping_excel_path",
+                "input_parameter_value": mapping_excel_path
+            },
+            {
+                "output_parameter_name": "output_json_path",
+                "output_parameter_value": output_json_path
+            }
+        ]
+        if not self.json_file_matches(output_json_path, oims_data):
+            OimsJsonWriter(output_json_path).write(oims_data)
+        logger.info("Using cached OIMS mapping for: %s", mapping_excel_path)
+        return oims_data
+
+    @staticmethod
+    def json_file_matches(json_path, oims_data):
+        """
+        :return: True if the JSON file exists and holds exactly oims_data.
+        """
+        try:
+            with open(json_path, "r", encoding="utf-8") as json_file:
+                return json.load(json_file) == oims_data
+        except (OSError, ValueError):
+            return False
+
     #! <%GTREE 2.2 build metadata schema sub section of the OIMS_header section method%>
-    def build_metadata_schema(self, mapping_metadata_df):
+    def build_metadata_schema(self, mapping_properties):
         """
-        Build the metadata schema section of the OIMS header.
+        Build the metadata schema section of the OIMS header. Optional properties
+        that are empty are left out (schema_pid when there is no pid).
 
-        :param mapping_metadata_df: DataFrame containing metadata schema information.
+        :param mapping_properties: MappingProperties (or the mapping_metadata DataFrame) with the metadata schema information.
         :return: Metadata schema structure.
         """
-        schema_name = mapping_metadata_df.loc[
-            mapping_metadata_df["Property"] == "schema_name", "value"
-        ].values[0]
-        schema_description = mapping_metadata_df.loc[
-            mapping_metadata_df["Property"] == "schema_description", "value"
-        ].values[0]
-        schema_version = mapping_metadata_df.loc[
-            mapping_metadata_df["Property"] == "schema_version", "value"
-        ].values[0]
-        schema_url = mapping_metadata_df.loc[
-            mapping_metadata_df["Property"] == "schema_url", "value"
-        ].values[0]
-        pid_scheme = mapping_metadata_df.loc[
-            mapping_metadata_df["Property"] == "pid_scheme", "value"
-        ].values[0]
-        pid = mapping_metadata_df.loc[
-            mapping_metadata_df["Property"] == "pid", "value"
-        ].values[0]
+        mapping_properties = MappingProperties.of(mapping_properties)
+        schema_name = mapping_properties.get_str("schema_name")
+        schema_description = mapping_properties.get_optional_str("schema_description")
+        schema_version = mapping_properties.get_str("schema_version")
+        schema_url = mapping_properties.get_optional_str("schema_url")
+        pid_scheme = mapping_properties.get_optional_str("pid_scheme")
+        pid = mapping_properties.get_optional_str("pid")
 
+        schema_properties = {
+            "schema_name": schema_name,
+            "schema_description": schema_description,
+            "schema_type": "primary metadata metadata",
+            "schema_version": schema_version,
+            "schema_url": schema_url,
+            "schema_pid": {
+                "pid_scheme": pid_scheme,
+                "pid": pid
+            } if pid is not None else None,
+            "OIMS_content_object": "mapping"
+        }
         return [
             {
                 "OIMS_content_object": "mapping",
-                "schema_properties": [
-                    {
-                        "schema_name": schema_name,
-                        "schema_description": schema_description,
-                        "schema_type": "primary metadata metadata",
-                        "schema_version": schema_version,
-                        "schema_url": schema_url,
-                        "schema_pid": {
-                            "pid_scheme": pid_scheme,
-                            "pid": pid
-                        },
-                        "OIMS_content_object": "mapping"
-                    }
-                ]
+                "schema_properties": [without_empty(schema_properties)]
             }
         ]
 
     #! <%GTREE 2.3 build file descriptors sub section of the OIMS_header section method%>
-    def build_file_descriptors(self, mapping_metadata_df):
+    def build_file_descriptors(self, mapping_properties):
         """
-        Build the file descriptors section of the OIMS header.
+        Build the file descriptors section of the OIMS header. Optional properties
+        that are empty are left out (the contact when it has no properties).
 
-        :param mapping_metadata_df: DataFrame containing file descriptor information.
+        :param mapping_properties: MappingProperties (or the mapping_metadata DataFrame) with the file descriptor information.
         :return: File descriptors structure.
         """
-        metadata_name = mapping_metadata_df.loc[
-            mapping_metadata_df["Property"] == "metadata_name", "value"
-        ].values[0]
-        metadata_description = mapping_metadata_df.loc[
-            mapping_metadata_df["Property"] == "metadata_description", "value"
-        ].values[0]
-        current_version = mapping_metadata_df.loc[
-            mapping_metadata_df["Property"] == "current_version", "value"
-        ].values[0]
-        metadata_version_status = mapping_metadata_df.loc[
-            mapping_metadata_df["Property"] == "metadata_version_status", "value"
-        ].values[0]
-        contact_name = mapping_metadata_df.loc[
-            mapping_metadata_df["Property"] == "contact_name", "value"
-        ].values[0]
-        contact_role = mapping_metadata_df.loc[
-            mapping_metadata_df["Property"] == "contact_role", "value"
-        ].values[0]
-        contact_email = mapping_metadata_df.loc[
-            mapping_metadata_df["Property"] == "contact_email", "value"
-        ].values[0]
-
-        return {
+        mapping_properties = MappingProperties.of(mapping_properties)
+        metadata_name = mapping_properties.get_str("metadata_name")
+        metadata_description = mapping_properties.get_optional_str("metadata_description")
+        current_version = mapping_properties.get_str("current_version")
+        metadata_version_status = mapping_properties.get_optional_str("metadata_version_status")
+        contact_name = mapping_properties.get_optional_str("contact_name")
+        contact_role = mapping_properties.get_optional_str("contact_role")
+        contact_email = mapping_properties.get_optional_str("contact_email")
+
+        contact = without_empty({
+            "contact_name": contact_name,
+            "contact_role": contact_role,
+            "contact_email": [contact_email] if contact_email is not None else None
+        })
+        return without_empty({
             "metadata_name": metadata_name,
             "metadata_description": metadata_description,
-            "metadata_version": {
+            "metadata_version": without_empty({
                 "current_version": current_version,
                 "metadata_version_status": metadata_version_status,
                 "version_date": datetime.now().strftime("%Y-%m-%d")
-            },
+            }),
             "metadata_pid": {
                 "pid_scheme": "TBD",
                 "pid": "to be determined"
             },
-            "contact": [
-                {
-                    "contact_name": contact_name,
-                    "contact_role": contact_role,
-                    "contact_email": [contact_email]
-                }
-            ]
-        }
+            "contact": [contact] if contact else None
+        })
 
     #! <%GTREE 2.4 parse attribute pairs%>
     def parse_attribute_pairs(self, sheetname, excel_data):
         """
         Parse additional sheets for attribute pairs based on the sheet name.
+        Each row becomes one attribute pair without its empty cells; the
+        missing-value mask is computed once for the whole sheet.
         :param sheetname: Name of the sheet to parse for attribute pairs.
-        :param excel_data: ExcelFile object containing all sheets.
+        :param excel_data: WorkbookSession (or ExcelFile) object containing all sheets.
         :return: List of attribute pairs.
         """
+        with log_context(sheet=sheetname):
+            try:
+                sheet_data = excel_data.parse(sheetname)
+                return records_without_missing(sheet_data)
+            except Exception as e:
+                logger.warning("Could not parse attribute pairs for sheet '%s'. Error: %s", sheetname, e)
+                return []
+
+#! <%GTREE 3 Property index of the mapping_metadata sheet%>
+class MappingProperties:
+    """
+    Property -> value index of the mapping_metadata sheet, built in a single
+    pass over the sheet. When a property is listed more than once the first
+    row wins.
+    """
+    #! <%GTREE 3.1 Initialization%>
+    def __init__(self, mapping_metadata_df):
+        """
+        :param mapping_metadata_df: DataFrame of the mapping_metadata sheet with the columns "Property" and "value".
+        """
+        missing_columns = [column for column in ("Property", "value") if column not in mapping_metadata_df.columns]
+        if missing_columns:
+            raise ValueError(f"Missing column(s) {missing_columns} in sheet 'mapping_metadata'.")
+
+        self.values = {}
+        for name, value in zip(mapping_metadata_df["Property"].tolist(), mapping_metadata_df["value"].tolist()):
+            if isinstance(name, str):
+                name = name.strip()
+            self.values.setdefault(name, value)
+
+    @classmethod
+    def of(cls, mapping_properties):
+        """
+        :return: The MappingProperties itself, or an index built from a mapping_metadata DataFrame.
+        """
+        return mapping_properties if isinstance(mapping_properties, cls) else cls(mapping_properties)
+
+    #! <%GTREE 3.2 Typed accessors%>
+    def get(self, name):
+        """
+        :param name: Property name.
+        :return: Value of the property.
+        :raises ValueError: If the property is missing or has no value.
+        """
+        value = self.values.get(name)
+        if value is None or pd.isna(value):
+            raise ValueError(f"Missing property '{name}' in sheet 'mapping_metadata'.")
+        return value
+
+    def get_str(self, name):
+        """
+        :return: Value of the property as text (surrounding whitespace removed).
+        """
+        return str(self.get(name)).strip()
+
+    def get_optional(self, name, default=None):
+        """
+        :return: Value of the property, or `default` if it is missing or empty.
+        """
         try:
-            sheet_data = excel_data.parse(sheetname)
-            attribute_pairs = []
-            for _, row in sheet_data.iterrows():
-                cleaned_row = {key: value for key, value in row.items() if pd.notna(value)}
-                attribute_pairs.append(cleaned_row)
-            return attribute_pairs
-        except Exception as e:
-            print(f"Warning: Could not parse attribute pairs for sheet '{sheetname}'. Error: {e}")
-            return []
+            return self.get(name)
+        except ValueError:
+            return default
+
+    def get_optional_str(self, name):
+        """
+        :return: Value of the property as text, or None if it is missing or blank.
+        """
+        value = self.get_optional(name)
+        if value is None:
+            return None
+        return str(value).strip() or None
+
+#! <%GTREE 4 Helpers%>
+def without_empty(properties):
+    """
+    :param properties: Dictionary of header properties.
+    :return: Copy of `properties` without the keys whose value is None.
+    """
+    return {key: value for key, value in properties.items() if value is not None}
 
 #============================   End Of File   ================================
\ No newline at end of file
@@ -0,0 +1,152 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : incremental_conversion.py
+# Author    : ForesightInitiative
+# Version   : 1.0.2
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# documentation   :
+"""
+Incremental reconversion of a workbook: only the sheets whose content
+changed since the previous run are validated and mapped again.
+
+After every conversion a sidecar file is written next to the output
+(<output>.sheets.pickle) with
+    - the key of the run: mapper, mapper tool version, mapping digest and the
+      schema content digest (the plan depends on the data types and
+      "multiple" flags of the schema, not only on its name)
+    - the fingerprint of every sheet (utils/sheet_fingerprint.py)
+    - the output fragments of every group of the compiled mapping plan
+On the next run the sheets whose fingerprint changed (or that were added or
+removed) are validated and mapped; the fragments of all other sheets are
+taken from the sidecar, and the fragments are assembled in plan order.
+The output is therefore identical to a full run. A missing or outdated
+sidecar (other mapping, schema or mapper version) simply gives a full run.
+
+Only mappers that compile plans into fragments (get_plan, execute_fragments
+and assemble, e.g. GenericMapper) support this; other mappers always
+convert the whole workbook.
+
+Enabled with the setting "incremental_conversion": true.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the incremental reconversion.
+- Version 1.0.1: The sidecar key uses the schema content digest instead of its name.
+- Version 1.0.2: The mapping digest is computed once per frozen mapping (content_sha256).
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+#! <%GTREE 1.1 Load standard python Libraries%>
+import os
+import pickle
+import sys
+import tempfile
+
+#! <%GTREE 1.2 Load OIMS converter tool libraries%>
+from modules.mapper_registry import MAPPER_REGISTRY
+from modules.resource_cache import content_sha256
+from utils.sheet_fingerprint import sheet_fingerprints
+
+SIDECAR_SUFFIX = ".sheets.pickle"
+SIDECAR_FORMAT = 1
+
+#! <%GTREE 2 IncrementalConversion Class%>
+class IncrementalConversion:
+    #! <%GTREE 2.1 Initialization%>
+    def __init__(self, converter, registry=None):
+        """
+        :param converter: MetadataConverter after validate_settings() and load_inputs().
+        :param registry: MapperRegistry (default: the process-wide registry).
+        """
+        self.converter = converter
+        self.registry = registry or MAPPER_REGISTRY
+        output_path = converter.settings.get("output_json_path") or converter.settings["path_to_output_oims_metadata_file"]
+        self.sidecar_path = output_path + SIDECAR_SUFFIX
+        self.changed_sheets = None
+
+    @staticmethod
+    def supports(mapper):
+        return all(hasattr(mapper, name) for name in ("get_plan", "execute_fragments", "assemble"))
+
+    #! <%GTREE 2.2 Sidecar%>
+    def load_sidecar(self, key):
+        """
+        :return: The previous state if it was written for the same key, else None.
+        """
+        try:
+            with open(self.sidecar_path, "rb") as sidecar_file:
+                state = pickle.load(sidecar_file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        if not isinstance(state, dict) or state.get("format") != SIDECAR_FORMAT or state.get("key") != key:
+            return None
+        return state
+
+    def save_sidecar(self, key, fingerprints, fragments):
+        """Write the sidecar atomically."""
+        state = {"format": SIDECAR_FORMAT, "key": key, "fingerprints": fingerprints, "fragments": fragments}
+        sidecar_dir = os.path.dirname(os.path.abspath(self.sidecar_path))
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=sidecar_dir, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as sidecar_file:
+                pickle.dump(state, sidecar_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, self.sidecar_path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+    #! <%GTREE 2.3 Validate and convert the changed sheets%>
+    def convert(self):
+        """
+        Validate and map the changed sheets, reuse the rest.
+
+        :return: OIMS document dictionary (identical to a full conversion).
+        """
+        converter = self.converter
+        mapper = self.registry.get_mapper(converter.mapping_classification_id, converter.mapping_id, converter.schema_id)
+        if not self.supports(mapper):
+            converter.logger.info(f"{type(mapper).__name__} does not support incremental conversion, converting all sheets.")
+            converter.validate_inputs()
+            return converter.convert_data()
+
+        workbook_path = converter.settings["path_to_primary_metadata"]
+        fingerprints = sheet_fingerprints(workbook_path)
+        plan = mapper.get_plan(converter.mapping, converter.schema_index)
+        mapper_module = sys.modules.get(type(mapper).__module__)
+        key = (
+            type(mapper).__name__,
+            getattr(mapper_module, "__tool_version__", None),
+            content_sha256(converter.mapping),
+            converter.schema_index.content_sha256(),
+        )
+
+        previous = self.load_sidecar(key)
+        mapped_sheets = {group.sheetname for group in plan.groups}
+        if previous is None:
+            self.changed_sheets = mapped_sheets
+            previous_fragments = None
+            converter.logger.info("Incremental conversion: no previous state, converting all sheets.")
+        else:
+            self.changed_sheets = {
+                sheetname for sheetname in mapped_sheets
+                if fingerprints.get(sheetname) != previous["fingerprints"].get(sheetname)
+            }
+            previous_fragments = previous["fragments"]
+            converter.logger.info(
+                f"Incremental conversion: {len(self.changed_sheets)} of {len(mapped_sheets)} mapped sheet(s) changed "
+                f"{sorted(self.changed_sheets)}."
+            )
+
+        # the mapping itself is only validated against the schema when there is no previous state
+        converter.validate_inputs(validate_mapping=previous is None, sheets=self.changed_sheets)
+        fragments = mapper.execute_fragments(plan, converter.excel_data, self.changed_sheets, previous_fragments)
+        output_data = mapper.assemble(fragments, workbook_path)
+        self.save_sidecar(key, fingerprints, fragments)
+        return output_data
+
+#============================   End Of File   ================================
@@ -12,61 +12,39 @@
 # version history information   :
 """
 - Version 1.0.0: Initial implementation of the mapping utility.
+- Version 1.1.0: Mappers are resolved and kept alive through the mapper registry.
+- Version 1.2.0: Optional streamed output for mappers that offer stream_data().
 """
 #=============================================================================
 #<%/REGION File header%>
 
 #! <%GTREE 1 Initialization%>
-#! <%GTREE 1.1 Load standard python libraries%>
-import json
-
-#! <%GTREE 1.2 Load OIMS converter tool libraries%>
-#! <%GTREE 1.2.1 Load data%>
-from oims_structures.converter_data import (
-    KNOWN_MAPPING_CLASSIFICATIONS,
-    KNOWN_MAPPINGS,
-    KNOWN_SCHEMAS,
-    KNOWN_COMBINATIONS,
-    FALLBACK_MAPPER
-)
+#! <%GTREE 1.1 Load OIMS converter tool libraries%>
+from modules.mapper_registry import MAPPER_REGISTRY
 
 #! <%GTREE 2 Mapper Class%>
 class Mapper:
     #! <%GTREE 2.1 Class initialization%>
-    def __init__(self):
-        print("initializing mapper class")
+    def __init__(self, registry=None):
+        """
+        :param registry: MapperRegistry to resolve mappers with (default: the process-wide registry).
+        """
+        self.registry = registry or MAPPER_REGISTRY
 
     #! <%GTREE 2.2 main mapper code%>
-    def map_to_json(self, excel_data, mapping, schema, mapping_classification_id, mapping_id, schema_id):
+    def map_to_json(self, excel_data, mapping, schema, mapping_classification_id, mapping_id, schema_id, stream=False):
         """
         Main entry point for mapping data to JSON.
-        Determines the appropriate conversion approach based on IDs.
-        """
-        print("Determining conversion approach...")
+        Determines the appropriate conversion approach based on IDs. The
+        resolution and the mapper instance are cached in the registry, so
+        repeated conversions in one process reuse them.
 
-        # Identify the conversion approach
-        mapper_class_name = None
-
-        # Step 1: Check if a specific mapping ID is known
-        if mapping_id in KNOWN_MAPPINGS:
-            mapper_class_name = KNOWN_MAPPINGS[mapping_id]
-        # Step 2: Check if the (mapping_classification_id, schema_id) pair is known
-        elif mapping_classification_id in KNOWN_MAPPING_CLASSIFICATIONS and schema_id in self.known_schemas:
-            mapper_class_name = KNOWN_COMBINATIONS.get(
-                (mapping_classification_id, schema_id),
-                FALLBACK_MAPPER  # Default to the standard fallback mappeer (e.g. GenericMapper) if no specific match
-            )
-        else:
-            # Step 3: Fallback to generic mapper
-            mapper_class_name = FALLBACK_MAPPER
-            print(f"Unknown mapping combination for classification ID '{mapping_classification_id}' and schema ID '{schema_id}'. Using {mapper_class_name}.")
-
-        # Dynamically import and use the selected mapper class
-        try:
-            module = __import__(f"mappers.{mapper_class_name.lower()}", fromlist=[mapper_class_name])
-            mapper_class = getattr(module, mapper_class_name)
-            return mapper_class.map_data(excel_data, mapping, schema)
-        except ImportError:
-            raise ImportError(f"Mapper class '{mapper_class_name}' not found. Ensure it is implemented and imported.")
+        :param stream: Let the mapper produce OIMS_content while it is written,
+                       if it supports that (stream_data); used in low-memory mode.
+        """
+        mapper = self.registry.get_mapper(mapping_classification_id, mapping_id, schema_id)
+        if stream and hasattr(mapper, "stream_data"):
+            return mapper.stream_data(excel_data, mapping, schema)
+        return mapper.map_data(excel_data, mapping, schema)
 
 #============================   End Of File   ================================
\ No newline at end of file
@@ -0,0 +1,175 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : mapper_registry.py
+# Author    : ForesightInitiative
+# Version   : 1.0.1
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Registry that resolves a (mapping_id, mapping_classification_id, schema_id)
+combination to a mapper class and keeps one instance per mapper alive for the
+lifetime of the process, so mappers can keep precomputed state (e.g. compiled
+mapping plans) across conversions.
+
+Resolution follows the tables in oims_structures/converter_data.py:
+    1. KNOWN_MAPPINGS[mapping_id]
+    2. KNOWN_COMBINATIONS[(mapping_classification_id, schema_id)] when both are known
+    3. FALLBACK_MAPPER
+and is memoized per key.
+
+Mapper classes are found, in this order, among
+    - classes registered with the @register_mapper decorator
+    - the "oims_converter.mappers" entry points of installed packages
+    - the module mappers.<mapper name in lower case>
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the mapper registry.
+- Version 1.0.1: Errors raised while importing a mapper module are no longer
+                 reported as a missing mapper.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+#! <%GTREE 1.1 Load standard python libraries%>
+import importlib
+import importlib.metadata
+import threading
+
+from utils.logger import get_logger
+
+#! <%GTREE 1.2 Load data%>
+from oims_structures.converter_data import (
+    KNOWN_MAPPING_CLASSIFICATIONS,
+    KNOWN_MAPPINGS,
+    KNOWN_SCHEMAS,
+    KNOWN_COMBINATIONS,
+    FALLBACK_MAPPER
+)
+
+ENTRY_POINT_GROUP = "oims_converter.mappers"
+
+logger = get_logger("MapperRegistry")
+
+#! <%GTREE 2 MapperRegistry Class%>
+class MapperRegistry:
+    #! <%GTREE 2.1 Initialization%>
+    def __init__(self):
+        self._classes = {}
+        self._resolved_names = {}
+        self._instances = {}
+        self._entry_points = None
+        self._lock = threading.RLock()
+
+    #! <%GTREE 2.2 Registration%>
+    def register(self, name=None):
+        """
+        Class decorator that registers a mapper under `name` (default: the class name).
+
+            @register_mapper()
+            class GenericMapper: ...
+        """
+        def decorator(mapper_class):
+            with self._lock:
+                self._classes[name or mapper_class.__name__] = mapper_class
+            return mapper_class
+        return decorator
+
+    #! <%GTREE 2.3 Resolve the mapper name%>
+    def resolve_name(self, mapping_classification_id, mapping_id, schema_id):
+        """
+        :return: Name of the mapper class for the combination (memoized).
+        """
+        key = (mapping_id, mapping_classification_id, schema_id)
+        if key in self._resolved_names:
+            return self._resolved_names[key]
+
+        # Step 1: Check if a specific mapping ID is known
+        if mapping_id in KNOWN_MAPPINGS:
+            mapper_class_name = KNOWN_MAPPINGS[mapping_id]
+        # Step 2: Check if the (mapping_classification_id, schema_id) pair is known
+        elif mapping_classification_id in KNOWN_MAPPING_CLASSIFICATIONS and schema_id in KNOWN_SCHEMAS:
+            mapper_class_name = KNOWN_COMBINATIONS.get(
+                (mapping_classification_id, schema_id),
+                FALLBACK_MAPPER  # Default to the standard fallback mapper (e.g. GenericMapper) if no specific match
+            )
+        else:
+            # Step 3: Fallback to generic mapper
+            mapper_class_name = FALLBACK_MAPPER
+            logger.info(
+                "Unknown mapping combination for classification ID '%s' and schema ID '%s'. Using %s.",
+                mapping_classification_id, schema_id, mapper_class_name
+            )
+
+        self._resolved_names[key] = mapper_class_name
+        return mapper_class_name
+
+    #! <%GTREE 2.4 Find the mapper class%>
+    def _load_entry_points(self):
+        if self._entry_points is None:
+            entry_points = importlib.metadata.entry_points()
+            if hasattr(entry_points, "select"):
+                entry_points = entry_points.select(group=ENTRY_POINT_GROUP)
+            else:  # Python 3.9
+                entry_points = entry_points.get(ENTRY_POINT_GROUP, [])
+            self._entry_points = {entry_point.name: entry_point for entry_point in entry_points}
+        return self._entry_points
+
+    def mapper_class(self, mapper_class_name):
+        """
+        :param mapper_class_name: Name of the mapper class.
+        :return: The mapper class.
+        :raises ImportError: If no implementation can be found. Errors raised by
+                             the mapper module itself (e.g. a missing dependency)
+                             are passed on unchanged.
+        """
+        with self._lock:
+            if mapper_class_name in self._classes:
+                return self._classes[mapper_class_name]
+
+            entry_point = self._load_entry_points().get(mapper_class_name)
+            if entry_point is not None:
+                mapper_class = entry_point.load()
+            else:
+                module_name = f"mappers.{mapper_class_name.lower()}"
+                try:
+                    module = importlib.import_module(module_name)
+                except ModuleNotFoundError as e:
+                    # only the mapper module itself missing means "not found"
+                    if e.name not in (module_name, "mappers"):
+                        raise
+                    raise ImportError(f"Mapper class '{mapper_class_name}' not found. Ensure it is implemented and imported.") from e
+                # importing the module normally registers the class through the decorator
+                mapper_class = self._classes.get(mapper_class_name) or getattr(module, mapper_class_name, None)
+                if mapper_class is None:
+                    raise ImportError(f"Mapper class '{mapper_class_name}' not found. Ensure it is implemented and imported.")
+
+            self._classes[mapper_class_name] = mapper_class
+            return mapper_class
+
+    #! <%GTREE 2.5 Long-lived mapper instances%>
+    def get_mapper(self, mapping_classification_id, mapping_id, schema_id):
+        """
+        :return: The (cached) mapper instance for the combination.
+        """
+        mapper_class_name = self.resolve_name(mapping_classification_id, mapping_id, schema_id)
+        with self._lock:
+            if mapper_class_name not in self._instances:
+                self._instances[mapper_class_name] = self.mapper_class(mapper_class_name)()
+            return self._instances[mapper_class_name]
+
+    def clear(self):
+        """Forget resolved names and mapper instances (registered classes are kept)."""
+        with self._lock:
+            self._resolved_names.clear()
+            self._instances.clear()
+            self._entry_points = None
+
+#! <%GTREE 3 Process-wide registry%>
+MAPPER_REGISTRY = MapperRegistry()
+register_mapper = MAPPER_REGISTRY.register
+
+#============================   End Of File   ================================
@@ -0,0 +1,166 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : mapping_cache.py
+# Author    : ForesightInitiative
+# Version   : 1.0.1
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# documentation   :
+"""
+On-disk cache of compiled Excel mappings.
+
+ConvertMappingExcel turns a mapping workbook into an OIMS mapping dictionary.
+The result only depends on the bytes of the workbook and on the version of the
+conversion tool, so it is stored under a key derived from both. A cache hit
+returns the compiled mapping without opening the workbook.
+
+The cache is bounded by the number of entries and by their total size; the
+least recently used entries are evicted first.
+
+Entries are JSON: NumPy and pandas values are stored as their JSON values
+(utils/json_writer.json_default). A mapping with non-string keys would not
+read back as written and is not cached.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the compiled mapping cache.
+- Version 1.0.1: NumPy and pandas values are cached; mappings with non-string keys are skipped.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+#! <%GTREE 1.1 Load standard python Libraries%>
+import hashlib
+import json
+import os
+import tempfile
+
+from utils.json_writer import json_default
+from utils.logger import get_logger
+
+logger = get_logger("MappingCache")
+
+#! <%GTREE 1.2 Defaults%>
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "oims_converter", "mappings")
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+#! <%GTREE 1.3 Helpers%>
+def has_non_string_keys(value):
+    """
+    :return: True if a dictionary in value has a key that JSON would turn into a string.
+    """
+    if isinstance(value, dict):
+        return any(not isinstance(key, str) or has_non_string_keys(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return any(has_non_string_keys(item) for item in value)
+    return False
+
+#! <%GTREE 2 MappingCache Class%>
+class MappingCache:
+    #! <%GTREE 2.1 Initialization%>
+    def __init__(self, cache_dir=None, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        :param cache_dir: Folder that holds the cached mappings (default: ~/.cache/oims_converter/mappings).
+        :param max_entries: Maximum number of cached mappings.
+        :param max_bytes: Maximum total size of the cached mappings in bytes.
+        """
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    #! <%GTREE 2.2 Cache key%>
+    @staticmethod
+    def key(mapping_excel_path, tool_version):
+        """
+        Build the cache key from the workbook bytes and the tool version.
+
+        :param mapping_excel_path: Path to the Excel mapping file.
+        :param tool_version: Version of the conversion tool.
+        :return: Hexadecimal SHA-256 digest.
+        """
+        digest = hashlib.sha256(f"{tool_version}\0".encode("utf-8"))
+        with open(mapping_excel_path, "rb") as mapping_file:
+            for block in iter(lambda: mapping_file.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    #! <%GTREE 2.3 Lookup%>
+    def get(self, key):
+        """
+        :param key: Cache key.
+        :return: The cached mapping dictionary, or None on a miss.
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "r") as entry_file:
+                mapping = json.load(entry_file)
+        except (OSError, ValueError):
+            return None
+        # mark the entry as recently used for the eviction order
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return mapping
+
+    #! <%GTREE 2.4 Store%>
+    def put(self, key, mapping):
+        """
+        Store a compiled mapping and evict old entries if the cache is full.
+        Failures to write the cache are not fatal.
+
+        :param key: Cache key.
+        :param mapping: Compiled mapping dictionary.
+        """
+        if has_non_string_keys(mapping):
+            logger.warning("Mapping cache entry '%s' not written: the mapping has non-string keys.", key)
+            return
+        temp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            file_descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(file_descriptor, "w") as entry_file:
+                json.dump(mapping, entry_file, default=json_default)
+            os.replace(temp_path, self._entry_path(key))
+            temp_path = None
+            self.evict()
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Could not write mapping cache entry '%s'. Error: %s", key, e)
+        finally:
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    #! <%GTREE 2.5 Size-bounded eviction%>
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache is within its
+        entry and size limits.
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            entry_path = os.path.join(self.cache_dir, name)
+            try:
+                entry_stat = os.stat(entry_path)
+            except OSError:
+                continue
+            entries.append((entry_stat.st_mtime, entry_stat.st_size, entry_path))
+
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        while entries and (len(entries) > self.max_entries or total_bytes > self.max_bytes):
+            _, size, entry_path = entries.pop(0)
+            try:
+                os.remove(entry_path)
+            except OSError:
+                pass
+            total_bytes -= size
+
+#============================   End Of File   ================================
@@ -0,0 +1,262 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : resource_cache.py
+# Author    : ForesightInitiative
+# Version   : 1.1.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# documentation   :
+"""
+Process-wide in-memory cache of loaded schemas and mappings.
+
+Every MetadataConverter loads a schema (SchemaIndex) and a mapping. When one
+process handles many conversions (the conversion service, a batch worker, a
+script converting many workbooks) these are the same files over and over.
+RESOURCE_CACHE keeps the loaded objects, keyed by
+
+    (kind, resource id, SHA-256 of the file)
+
+e.g. ("schema", "Foresight data metametadata", "9f2c..."), so an edited file
+is loaded again under a new key. The kinds are the name tables of
+oims_structures/converter_data.py (RESOURCE_KINDS); the resource id is the id
+of the settings (oims_metadata_schema_id, mapping_id). The SHA-256 of a file
+is remembered as long as its modification time and size are unchanged.
+
+The cache holds at most max_entries objects and evicts the least recently
+used one. A cached object is shared by all converters of the process, so it
+is frozen when it is stored: dictionaries and lists become ReadOnlyDict and
+ReadOnlyList (subclasses of dict and list that refuse changes) and the
+attributes of other objects are frozen the same way. The views pickle as
+themselves, so they can be passed to worker processes. thaw() returns a
+mutable copy.
+
+content_sha256() digests the canonical JSON of a mapping or schema; caches
+of objects compiled from it (the GenericMapper plans, the incremental
+conversion sidecar) use it in their keys. A frozen dictionary cannot change,
+so its digest is computed once and remembered.
+
+Two threads missing the same key at the same time both load the file; the
+second result replaces the first.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the process-wide resource cache.
+- Version 1.1.0: content_sha256(), remembered by frozen dictionaries.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+#! <%GTREE 1.1 Load standard python Libraries%>
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+#! <%GTREE 1.2 Load OIMS converter tool libraries%>
+from utils.logger import get_logger
+from oims_structures.converter_data import KNOWN_MAPPINGS, KNOWN_SCHEMAS
+
+logger = get_logger("ResourceCache")
+
+DEFAULT_MAX_ENTRIES = 16
+
+# kind of cached resource -> name table of the known ids
+RESOURCE_KINDS = {
+    "schema": KNOWN_SCHEMAS,
+    "mapping": KNOWN_MAPPINGS,
+}
+
+#! <%GTREE 2 Read-only views%>
+def _read_only(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is a cached resource and cannot be changed; use thaw() for a copy.")
+
+class ReadOnlyDict(dict):
+    """Dictionary that refuses changes."""
+    # content digest, see content_sha256
+    __slots__ = ("_sha256",)
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (ReadOnlyDict, (dict(self),))
+
+    def copy(self):
+        return dict(self)
+
+class ReadOnlyList(list):
+    """List that refuses changes."""
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        return (ReadOnlyList, (list(self),))
+
+    def copy(self):
+        return list(self)
+
+def freeze(value, _memo=None):
+    """
+    :param value: Object to share read-only.
+    :return: The object with its dictionaries and lists replaced by read-only
+             views; the attributes of other objects are frozen in place.
+    """
+    memo = {} if _memo is None else _memo
+    if id(value) in memo:
+        return memo[id(value)]
+    if isinstance(value, (ReadOnlyDict, ReadOnlyList)) or isinstance(value, (str, bytes, int, float, bool, type(None), frozenset)):
+        return value
+    if isinstance(value, dict):
+        frozen = memo[id(value)] = ReadOnlyDict()
+        dict.update(frozen, ((key, freeze(item, memo)) for key, item in value.items()))
+        return frozen
+    if isinstance(value, list):
+        frozen = memo[id(value)] = ReadOnlyList()
+        list.extend(frozen, (freeze(item, memo) for item in value))
+        return frozen
+    if isinstance(value, tuple):
+        frozen = memo[id(value)] = tuple(freeze(item, memo) for item in value)
+        return frozen
+    memo[id(value)] = value
+    if hasattr(value, "__dict__"):
+        for name, attribute in list(vars(value).items()):
+            setattr(value, name, freeze(attribute, memo))
+    return value
+
+def content_sha256(value):
+    """
+    :param value: Dictionary or list, e.g. a mapping.
+    :return: SHA-256 of the canonical JSON of the value; computed once for a
+             frozen dictionary.
+    """
+    if isinstance(value, ReadOnlyDict):
+        try:
+            return value._sha256
+        except AttributeError:
+            pass
+    digest = hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    if isinstance(value, ReadOnlyDict):
+        value._sha256 = digest
+    return digest
+
+def thaw(value):
+    """
+    :return: A mutable deep copy of a frozen dictionary or list.
+    """
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+#! <%GTREE 3 ResourceCache Class%>
+class ResourceCache:
+    #! <%GTREE 3.1 Initialization%>
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        :param max_entries: Maximum number of cached resources.
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # absolute path -> ((mtime_ns, size), sha256)
+        self._digests = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    #! <%GTREE 3.2 Cache key%>
+    def file_sha256(self, path):
+        """
+        :return: SHA-256 of a file, remembered while its modification time and size are unchanged.
+        """
+        path = os.path.abspath(path)
+        file_stat = os.stat(path)
+        signature = (file_stat.st_mtime_ns, file_stat.st_size)
+        with self._lock:
+            known = self._digests.get(path)
+        if known is not None and known[0] == signature:
+            return known[1]
+        digest = hashlib.sha256()
+        with open(path, "rb") as resource_file:
+            for block in iter(lambda: resource_file.read(1024 * 1024), b""):
+                digest.update(block)
+        with self._lock:
+            self._digests[path] = (signature, digest.hexdigest())
+        return digest.hexdigest()
+
+    def key(self, kind, resource_id, path):
+        """
+        :param kind: One of RESOURCE_KINDS.
+        :param resource_id: Id of the resource (e.g. the oims_metadata_schema_id).
+        :param path: File the resource is loaded from.
+        :return: Cache key (kind, resource id, SHA-256 of the file).
+        """
+        if kind not in RESOURCE_KINDS:
+            raise ValueError(f"Unknown resource kind '{kind}'. Use one of {', '.join(RESOURCE_KINDS)}.")
+        return (kind, resource_id, self.file_sha256(path))
+
+    #! <%GTREE 3.3 Lookup%>
+    def get_or_load(self, kind, resource_id, path, loader):
+        """
+        :param kind: One of RESOURCE_KINDS.
+        :param resource_id: Id of the resource.
+        :param path: File the resource is loaded from.
+        :param loader: Function loader(path) that loads the resource on a miss.
+        :return: The cached, read-only resource.
+        """
+        key = self.key(kind, resource_id, path)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        if resource_id not in RESOURCE_KINDS[kind]:
+            logger.debug("Caching %s '%s' that is not in the known %s ids.", kind, resource_id, kind)
+        resource = freeze(loader(path))
+        with self._lock:
+            self._entries[key] = resource
+            self._entries.move_to_end(key)
+            while len(self._entries) > max(self.max_entries, 0):
+                evicted_key, _ = self._entries.popitem(last=False)
+                self.evictions += 1
+                logger.debug("Evicted %s '%s' from the resource cache.", evicted_key[0], evicted_key[1])
+        return resource
+
+    def resize(self, max_entries):
+        """Change the number of cached resources, evicting the least recently used ones."""
+        with self._lock:
+            self.max_entries = max_entries
+            while len(self._entries) > max(self.max_entries, 0):
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._digests.clear()
+
+    #! <%GTREE 3.4 Statistics%>
+    def stats(self):
+        """
+        :return: Dictionary with the entries, hits, misses and evictions of the cache.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "resources": [{"kind": kind, "id": resource_id, "sha256": sha256} for kind, resource_id, sha256 in self._entries],
+            }
+
+#! <%GTREE 4 Process-wide cache%>
+RESOURCE_CACHE = ResourceCache()
+
+#============================   End Of File   ================================
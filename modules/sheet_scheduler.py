@@ -0,0 +1,203 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : sheet_scheduler.py
+# Author    : ForesightInitiative
+# Version   : 1.1.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# documentation   :
+"""
+Per-sheet scheduling of the validation and mapping of one workbook.
+
+The sheets of a workbook are independent: the ValidationPlan checks and the
+MappingPlan groups of a sheet only read that sheet. SheetScheduler runs one
+task per sheet on a pool of "sheet_workers" processes (default) or threads
+("sheet_executor"). A task parses the sheet once in the worker's own
+WorkbookSession, applies the validation checks of the sheet and executes the
+mapping groups that read it (GenericMapper.execute_sheet).
+
+The results are merged back in mapping order, whatever the order in which
+the tasks finish: the violations in the order of the validation plan, the
+fragments in the order of the mapping plan. The output is the same as that
+of a sequential conversion. The largest sheets (uncompressed sheet XML) are
+submitted first, so a large sheet does not start last.
+
+Processes parse sheets in parallel; threads share the interpreter lock while
+openpyxl parses, so they mostly help when the mapping (pandas and NumPy) is
+the larger part. Every worker opens the workbook once. Sheet timings and
+counters recorded by the workers are merged into the run's instrumentation,
+and worker processes log through the parent (utils/logger.py). With a
+SheetCache the workers load the sheets parsed by an earlier run from the
+cache and store the sheets they parse in it (utils/sheet_cache.py).
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the per-sheet scheduler.
+- Version 1.1.0: Workers read and fill the parsed sheet cache.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+#! <%GTREE 1.1 Load standard python Libraries%>
+import logging
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+#! <%GTREE 1.2 Load OIMS converter tool libraries%>
+from utils.excel_reader import ExcelReader
+from utils.instrumentation import Instrumentation
+from utils.logger import LOGGER_NAME, configure_logging, current_log_context, get_logger, log_context, process_logging
+from utils.sheet_fingerprint import sheet_sizes
+from utils.workbook_session import WorkbookSession
+
+SHEET_EXECUTORS = ("process", "thread")
+
+logger = get_logger("SheetScheduler")
+
+#! <%GTREE 2 Data structures%>
+# work shared by all tasks of one run
+SheetWork = namedtuple("SheetWork", ["workbook_path", "sheet_cache", "validation_plan", "mapper", "mapping_plan", "stage", "log_fields"])
+
+# result of one sheet: [(check index, violations)], [(group index, Fragment)], the worker's sheet timings and counters
+SheetResult = namedtuple("SheetResult", ["sheetname", "violations", "fragments", "sheets", "counters"])
+
+# merged results: violations in validation plan order, fragments in mapping plan order
+SheetResults = namedtuple("SheetResults", ["violations", "fragments"])
+
+#! <%GTREE 3 Tasks%>
+def _process_sheet(work, session, sheetname):
+    """
+    Validate and map one sheet.
+
+    :param work: SheetWork.
+    :param session: WorkbookSession of the worker.
+    :param sheetname: Sheet to process.
+    :return: SheetResult.
+    """
+    instrumentation = Instrumentation()
+    session.instrumentation = instrumentation
+    violations = []
+    with log_context(**work.log_fields, sheet=sheetname), instrumentation.stage(work.stage):
+        for index, sheet_checks in enumerate(work.validation_plan.sheet_checks):
+            if sheet_checks.sheetname == sheetname:
+                violations.append((index, work.validation_plan._replace(sheet_checks=(sheet_checks,)).apply(session)))
+        fragments = work.mapper.execute_sheet(work.mapping_plan, session, sheetname)
+    return SheetResult(sheetname, violations, fragments, instrumentation.sheets, dict(instrumentation.counters))
+
+# state of a worker process
+_worker_state = {}
+
+def _open_session(work):
+    return WorkbookSession(excel_reader=ExcelReader(work.workbook_path, sheet_cache=work.sheet_cache))
+
+def _initialize_worker(work, log_queue, log_level):
+    configure_logging(level=log_level, log_queue=log_queue)
+    # the mapper class is sent instead of the instance (which holds a lock and its plan cache)
+    _worker_state["work"] = work._replace(mapper=work.mapper())
+    _worker_state["session"] = _open_session(work)
+
+def _process_sheet_in_worker(sheetname):
+    return _process_sheet(_worker_state["work"], _worker_state["session"], sheetname)
+
+#! <%GTREE 4 SheetScheduler Class%>
+class SheetScheduler:
+    #! <%GTREE 4.1 Initialization%>
+    def __init__(self, workers, executor="process"):
+        """
+        :param workers: Number of sheets processed at the same time.
+        :param executor: "process" or "thread".
+        """
+        if executor not in SHEET_EXECUTORS:
+            raise ValueError(f"Unsupported sheet_executor '{executor}'. Use one of {', '.join(SHEET_EXECUTORS)}.")
+        self.workers = workers
+        self.executor = executor
+
+    @staticmethod
+    def supports(mapper):
+        """
+        :return: True if the mapper runs compiled plans sheet by sheet.
+        """
+        return all(hasattr(mapper, name) for name in ("get_plan", "execute_sheet", "assemble"))
+
+    @staticmethod
+    def scheduled_sheets(validation_plan, mapping_plan, workbook_path):
+        """
+        :return: The sheets of the plans, largest first.
+        """
+        sheetnames = list(dict.fromkeys(
+            [sheet_checks.sheetname for sheet_checks in validation_plan.sheet_checks]
+            + [group.sheetname for group in mapping_plan.groups]
+        ))
+        sizes = sheet_sizes(workbook_path)
+        return sorted(sheetnames, key=lambda sheetname: -sizes.get(sheetname, 0))
+
+    #! <%GTREE 4.2 Run%>
+    def run(self, workbook_path, validation_plan, mapper, mapping_plan, instrumentation, stage="validate_inputs", sheet_cache=None):
+        """
+        Validate and map every sheet of a workbook on the pool.
+
+        :param workbook_path: Path to the primary metadata workbook.
+        :param validation_plan: ValidationPlan of the mapping.
+        :param mapper: Mapper instance (see supports).
+        :param mapping_plan: The mapper's compiled plan for the mapping.
+        :param instrumentation: Instrumentation of the run; the workers' sheet timings are merged into it.
+        :param stage: Stage the sheet timings are recorded under.
+        :param sheet_cache: Optional SheetCache of the parsed sheets.
+        :return: SheetResults.
+        """
+        sheetnames = self.scheduled_sheets(validation_plan, mapping_plan, workbook_path)
+        work = SheetWork(workbook_path, sheet_cache, validation_plan, mapper, mapping_plan, stage, current_log_context())
+        workers = max(min(self.workers, len(sheetnames)), 1)
+        logger.info("Processing %s sheet(s) on %s %s worker(s).", len(sheetnames), workers, self.executor)
+
+        if self.executor == "process":
+            results = self._run_on_processes(work, sheetnames, workers)
+        else:
+            results = self._run_on_threads(work, sheetnames, workers)
+
+        checks, fragments = {}, {}
+        for result in results:
+            checks.update(result.violations)
+            fragments.update(result.fragments)
+            instrumentation.merge(result.sheets, result.counters)
+        instrumentation.count("sheets_scheduled", len(sheetnames))
+        return SheetResults(
+            [violation for index in sorted(checks) for violation in checks[index]],
+            [fragments.get(index) for index in range(len(mapping_plan.groups))]
+        )
+
+    def _run_on_processes(self, work, sheetnames, workers):
+        log_level = logging.getLogger(LOGGER_NAME).getEffectiveLevel()
+        with process_logging() as log_queue, ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_initialize_worker,
+            initargs=(work._replace(mapper=type(work.mapper)), log_queue, log_level)
+        ) as executor:
+            futures = [executor.submit(_process_sheet_in_worker, sheetname) for sheetname in sheetnames]
+            return [future.result() for future in as_completed(futures)]
+
+    def _run_on_threads(self, work, sheetnames, workers):
+        # one WorkbookSession per pool thread: a session is not safe to share between threads
+        local = threading.local()
+        sessions = []
+        sessions_lock = threading.Lock()
+
+        def process(sheetname):
+            if not hasattr(local, "session"):
+                local.session = _open_session(work)
+                with sessions_lock:
+                    sessions.append(local.session)
+            return _process_sheet(work, local.session, sheetname)
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sheet") as executor:
+                futures = [executor.submit(process, sheetname) for sheetname in sheetnames]
+                return [future.result() for future in as_completed(futures)]
+        finally:
+            for session in sessions:
+                session.close()
+
+#============================   End Of File   ================================
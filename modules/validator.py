@@ -19,6 +19,10 @@
 #! <%GTREE 1 Initialization%>
 import json
 
+from utils.logger import get_logger
+
+logger = get_logger("Validator")
+
 #! <%GTREE 2 Validator Class%>
 class Validator:
     #! <%GTREE 2.1 Load Schema%>
@@ -36,12 +40,12 @@ class Validator:
     @staticmethod
     def validate_excel_against_mapping(excel_data, mapping):
         # Placeholder validation logic
-        print("Validating Excel data against mapping...")
+        logger.info("Validating Excel data against mapping...")
 
     #! <%GTREE 2.3 Validate Mapping Against Schema%>
     @staticmethod
     def validate_mapping_against_schema(mapping, schema):
         # Placeholder validation logic
-        print("Validating mapping against schema...")
+        logger.info("Validating mapping against schema...")
 
 #============================   End Of File   ================================
@@ -57,4 +57,51 @@ KNOWN_COMBINATIONS = {
 #! <%GTREE 1.5 Fallback option for converters%>
 FALLBACK_MAPPER =  "GenericMapper"
 
+#! <%GTREE 2 Structure of the mapping file%>
+#! <%GTREE 2.1 Table orientations%>
+VALID_TABLE_ORIENTATIONS = ("attributes_in_rows", "attributes_in_columns")
+
+#! <%GTREE 2.2 Subsections of the OIMS_header and their expected properties%>
+OIMS_HEADER_SUBSECTIONS = {
+    "file_descriptors": (
+        "metadata_name",
+        "metadata_description",
+        "metadata_version",
+        "current_version",
+        "metadata_version_status",
+        "version_date",
+        "metadata_pid",
+        "pid_scheme",
+        "pid",
+        "contact",
+        "contact_name",
+        "contact_role",
+        "contact_identifier",
+        "identifier_scheme",
+        "identifier",
+        "contact_email"
+    ),
+    "mapping_tools": (
+        "mapper_tool_name",
+        "tool_version",
+        "version",
+        "input_parameters",
+        "input_parameter_name",
+        "input_parameter_value"
+    )
+}
+
+#! <%GTREE 2.3 Entity classes of OIMS_content objects%>
+# spaces and underscores are interchangeable ("data file" == "data_file")
+VALID_ENTITY_CLASSES = (
+    "collection",
+    "dataset",
+    "data_file",
+    "support_documentation",
+    "data_container",
+    "container",
+    "variable",
+    "data_variable"
+)
+
 #============================   End Of File   ================================
\ No newline at end of file
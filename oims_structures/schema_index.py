@@ -0,0 +1,237 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : schema_index.py
+# Author    : ForesightInitiative
+# Version   : 1.3.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Internal remarks   :
+"""
+Compiled index of an OIMS metametadata schema such as
+json/Dataset_meta_metadata_v2_1_0.json.
+
+The schema lists its attributes in
+    schema["OIMS"]["OIMS_content"][i]["OIMS_content_object_properties"]["metadata"]
+The index turns that list into the lookups the validators and mappers need:
+    - attribute_name                -> attribute specification
+    - suggested_oims_content_object -> attribute names
+    - valid_entity_class            -> attribute names
+    - requirement_level             -> attribute names
+
+SchemaIndex.load() keeps a binary snapshot of the index in a cache folder
+(setting "schema_index_cache_dir", default ~/.cache/oims_converter/schemas),
+named after the schema file and a digest of its path. The snapshot is reused
+as long as the schema's modification time and size are unchanged, or its
+SHA-256 still matches. Nothing is written next to the schema. Snapshots are
+pickles, so they are only read and written if the folder and the snapshot
+belong to the current user and no one else can write to them; the folder is
+created that way (utils/private_files.py). Otherwise the index is built
+without a snapshot.
+
+content_sha256() identifies the schema content (the SHA-256 of the schema file
+for a loaded index); caches of objects compiled against a schema, such as
+the GenericMapper plans, use it in their key.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the compiled schema index.
+- Version 1.1.0: content_sha256() identifies the schema content.
+- Version 1.2.0: Snapshots are kept in a cache folder instead of next to the schema.
+- Version 1.3.0: Snapshots are only used in folders owned by the current user.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+#! <%GTREE 1.1 Load standard python Libraries%>
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+#! <%GTREE 1.2 Load OIMS converter tool libraries%>
+from utils.json_reader import JsonReader
+from utils.logger import get_logger
+from utils.private_files import make_private_dir, owned_by_user
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "oims_converter", "schemas")
+SNAPSHOT_SUFFIX = ".index.pickle"
+SNAPSHOT_FORMAT_VERSION = 2
+
+logger = get_logger("SchemaIndex")
+
+#! <%GTREE 2 Helpers%>
+def _normalize(value):
+    """
+    Normalize a lookup key from the schema: strip stray whitespace
+    ("recommended " -> "recommended") and map missing values (NaN) to None.
+    """
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+def _file_sha256(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as schema_file:
+        for block in iter(lambda: schema_file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+#! <%GTREE 3 SchemaIndex Class%>
+class SchemaIndex:
+    #! <%GTREE 3.1 Build the index%>
+    def __init__(self, schema):
+        """
+        :param schema: OIMS metametadata schema dictionary.
+        """
+        self.schema = schema
+        # SHA-256 of the schema content, see content_sha256()
+        self.sha256 = None
+        self.metadata_name = schema["OIMS"]["OIMS_header"]["file_descriptors"]["metadata_name"]
+
+        self.attributes = {}
+        self.by_content_object = {}
+        self.by_entity_class = {}
+        self.by_requirement_level = {}
+        for content in schema["OIMS"]["OIMS_content"]:
+            for attribute in content["OIMS_content_object_properties"]["metadata"]:
+                attribute_name = attribute["attribute_name"]
+                self.attributes[attribute_name] = attribute
+
+                content_object = _normalize(attribute.get("suggested_oims_content_object"))
+                self.by_content_object.setdefault(content_object, []).append(attribute_name)
+
+                for entity_class in attribute.get("valid_entity_class", []):
+                    self.by_entity_class.setdefault(_normalize(entity_class), []).append(attribute_name)
+
+                requirement_level = _normalize(attribute.get("requirement_level"))
+                self.by_requirement_level.setdefault(requirement_level, []).append(attribute_name)
+
+        self.attribute_names = frozenset(self.attributes)
+
+    #! <%GTREE 3.2 Lookups%>
+    def attribute(self, attribute_name):
+        """
+        :return: Specification of an attribute, or None if the schema does not define it.
+        """
+        return self.attributes.get(attribute_name)
+
+    def attributes_for_content_object(self, content_object):
+        return self.by_content_object.get(_normalize(content_object), [])
+
+    def attributes_for_entity_class(self, entity_class):
+        return self.by_entity_class.get(_normalize(entity_class), [])
+
+    def attributes_for_requirement_level(self, requirement_level):
+        return self.by_requirement_level.get(_normalize(requirement_level), [])
+
+    def content_sha256(self):
+        """
+        :return: SHA-256 of the schema file the index was loaded from, or of
+                 the canonical JSON of the schema for an index built from a
+                 dictionary.
+        """
+        if self.sha256 is None:
+            self.sha256 = hashlib.sha256(json.dumps(self.schema, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        return self.sha256
+
+    #! <%GTREE 3.3 Load with a persisted snapshot%>
+    @staticmethod
+    def snapshot_path(schema_path, snapshot_dir):
+        """
+        :return: Path of the snapshot of a schema file in the snapshot folder.
+        """
+        path_digest = hashlib.sha1(os.path.abspath(schema_path).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(snapshot_dir, f"{os.path.basename(schema_path)}.{path_digest}{SNAPSHOT_SUFFIX}")
+
+    @classmethod
+    def load(cls, schema_path, snapshot_dir=DEFAULT_SNAPSHOT_DIR):
+        """
+        Load the index for a schema file, reusing its snapshot when it is
+        still valid and (re)writing it otherwise.
+
+        :param schema_path: Path to the schema JSON file.
+        :param snapshot_dir: Folder for the snapshots (None: build the index without a snapshot).
+        :return: SchemaIndex instance.
+        """
+        if not snapshot_dir or not cls._snapshot_dir_trusted(snapshot_dir):
+            return cls._build(schema_path)
+        snapshot_path = cls.snapshot_path(schema_path, snapshot_dir)
+        schema_stat = os.stat(schema_path)
+
+        snapshot = cls._read_snapshot(snapshot_path)
+        if snapshot is not None:
+            if (snapshot["mtime_ns"], snapshot["size"]) == (schema_stat.st_mtime_ns, schema_stat.st_size):
+                return snapshot["index"]
+            schema_sha256 = _file_sha256(schema_path)
+            if snapshot["sha256"] == schema_sha256:
+                cls._write_snapshot(snapshot_path, snapshot["index"], schema_stat, schema_sha256)
+                return snapshot["index"]
+
+        index = cls._build(schema_path)
+        cls._write_snapshot(snapshot_path, index, schema_stat, index.sha256)
+        return index
+
+    @classmethod
+    def _build(cls, schema_path):
+        index = cls(JsonReader(schema_path).read_json())
+        index.sha256 = _file_sha256(schema_path)
+        return index
+
+    @staticmethod
+    def _snapshot_dir_trusted(snapshot_dir):
+        """
+        :return: True if the snapshot folder (created if missing) belongs to the
+                 current user and no one else can write to it.
+        """
+        try:
+            make_private_dir(snapshot_dir)
+            if owned_by_user(snapshot_dir):
+                return True
+        except OSError:
+            pass
+        logger.warning("Schema index snapshot folder '%s' is not owned by the current user or writable by others; not using it.", snapshot_dir)
+        return False
+
+    @staticmethod
+    def _read_snapshot(snapshot_path):
+        try:
+            # a snapshot another user could have written is not unpickled
+            if not owned_by_user(snapshot_path):
+                return None
+            with open(snapshot_path, "rb") as snapshot_file:
+                snapshot = pickle.load(snapshot_file)
+        except Exception:
+            return None
+        if not isinstance(snapshot, dict) or snapshot.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+            return None
+        return snapshot
+
+    @staticmethod
+    def _write_snapshot(snapshot_path, index, schema_stat, schema_sha256):
+        snapshot = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "mtime_ns": schema_stat.st_mtime_ns,
+            "size": schema_stat.st_size,
+            "sha256": schema_sha256,
+            "index": index,
+        }
+        temp_path = None
+        try:
+            file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(snapshot_path)), suffix=".tmp")
+            with os.fdopen(file_descriptor, "wb") as snapshot_file:
+                pickle.dump(snapshot, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, snapshot_path)
+            temp_path = None
+        except OSError as e:
+            # an unwritable snapshot folder only costs the rebuild on the next run
+            logger.warning("Could not write schema index snapshot '%s'. Error: %s", snapshot_path, e)
+        finally:
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+#============================   End Of File   ================================
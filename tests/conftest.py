@@ -0,0 +1,97 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : conftest.py
+# Author    : ForesightInitiative
+# Version   : 1.1.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Shared pytest setup and fixtures. The tests import the converter packages
+from the repository root, like metadata_converter.py does. The fixtures
+provide the OIMS metametadata schema and write small Excel mapping workbooks.
+
+Run from the repository root:
+    python -m pytest -q
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the test setup.
+- Version 1.1.0: Schema and mapping workbook fixtures.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import json
+import os
+import sys
+
+import pytest
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPOSITORY_ROOT not in sys.path:
+    sys.path.insert(0, REPOSITORY_ROOT)
+
+SCHEMA_PATH = os.path.join(REPOSITORY_ROOT, "json", "Dataset_meta_metadata_v2_1_0.json")
+
+ATTRIBUTE_PAIR_COLUMNS = (
+    "information_type", "excel_field_name", "excel_field_name_loc",
+    "excel_value_loc_range_start", "oims_attribute_id", "user_comments",
+)
+
+#! <%GTREE 2 Fixtures%>
+@pytest.fixture
+def schema():
+    """The OIMS metametadata schema shipped in json/ (as a dictionary)."""
+    with open(SCHEMA_PATH, "r", encoding="utf-8") as schema_file:
+        return json.load(schema_file)
+
+@pytest.fixture
+def dataset_attributes(schema):
+    """Names of the first three attributes of the "dataset" entity class."""
+    from oims_structures.schema_index import SchemaIndex
+
+    return SchemaIndex(schema).attributes_for_entity_class("dataset")[:3]
+
+@pytest.fixture
+def write_mapping_workbook(dataset_attributes):
+    """
+    Factory that writes a small Excel mapping workbook: one attributes_in_rows
+    sheet "Dataset" that maps the dataset attributes.
+
+    :return: Function write(path, schema_description="Test mapping") -> path.
+    """
+    import openpyxl
+
+    def write(path, schema_description="Test mapping"):
+        workbook = openpyxl.Workbook()
+        mappings = workbook.active
+        mappings.title = "mappings"
+        mappings.append(["sheetname", "oims_section", "oims_subsection", "oims_content_object", "entity_class", "table_orientation"])
+        mappings.append(["Dataset", "OIMS_content", None, "DatasetLevel", "dataset", "attributes_in_rows"])
+
+        mapping_metadata = workbook.create_sheet("mapping_metadata")
+        mapping_metadata.append(["Property", "value"])
+        for name, value in (
+            ("schema_name", "Test mapping"), ("schema_description", schema_description),
+            ("schema_version", "1.0"), ("schema_url", "https://example.org/mapping"),
+            ("pid_scheme", "none"), ("pid", "test-mapping"),
+            ("metadata_name", "Test mapping"), ("metadata_description", "Mapping used by the tests"),
+            ("current_version", "1.0.0"), ("metadata_version_status", "draft"),
+            ("contact_name", "Test"), ("contact_role", "maintainer"), ("contact_email", "test@example.org"),
+            ("validated_oims_metadata_schema", "Foresight data metametadata"),
+        ):
+            mapping_metadata.append([name, value])
+
+        pairs = workbook.create_sheet("Dataset")
+        pairs.append(list(ATTRIBUTE_PAIR_COLUMNS))
+        for row, attribute_name in enumerate(dataset_attributes, start=1):
+            pairs.append(["metadata_field_value", attribute_name, f"A{row}", f"B{row}", attribute_name, None])
+        workbook.save(path)
+        return str(path)
+
+    return write
+
+#============================   End Of File   ================================
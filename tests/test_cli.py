@@ -0,0 +1,54 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : test_cli.py
+# Author    : ForesightInitiative
+# Version   : 1.0.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Tests of the command line interface of metadata_converter.py.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the command line tests.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import json
+
+import pytest
+
+from conftest import SCHEMA_PATH
+from metadata_converter import main
+
+#! <%GTREE 2 check-settings%>
+def test_check_settings_accepts_valid_settings(tmp_path, write_mapping_workbook, capsys):
+    mapping_path = write_mapping_workbook(tmp_path / "mapping.xlsx")
+    settings_path = tmp_path / "settings.json"
+    settings_path.write_text(json.dumps({
+        "path_to_primary_metadata": mapping_path,
+        "mapping_classification_id": "TEST_MAPPING",
+        "mapping_id": "TEST_MAPPING",
+        "oims_metadata_schema_id": "TEST_SCHEMA",
+        "path_to_oims_metadata_schema_file": SCHEMA_PATH,
+        "path_to_mapping_file": mapping_path,
+        "path_to_output_oims_metadata_file": str(tmp_path / "output" / "output.json"),
+        "log_file": None,
+    }))
+    assert main(["check-settings", "--settings", str(settings_path)]) == 0
+    assert "Settings OK" in capsys.readouterr().out
+
+@pytest.mark.parametrize("content", [None, "{not json"])
+def test_check_settings_reports_unreadable_settings(tmp_path, content, capsys):
+    settings_path = tmp_path / "settings.json"
+    if content is not None:
+        settings_path.write_text(content)
+    assert main(["check-settings", "--settings", str(settings_path)]) == 1
+    output = capsys.readouterr().out
+    assert output.startswith("Error reading settings file") and "Settings OK" not in output
+
+#============================   End Of File   ================================
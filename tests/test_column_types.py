@@ -0,0 +1,80 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : test_column_types.py
+# Author    : ForesightInitiative
+# Version   : 1.0.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Tests of the bulk column coercion by OIMS data_type (utils/column_types.py).
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the column coercion tests.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import datetime
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.column_types import coerce_column
+
+def _coerce(values, data_type):
+    """:return: List of (value, type name) of the coerced column."""
+    return [(value, type(value).__name__) for value in coerce_column(pd.Series(values, dtype=object), data_type)]
+
+#! <%GTREE 2 Cleaning%>
+def test_strings_are_stripped_and_empty_cells_are_missing():
+    assert _coerce([" a ", "", "  ", None, np.nan], None) == [("a", "str"), (None, "NoneType"), (None, "NoneType"), (None, "NoneType"), (None, "NoneType")]
+
+def test_text_data_types():
+    assert _coerce([12, 1.5, " x "], "string") == [("12", "str"), ("1.5", "str"), ("x", "str")]
+
+#! <%GTREE 3 Numbers%>
+def test_whole_numbers_become_int():
+    assert _coerce([12.0, 1.5, "7", " 3.25 "], "number") == [(12, "int"), (1.5, "float"), (7, "int"), (3.25, "float")]
+
+@pytest.mark.parametrize("data_type", ["number", "integer"])
+def test_whole_numbers_beyond_int64_stay_float(data_type):
+    assert _coerce([1e20, 3.0, -1e19], data_type) == [(1e20, "float"), (3, "int"), (-1e19, "float")]
+
+def test_large_integer_cells_stay_int():
+    assert _coerce([10 ** 19, 2 ** 63 - 1], "number") == [(10 ** 19, "int"), (2 ** 63 - 1, "int")]
+
+def test_integer_keeps_fractions_and_text_uncoerced():
+    assert _coerce([2.0, 2.5, "many"], "integer") == [(2, "int"), (2.5, "float"), ("many", "str")]
+
+@pytest.mark.parametrize("data_type", ["number", "integer"])
+def test_infinite_values_are_not_numbers(data_type):
+    coerced = coerce_column(pd.Series(["inf", float("inf"), float("-inf"), 1.0], dtype=object), data_type)
+    assert coerced.tolist() == ["inf", None, None, 1]
+    # no Infinity in the output
+    json.dumps(coerced.tolist(), allow_nan=False)
+
+#! <%GTREE 4 Booleans and dates%>
+def test_booleans():
+    assert _coerce(["Yes", "no", 1, 0.0, "TRUE", "maybe"], "boolean") == [
+        (True, "bool"), (False, "bool"), (True, "bool"), (False, "bool"), (True, "bool"), ("maybe", "str"),
+    ]
+
+def test_dates():
+    values = [datetime.datetime(2024, 1, 2), datetime.datetime(2024, 1, 2, 13, 30), "2024-03-04", 45000, "not a date"]
+    assert coerce_column(pd.Series(values, dtype=object), "date").tolist() == [
+        "2024-01-02", "2024-01-02T13:30:00", "2024-03-04", 45000, "not a date",
+    ]
+
+def test_untyped_columns_write_dates_as_text():
+    assert coerce_column(pd.Series([pd.Timestamp("2024-01-02"), "text", 3], dtype=object), None).tolist() == ["2024-01-02", "text", 3]
+
+def test_all_missing_column():
+    assert coerce_column(pd.Series([None, ""], dtype=object), "number").tolist() == [None, None]
+
+#============================   End Of File   ================================
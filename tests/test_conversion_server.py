@@ -0,0 +1,142 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : test_conversion_server.py
+# Author    : ForesightInitiative
+# Version   : 1.0.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Tests of the local conversion service (modules/conversion_server.py):
+admission slots, uploads and request handling.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the conversion service tests.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import http.client
+import json
+import os
+import threading
+import time
+from http import HTTPStatus
+from http.server import ThreadingHTTPServer
+
+import openpyxl
+import pytest
+
+from conftest import SCHEMA_PATH
+from modules.conversion_server import ConversionRequestHandler, ConversionService, ServiceError
+
+@pytest.fixture
+def service(tmp_path, write_mapping_workbook, dataset_attributes):
+    mapping_path = write_mapping_workbook(tmp_path / "mapping.xlsx")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Dataset"
+    for attribute_name in dataset_attributes:
+        sheet.append([attribute_name, f"{attribute_name} value"])
+    workbook.save(tmp_path / "primary.xlsx")
+    settings_path = tmp_path / "settings.json"
+    settings_path.write_text(json.dumps({
+        "path_to_primary_metadata": str(tmp_path / "primary.xlsx"),
+        "mapping_classification_id": "TEST_MAPPING",
+        "mapping_id": "TEST_MAPPING",
+        "oims_metadata_schema_id": "TEST_SCHEMA",
+        "path_to_oims_metadata_schema_file": SCHEMA_PATH,
+        "path_to_mapping_file": mapping_path,
+        "path_to_output_oims_metadata_file": str(tmp_path / "output" / "output.json"),
+        "mapping_cache_dir": None,
+        "schema_index_cache_dir": None,
+        "output_validation": "off",
+        "log_file": None,
+    }))
+    service = ConversionService({"profiles": {"default": str(settings_path)}, "workers": 1, "max_queue": 0, "request_timeout": 0.2})
+    yield service
+    service.executor.shutdown(wait=True)
+
+@pytest.fixture
+def server(service):
+    """:return: Function request(method, path, body, headers) -> (status, body) on a running service."""
+    http_server = ThreadingHTTPServer(("127.0.0.1", 0), ConversionRequestHandler)
+    http_server.service = service
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+
+    def request(method, path, body=b"", headers=None):
+        connection = http.client.HTTPConnection(*http_server.server_address, timeout=30)
+        connection.putrequest(method, path)
+        for name, value in (headers or {"Content-Length": str(len(body))}).items():
+            connection.putheader(name, value)
+        connection.endheaders(body)
+        response = connection.getresponse()
+        result = response.status, response.read()
+        connection.close()
+        return result
+
+    yield request
+    http_server.shutdown()
+    http_server.server_close()
+
+def _wait_until(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+#! <%GTREE 2 Slots and uploads%>
+def test_timed_out_conversion_keeps_its_slot_and_upload(tmp_path, service, monkeypatch):
+    release = threading.Event()
+    seen = {}
+
+    def slow_conversion(profile, workbook_path):
+        release.wait(10)
+        seen["upload_exists"] = os.path.exists(workbook_path)
+        return b"{}"
+
+    monkeypatch.setattr(service, "_convert_on_worker", slow_conversion)
+    upload_dir = tmp_path / "upload"
+    upload_dir.mkdir()
+    (upload_dir / "upload.xlsx").write_bytes(b"workbook")
+
+    with pytest.raises(ServiceError) as timeout:
+        service.convert("default", str(upload_dir / "upload.xlsx"), upload_dir=str(upload_dir))
+    assert timeout.value.status == HTTPStatus.GATEWAY_TIMEOUT
+    # the conversion still runs: no new conversion is admitted and the upload is kept
+    with pytest.raises(ServiceError) as rejected:
+        service.convert("default", str(upload_dir / "upload.xlsx"))
+    assert rejected.value.status == HTTPStatus.SERVICE_UNAVAILABLE
+    assert upload_dir.exists()
+
+    release.set()
+    _wait_until(lambda: service.status()["queued"] == 0 and not upload_dir.exists())
+    assert seen["upload_exists"]
+
+def test_rejected_upload_is_removed(tmp_path, service):
+    upload_dir = tmp_path / "upload"
+    upload_dir.mkdir()
+    with pytest.raises(ServiceError) as unknown:
+        service.convert("unknown", str(upload_dir / "upload.xlsx"), upload_dir=str(upload_dir))
+    assert unknown.value.status == HTTPStatus.NOT_FOUND
+    assert not upload_dir.exists()
+
+#! <%GTREE 3 Requests%>
+def test_convert_upload(tmp_path, server, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    status, body = server("POST", "/convert?profile=default", (tmp_path / "primary.xlsx").read_bytes())
+    assert status == HTTPStatus.OK
+    assert json.loads(body)["OIMS"]["OIMS_content"]
+    _wait_until(lambda: not any(name.startswith("oims_upload_") for name in os.listdir(tmp_path)))
+
+@pytest.mark.parametrize("content_length", ["abc", "-1"])
+def test_invalid_content_length_is_a_bad_request(server, content_length):
+    status, body = server("POST", "/convert", headers={"Content-Length": content_length})
+    assert status == HTTPStatus.BAD_REQUEST
+    assert "Content-Length" in json.loads(body)["error"]
+
+#============================   End Of File   ================================
@@ -0,0 +1,74 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : test_convert_mapping_excel.py
+# Author    : ForesightInitiative
+# Version   : 1.0.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Tests of the OIMS header ConvertMappingExcel builds from the mapping_metadata
+sheet (modules/convert_mapping_excel.py).
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the mapping_metadata header tests.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import openpyxl
+import pytest
+
+from modules.convert_mapping_excel import ConvertMappingExcel
+
+OPTIONAL_PROPERTIES = (
+    "schema_description", "schema_url", "pid_scheme", "pid", "metadata_description",
+    "metadata_version_status", "contact_name", "contact_role", "contact_email",
+)
+
+def _clear_properties(mapping_path, names, value=None):
+    workbook = openpyxl.load_workbook(mapping_path)
+    for row in workbook["mapping_metadata"].iter_rows(min_row=2):
+        if row[0].value in names:
+            row[1].value = value
+    workbook.save(mapping_path)
+
+#! <%GTREE 2 Optional and required properties%>
+@pytest.mark.parametrize("value", [None, "  "])
+def test_empty_optional_properties_are_left_out(tmp_path, write_mapping_workbook, value):
+    mapping_path = write_mapping_workbook(tmp_path / "mapping.xlsx")
+    _clear_properties(mapping_path, OPTIONAL_PROPERTIES, value)
+
+    header = ConvertMappingExcel().convert_excel_mapping(mapping_path)["OIMS"]["OIMS_header"]
+    schema_properties = header["metadata_schema"][0]["schema_properties"][0]
+    assert schema_properties == {
+        "schema_name": "Test mapping",
+        "schema_type": "primary metadata metadata",
+        "schema_version": "1.0",
+        "OIMS_content_object": "mapping",
+    }
+    file_descriptors = header["file_descriptors"]
+    assert "metadata_description" not in file_descriptors
+    assert "contact" not in file_descriptors
+    assert set(file_descriptors["metadata_version"]) == {"current_version", "version_date"}
+
+def test_partial_contact_keeps_the_given_properties(tmp_path, write_mapping_workbook):
+    mapping_path = write_mapping_workbook(tmp_path / "mapping.xlsx")
+    _clear_properties(mapping_path, ("contact_role", "contact_email"))
+
+    header = ConvertMappingExcel().convert_excel_mapping(mapping_path)["OIMS"]["OIMS_header"]
+    assert header["file_descriptors"]["contact"] == [{"contact_name": "Test"}]
+    assert header["metadata_schema"][0]["schema_properties"][0]["schema_pid"] == {"pid_scheme": "none", "pid": "test-mapping"}
+
+@pytest.mark.parametrize("name", ["schema_name", "schema_version", "metadata_name", "current_version"])
+def test_missing_required_property_raises(tmp_path, write_mapping_workbook, name):
+    mapping_path = write_mapping_workbook(tmp_path / "mapping.xlsx")
+    _clear_properties(mapping_path, (name,))
+
+    with pytest.raises(ValueError, match=name):
+        ConvertMappingExcel().convert_excel_mapping(mapping_path)
+
+#============================   End Of File   ================================
@@ -0,0 +1,88 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : test_excel_address.py
+# Author    : ForesightInitiative
+# Version   : 1.0.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Tests of the A1 cell and range resolver (utils/excel_address.py).
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the excel_address tests.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import numpy as np
+import pytest
+
+from utils.excel_address import (
+    column_index, column_letters, compile_locations, format_cell, gather,
+    is_cell_reference, parse_cell, parse_range, range_indices,
+)
+
+#! <%GTREE 2 Column letters%>
+@pytest.mark.parametrize("letters, index", [
+    ("A", 0), ("Z", 25), ("AA", 26), ("AZ", 51), ("BA", 52), ("ZZ", 701), ("AAA", 702), ("XFD", 16383),
+])
+def test_column_letters_round_trip(letters, index):
+    assert column_index(letters) == index
+    assert column_index(letters.lower()) == index
+    assert column_letters(index) == letters
+
+#! <%GTREE 3 Cell references%>
+@pytest.mark.parametrize("reference, position", [
+    ("A1", (0, 0)), ("E2", (1, 4)), ("$E$2", (1, 4)), ("$E2", (1, 4)), ("E$2", (1, 4)),
+    ("AA10", (9, 26)), ("$AB$100", (99, 27)), ("xfd1048576", (1048575, 16383)), (" C3 ", (2, 2)),
+])
+def test_parse_cell(reference, position):
+    assert is_cell_reference(reference)
+    assert parse_cell(reference) == position
+
+@pytest.mark.parametrize("reference", ["", "A0", "1A", "ABCD1", "A-1", "$$A1", "A1:B2", None, 12])
+def test_invalid_cell_references(reference):
+    assert not is_cell_reference(reference)
+    with pytest.raises(ValueError):
+        parse_cell(reference)
+
+def test_format_cell_is_canonical():
+    assert format_cell(*parse_cell("$ab$7")) == "AB7"
+
+#! <%GTREE 4 Ranges%>
+def test_parse_range():
+    assert parse_range("E2:E200") == ((1, 4), (199, 4))
+    assert parse_range("$Z$1:$AB$3") == ((0, 25), (2, 27))
+    assert parse_range("C3") == ((2, 2), (2, 2))
+
+@pytest.mark.parametrize("reference", ["B2:A1", "A2:A1", "A1:B2:C3", "A1:"])
+def test_invalid_ranges(reference):
+    with pytest.raises(ValueError):
+        parse_range(reference)
+
+def test_range_indices_row_by_row():
+    rows, cols = range_indices("Z1:AA2")
+    assert rows.tolist() == [0, 0, 1, 1]
+    assert cols.tolist() == [25, 26, 25, 26]
+
+#! <%GTREE 5 Vectorized resolution%>
+def test_compile_locations_uses_range_starts_in_order():
+    rows, cols = compile_locations(["$AA$10", "B2:B20", "A1", "$AB3:$AC4"])
+    assert rows.tolist() == [9, 1, 0, 2]
+    assert cols.tolist() == [26, 1, 0, 27]
+    assert rows.dtype == np.intp and cols.dtype == np.intp
+
+def test_compile_locations_empty():
+    rows, cols = compile_locations([])
+    assert rows.size == 0 and cols.size == 0
+
+def test_gather_fills_positions_outside_the_grid():
+    values = np.array([["a", "b"], ["c", "d"]], dtype=object)
+    rows, cols = compile_locations(["B2", "A1", "AA1", "A30"])
+    assert gather(values, rows, cols, fill=None).tolist() == ["d", "a", None, None]
+
+#============================   End Of File   ================================
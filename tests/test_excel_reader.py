@@ -0,0 +1,70 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : test_excel_reader.py
+# Author    : ForesightInitiative
+# Version   : 1.0.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Tests of the cell-addressed reading mode (ExcelReader.read_cells and
+CellLookup in utils/excel_reader.py).
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the cell lookup tests.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import openpyxl
+import pytest
+
+from utils.excel_reader import CellLookup, ExcelReader
+
+@pytest.fixture
+def cell_lookup():
+    values = {
+        "Variables": {(5, 1): "b6", (1, 1): "b2", (3, 0): "a4", (2, 1): "b3", (0, 1): "header", (1, 2): "c2"},
+        "Empty": {},
+    }
+    return CellLookup(["Variables", "Empty"], values)
+
+#! <%GTREE 2 CellLookup%>
+def test_column_in_row_order_from_start_row(cell_lookup):
+    assert list(cell_lookup.column("Variables", 1, 1).items()) == [(1, "b2"), (2, "b3"), (5, "b6")]
+    assert cell_lookup.column("Variables", 1, 3) == {5: "b6"}
+    assert cell_lookup.column("Variables", 1, 6) == {}
+    # repeated calls use the same column index
+    assert cell_lookup.column("Variables", 0, 0) == {3: "a4"}
+
+def test_column_of_missing_sheets_and_columns(cell_lookup):
+    assert cell_lookup.column("Variables", 7, 0) == {}
+    assert cell_lookup.column("Empty", 0, 0) == {}
+    assert cell_lookup.column("Unknown", 0, 0) == {}
+
+def test_cell_values(cell_lookup):
+    assert cell_lookup.get("Variables", "$B$2") == "b2"
+    assert cell_lookup.value("Variables", 9, 9) is None
+    assert cell_lookup.gather("Variables", [1, 3, 9], [1, 0, 9]) == ["b2", "a4", None]
+    assert cell_lookup.values_to_the_right("Variables", 1, 1) == ["b2", "c2"]
+
+#! <%GTREE 3 read_cells%>
+def test_read_cells_reads_the_referenced_cells(tmp_path):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Variables"
+    sheet.append(["name", "label", "unused"])
+    for row in range(1, 5):
+        sheet.append([f"var{row}", None if row == 2 else f"label {row}", "x"])
+    workbook.save(tmp_path / "primary.xlsx")
+
+    cell_addresses = {"Variables": {"cells": {(0, 0)}, "columns": {1: 1}, "runs": set()}}
+    cell_lookup = ExcelReader(str(tmp_path / "primary.xlsx")).read_cells(cell_addresses)
+    assert cell_lookup.get("Variables", "A1") == "name"
+    assert cell_lookup.column("Variables", 1, 1) == {1: "label 1", 3: "label 3", 4: "label 4"}
+    assert cell_lookup.get("Variables", "C2") is None
+
+#============================   End Of File   ================================
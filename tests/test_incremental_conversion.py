@@ -0,0 +1,91 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : test_incremental_conversion.py
+# Author    : ForesightInitiative
+# Version   : 1.0.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Tests of the incremental reconversion (modules/incremental_conversion.py):
+the result must be identical to a full run.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the incremental conversion tests.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import copy
+
+import openpyxl
+import pytest
+
+from conftest import SCHEMA_PATH
+from metadata_converter import MetadataConverter
+from modules.convert_mapping_excel import ConvertMappingExcel
+from modules.incremental_conversion import IncrementalConversion
+
+@pytest.fixture
+def settings(tmp_path, write_mapping_workbook, dataset_attributes):
+    mapping_path = write_mapping_workbook(tmp_path / "mapping.xlsx")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Dataset"
+    for attribute_name in dataset_attributes:
+        sheet.append([attribute_name, f"{attribute_name} value"])
+    workbook.save(tmp_path / "primary.xlsx")
+    return {
+        "path_to_primary_metadata": str(tmp_path / "primary.xlsx"),
+        "mapping_classification_id": "TEST_MAPPING",
+        "mapping_id": "TEST_MAPPING",
+        "oims_metadata_schema_id": "TEST_SCHEMA",
+        "path_to_oims_metadata_schema_file": SCHEMA_PATH,
+        "path_to_mapping_file": mapping_path,
+        "path_to_output_oims_metadata_file": str(tmp_path / "output" / "output.json"),
+        "report_path": str(tmp_path / "output" / "report.txt"),
+        "log_file": None,
+        "incremental_conversion": True,
+    }
+
+def _convert(settings, schema, full=False):
+    """:return: The output and changed sheets of an incremental (or full) conversion."""
+    mapping = ConvertMappingExcel().convert_excel_mapping(settings["path_to_mapping_file"])
+    converter = MetadataConverter(settings=dict(settings), mapping=mapping, schema=schema)
+    converter.validate_settings()
+    converter.load_inputs()
+    if full:
+        converter.validate_inputs()
+        return converter.convert_data(), None
+    incremental = IncrementalConversion(converter)
+    return incremental.convert(), incremental.changed_sheets
+
+def _flip_multiple(schema, attribute_names):
+    """:return: Copy of the schema (same metadata_name) with the "multiple" flag of the attributes inverted."""
+    changed = copy.deepcopy(schema)
+    for content in changed["OIMS"]["OIMS_content"]:
+        for attribute in content["OIMS_content_object_properties"]["metadata"]:
+            if attribute["attribute_name"] in attribute_names:
+                attribute["multiple"] = not attribute.get("multiple")
+    return changed
+
+#! <%GTREE 2 Reuse of the previous state%>
+def test_unchanged_inputs_reuse_all_sheets(settings, schema):
+    first, _ = _convert(settings, schema)
+    second, changed_sheets = _convert(settings, schema)
+    assert changed_sheets == set()
+    assert second["OIMS"]["OIMS_content"] == first["OIMS"]["OIMS_content"]
+
+def test_changed_schema_with_the_same_name_converts_all_sheets(settings, schema, dataset_attributes):
+    _convert(settings, schema)
+    changed_schema = _flip_multiple(schema, dataset_attributes)
+
+    output, changed_sheets = _convert(settings, changed_schema)
+    full_output, _ = _convert(settings, changed_schema, full=True)
+    assert changed_sheets == {"Dataset"}
+    assert output["OIMS"]["OIMS_content"] == full_output["OIMS"]["OIMS_content"]
+
+#============================   End Of File   ================================
@@ -0,0 +1,68 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : test_json_writer.py
+# Author    : ForesightInitiative
+# Version   : 1.0.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Tests of the streaming OIMS JSON writer (utils/json_writer.py): its output
+must be byte-identical to json.dumps.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the JSON writer tests.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import json
+
+import numpy as np
+import pytest
+
+from utils.json_writer import LOW_MEMORY_STREAM_DEPTH, OimsJsonWriter
+
+DOCUMENT = {
+    "OIMS": {
+        "OIMS_header": {"metadata_schema": {"schema_name": "Test", "schema_version": "1.0", "empty": {}}},
+        "OIMS_content": [
+            {
+                "OIMS_content_object": "dataset",
+                "OIMS_content_object_properties": {"metadata": [{"title": "Ünïcode \"quoted\"", "size": 3, "share": 0.25}]},
+                "entities": [],
+                "flags": [True, False, None],
+            },
+            {"OIMS_content_object": "variable", "entities": [[1, 2], [], {"nested": [{"a": "b"}]}]},
+        ],
+    }
+}
+
+def _write(tmp_path, data, **options):
+    output_path = str(tmp_path / "output.json")
+    OimsJsonWriter(output_path, **options).write(data)
+    with open(output_path, "r", encoding="utf-8") as output_file:
+        return output_file.read()
+
+#! <%GTREE 2 Output%>
+@pytest.mark.parametrize("stream_depth", [None, LOW_MEMORY_STREAM_DEPTH])
+def test_output_matches_json_dumps_indent_4(tmp_path, stream_depth):
+    options = {} if stream_depth is None else {"stream_depth": stream_depth}
+    assert _write(tmp_path, DOCUMENT, **options) == json.dumps(DOCUMENT, indent=4)
+
+def test_compact_output_matches_json_dumps(tmp_path):
+    assert _write(tmp_path, DOCUMENT, compact=True) == json.dumps(DOCUMENT, separators=(",", ":"))
+
+@pytest.mark.parametrize("value", [{}, [], "text", 1, None])
+def test_scalars_and_empty_containers(tmp_path, value):
+    assert _write(tmp_path, value) == json.dumps(value, indent=4)
+
+def test_generators_and_numpy_values_are_written_as_lists(tmp_path):
+    streamed = {"OIMS": {"OIMS_content": (content for content in DOCUMENT["OIMS"]["OIMS_content"]), "count": np.int64(2), "shares": np.array([0.5, 1.5])}}
+    expected = {"OIMS": {"OIMS_content": DOCUMENT["OIMS"]["OIMS_content"], "count": 2, "shares": [0.5, 1.5]}}
+    assert _write(tmp_path, streamed, stream_depth=LOW_MEMORY_STREAM_DEPTH) == json.dumps(expected, indent=4)
+
+#============================   End Of File   ================================
@@ -0,0 +1,58 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : test_logger.py
+# Author    : ForesightInitiative
+# Version   : 1.0.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Tests of the log sampling (utils/logger.py).
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the log sampling tests.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import pytest
+
+from utils.logger import SetupLogger, configure_logging, get_logger, shutdown_logging
+
+@pytest.fixture
+def sampled_log(tmp_path):
+    """
+    Configure logging into a file with 1 of every 10 warnings per call site.
+
+    :return: Function returning the messages logged so far (stops the logging).
+    """
+    log_file = tmp_path / "log.txt"
+    configure_logging(log_file=str(log_file), console=False, sampling={"WARNING": 10})
+
+    def messages():
+        shutdown_logging()
+        return [line.split(" - ", 3)[-1] for line in log_file.read_text().splitlines()]
+
+    yield messages
+    shutdown_logging()
+
+#! <%GTREE 2 Sampling%>
+def test_sampling_per_call_site(sampled_log):
+    logger = get_logger("SamplingTest")
+    for row in range(12):
+        logger.warning("row %s", row)
+    logger.info("not sampled")
+    assert sampled_log() == ["row 0", "row 10", "not sampled"]
+
+def test_setup_logger_keeps_call_sites_apart(sampled_log):
+    logger = SetupLogger("SamplingTest")
+    for row in range(3):
+        logger.warning("first call site, row %s", row)
+        logger.warning("second call site, row %s", row)
+    logger.warning("third call site")
+    assert sampled_log() == ["first call site, row 0", "second call site, row 0", "third call site"]
+
+#============================   End Of File   ================================
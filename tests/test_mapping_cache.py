@@ -0,0 +1,97 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : test_mapping_cache.py
+# Author    : ForesightInitiative
+# Version   : 1.0.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Tests of the compiled mapping cache (modules/mapping_cache.py) and of the
+mappings ConvertMappingExcel returns from it.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the mapping cache tests.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import json
+import logging
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.convert_mapping_excel import ConvertMappingExcel, __tool_version__
+from modules.mapping_cache import MappingCache
+
+def _schema_description(oims_data):
+    return oims_data["OIMS"]["OIMS_header"]["metadata_schema"][0]["schema_properties"][0]["schema_description"]
+
+def _read_json(json_path):
+    with open(json_path, "r", encoding="utf-8") as json_file:
+        return json.load(json_file)
+
+@pytest.fixture
+def mapping_cache(tmp_path):
+    return MappingCache(cache_dir=str(tmp_path / "cache"))
+
+#! <%GTREE 2 Cached conversions%>
+def test_reverted_workbook_rewrites_the_sibling_json(tmp_path, mapping_cache, write_mapping_workbook):
+    mapping_path = str(tmp_path / "mapping.xlsx")
+    json_path = str(tmp_path / "mapping.json")
+    converter = ConvertMappingExcel(mapping_cache=mapping_cache)
+
+    write_mapping_workbook(mapping_path, schema_description="version 1")
+    converter.convert_excel_mapping(mapping_path)
+    write_mapping_workbook(mapping_path, schema_description="version 2")
+    converter.convert_excel_mapping(mapping_path)
+    assert _schema_description(_read_json(json_path)) == "version 2"
+
+    # version 1 is a cache hit now; the sibling JSON must follow the workbook
+    write_mapping_workbook(mapping_path, schema_description="version 1")
+    oims_data = converter.convert_excel_mapping(mapping_path)
+    assert _schema_description(oims_data) == "version 1"
+    assert _read_json(json_path) == oims_data
+
+def test_cache_hit_sets_current_paths_and_date(tmp_path, mapping_cache, write_mapping_workbook):
+    mapping_path = write_mapping_workbook(tmp_path / "mapping.xlsx")
+    converter = ConvertMappingExcel(mapping_cache=mapping_cache)
+    stale = converter.convert_excel_mapping(mapping_path)
+    stale["OIMS"]["OIMS_header"]["file_descriptors"]["metadata_version"]["version_date"] = "2000-01-01"
+    mapping_cache.put(mapping_cache.key(mapping_path, __tool_version__), stale)
+
+    other_json_path = str(tmp_path / "other.json")
+    oims_data = converter.convert_excel_mapping(mapping_path, output_json_path=other_json_path)
+    header = oims_data["OIMS"]["OIMS_header"]
+    assert header["file_descriptors"]["metadata_version"]["version_date"] == datetime.now().strftime("%Y-%m-%d")
+    assert header["mapping_info"]["input_parameters"][1]["output_parameter_value"] == other_json_path
+    assert _read_json(other_json_path) == oims_data
+
+#! <%GTREE 3 Entries%>
+def test_put_serializes_numpy_and_timestamp_values(mapping_cache):
+    mapping_cache.put("key", {"count": np.int64(3), "share": np.float64(0.5), "date": pd.Timestamp("2024-01-02"), "flags": np.array([1, 2])})
+    assert mapping_cache.get("key") == {"count": 3, "share": 0.5, "date": "2024-01-02T00:00:00", "flags": [1, 2]}
+
+def test_put_skips_mappings_with_non_string_keys(mapping_cache):
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    cache_logger = logging.getLogger("oims_converter.MappingCache")
+    cache_logger.addHandler(handler)
+    try:
+        mapping_cache.put("key", {"metadata": [{1: "a"}]})
+    finally:
+        cache_logger.removeHandler(handler)
+
+    assert mapping_cache.get("key") is None
+    assert not os.path.exists(os.path.join(mapping_cache.cache_dir, "key.json"))
+    assert any("non-string keys" in record.getMessage() for record in records)
+
+#============================   End Of File   ================================
@@ -0,0 +1,58 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : test_output_validator.py
+# Author    : ForesightInitiative
+# Version   : 1.0.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Tests of the compiled output validator (validators/output_validator.py).
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the output validator tests.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import copy
+
+import pytest
+
+from validators.output_validator import OutputValidator
+
+def _document(properties):
+    return {"OIMS": {"OIMS_content": [
+        {"OIMS_content_object": "DatasetLevel", "OIMS_content_object_properties": {"entity_class": "dataset", **properties}},
+    ]}}
+
+def _data_type_messages(validator, properties):
+    return [violation.message for violation in validator.validate(_document(properties)) if violation.check == "data_type"]
+
+#! <%GTREE 2 Data types%>
+@pytest.mark.parametrize("attribute_name, data_type", [("version_information", "text"), ("dataset_title", "string")])
+def test_data_type_message_names_the_schema_data_type(schema, attribute_name, data_type):
+    messages = _data_type_messages(OutputValidator.compile(schema), {attribute_name: 12})
+    assert len(messages) == 1
+    assert f"not of data type '{data_type}'" in messages[0]
+
+def test_data_types_are_stripped(schema):
+    padded = copy.deepcopy(schema)
+    for content in padded["OIMS"]["OIMS_content"]:
+        for attribute in content["OIMS_content_object_properties"]["metadata"]:
+            if attribute.get("data_type") == "compound_object":
+                attribute["data_type"] = "compound_object "
+                attribute["requirement_level"] = "required"
+    validator = OutputValidator.compile(padded)
+    compound_objects = [check for check in validator.checks.values() if check.data_type_name == "compound_object"]
+    assert compound_objects
+    # compound objects are never required themselves, whatever their requirement level says
+    assert not any(check.required for check in compound_objects)
+
+def test_valid_values_pass(schema):
+    assert _data_type_messages(OutputValidator.compile(schema), {"version_information": "v1", "dataset_title": "Title"}) == []
+
+#============================   End Of File   ================================
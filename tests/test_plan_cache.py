@@ -0,0 +1,92 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : test_plan_cache.py
+# Author    : ForesightInitiative
+# Version   : 1.1.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Tests of the GenericMapper plan cache (mappers/genericmapper.py).
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the plan cache tests.
+- Version 1.1.0: Digest of frozen mappings.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import copy
+import json
+
+import pytest
+
+from mappers.genericmapper import GenericMapper, mapping_fingerprint
+from modules.convert_mapping_excel import ConvertMappingExcel
+from modules.resource_cache import freeze
+from oims_structures.schema_index import SchemaIndex
+
+@pytest.fixture
+def mapping(tmp_path, write_mapping_workbook):
+    mapping_path = write_mapping_workbook(tmp_path / "mapping.xlsx")
+    return ConvertMappingExcel().convert_excel_mapping(mapping_path)
+
+def _flip_multiple(schema, attribute_names):
+    """:return: Copy of the schema (same metadata_name) with the "multiple" flag of the attributes inverted."""
+    changed = copy.deepcopy(schema)
+    for content in changed["OIMS"]["OIMS_content"]:
+        for attribute in content["OIMS_content_object_properties"]["metadata"]:
+            if attribute["attribute_name"] in attribute_names:
+                attribute["multiple"] = not attribute.get("multiple")
+    return changed
+
+def _multiple_flags(plan):
+    return {assign.oims_attribute_id: assign.multiple for group in plan.groups for assign in group.assigns}
+
+#! <%GTREE 2 Plan cache%>
+def test_same_schema_reuses_the_plan(mapping, schema):
+    mapper = GenericMapper()
+    plan = mapper.get_plan(mapping, schema)
+    assert mapper.get_plan(mapping, copy.deepcopy(schema)) is plan
+    assert mapper.get_plan(mapping, SchemaIndex(schema)) is plan
+
+def test_frozen_mapping_digest_is_computed_once(mapping, schema, monkeypatch):
+    frozen = freeze(copy.deepcopy(mapping))
+    assert mapping_fingerprint(frozen) == mapping_fingerprint(mapping)
+
+    schema_index = SchemaIndex(schema)
+    mapper = GenericMapper()
+    plan = mapper.get_plan(frozen, schema_index)
+    # a cache hit serializes neither the mapping nor the schema again
+    monkeypatch.setattr(json, "dumps", None)
+    assert mapper.get_plan(frozen, schema_index) is plan
+
+def test_changed_schema_with_the_same_name_compiles_a_new_plan(mapping, schema, dataset_attributes):
+    mapper = GenericMapper()
+    plan = mapper.get_plan(mapping, schema)
+    changed_schema = _flip_multiple(schema, dataset_attributes)
+
+    changed_plan = mapper.get_plan(mapping, changed_schema)
+    assert changed_plan is not plan
+    flags = _multiple_flags(plan)
+    assert _multiple_flags(changed_plan) == {name: not multiple for name, multiple in flags.items()}
+    assert set(flags) == set(dataset_attributes)
+
+def test_edited_schema_file_compiles_a_new_plan(tmp_path, mapping, schema, dataset_attributes):
+    schema_path = str(tmp_path / "schema.json")
+    snapshot_dir = str(tmp_path / "snapshots")
+    with open(schema_path, "w", encoding="utf-8") as schema_file:
+        json.dump(schema, schema_file)
+    mapper = GenericMapper()
+    plan = mapper.get_plan(mapping, SchemaIndex.load(schema_path, snapshot_dir=snapshot_dir))
+
+    with open(schema_path, "w", encoding="utf-8") as schema_file:
+        json.dump(_flip_multiple(schema, dataset_attributes), schema_file, indent=1)
+    changed_plan = mapper.get_plan(mapping, SchemaIndex.load(schema_path, snapshot_dir=snapshot_dir))
+    assert changed_plan is not plan
+    assert _multiple_flags(changed_plan) != _multiple_flags(plan)
+
+#============================   End Of File   ================================
@@ -0,0 +1,87 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : test_schema_index.py
+# Author    : ForesightInitiative
+# Version   : 1.0.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Tests of the compiled schema index and its snapshots
+(oims_structures/schema_index.py).
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the schema index tests.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import json
+import os
+import pickle
+
+import pytest
+
+from oims_structures.schema_index import SNAPSHOT_FORMAT_VERSION, SchemaIndex
+
+@pytest.fixture
+def schema_path(tmp_path, schema):
+    schema_dir = tmp_path / "schemas"
+    schema_dir.mkdir()
+    schema_path = str(schema_dir / "schema.json")
+    with open(schema_path, "w", encoding="utf-8") as schema_file:
+        json.dump(schema, schema_file)
+    return schema_path
+
+def _plant_snapshot(schema_path, snapshot_dir):
+    """:return: Path of a valid-looking snapshot holding a foreign index."""
+    schema_stat = os.stat(schema_path)
+    snapshot_path = SchemaIndex.snapshot_path(schema_path, snapshot_dir)
+    with open(snapshot_path, "wb") as snapshot_file:
+        pickle.dump({
+            "format_version": SNAPSHOT_FORMAT_VERSION, "mtime_ns": schema_stat.st_mtime_ns,
+            "size": schema_stat.st_size, "sha256": None, "index": "planted",
+        }, snapshot_file)
+    return snapshot_path
+
+#! <%GTREE 2 Snapshots%>
+def test_snapshot_is_written_to_the_snapshot_folder(tmp_path, schema_path):
+    snapshot_dir = str(tmp_path / "snapshots")
+
+    index = SchemaIndex.load(schema_path, snapshot_dir=snapshot_dir)
+    assert os.listdir(os.path.dirname(schema_path)) == ["schema.json"]
+    assert os.stat(snapshot_dir).st_mode & 0o777 == 0o700
+    assert os.path.exists(SchemaIndex.snapshot_path(schema_path, snapshot_dir))
+    assert SchemaIndex.load(schema_path, snapshot_dir=snapshot_dir).content_sha256() == index.content_sha256()
+
+def test_load_without_snapshot_folder_writes_nothing(schema_path):
+    index = SchemaIndex.load(schema_path, snapshot_dir=None)
+    assert index.content_sha256()
+    assert os.listdir(os.path.dirname(schema_path)) == ["schema.json"]
+
+#! <%GTREE 3 Ownership%>
+def test_snapshot_writable_by_others_is_not_loaded(tmp_path, schema_path):
+    snapshot_dir = str(tmp_path / "snapshots")
+    SchemaIndex.load(schema_path, snapshot_dir=snapshot_dir)
+    snapshot_path = _plant_snapshot(schema_path, snapshot_dir)
+    os.chmod(snapshot_path, 0o666)
+
+    index = SchemaIndex.load(schema_path, snapshot_dir=snapshot_dir)
+    assert isinstance(index, SchemaIndex)
+    # the rebuilt index replaced the planted snapshot
+    assert os.stat(snapshot_path).st_mode & 0o022 == 0
+
+def test_folder_writable_by_others_is_not_used(tmp_path, schema_path):
+    snapshot_dir = tmp_path / "shared"
+    snapshot_dir.mkdir()
+    snapshot_path = _plant_snapshot(schema_path, str(snapshot_dir))
+    os.chmod(snapshot_dir, 0o777)
+
+    index = SchemaIndex.load(schema_path, snapshot_dir=str(snapshot_dir))
+    assert isinstance(index, SchemaIndex)
+    assert os.listdir(snapshot_dir) == [os.path.basename(snapshot_path)]
+
+#============================   End Of File   ================================
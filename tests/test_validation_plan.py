@@ -0,0 +1,60 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : test_validation_plan.py
+# Author    : ForesightInitiative
+# Version   : 1.0.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Tests of the entity class check of the compiled validation plan
+(validators/validation_plan.py).
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the entity class tests.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import copy
+
+import pytest
+
+from modules.convert_mapping_excel import ConvertMappingExcel
+from validators.validation_plan import ValidationPlan
+
+@pytest.fixture
+def mapping(tmp_path, write_mapping_workbook):
+    mapping_path = write_mapping_workbook(tmp_path / "mapping.xlsx")
+    return ConvertMappingExcel().convert_excel_mapping(mapping_path)
+
+def _with_entity_class(mapping, entity_class):
+    changed = copy.deepcopy(mapping)
+    metadata = changed["OIMS"]["OIMS_content"]["OIMS_content"][0]["OIMS_content_object_properties"]["metadata"]
+    for metadata_item in metadata:
+        metadata_item["entity_class"] = entity_class
+    return changed
+
+def _entity_class_violations(plan):
+    return [violation for checks in plan.sheet_checks for violation in checks.mapping_violations
+            if violation.check == "entity_class"]
+
+#! <%GTREE 2 Entity classes%>
+@pytest.mark.parametrize("entity_class", ["dataset", "data file", "data_file"])
+def test_known_entity_classes_pass(mapping, schema, entity_class):
+    plan = ValidationPlan.compile(_with_entity_class(mapping, entity_class), schema)
+    assert _entity_class_violations(plan) == []
+
+def test_schema_entity_classes_do_not_widen_the_allowed_set(mapping, schema):
+    schema = copy.deepcopy(schema)
+    schema["OIMS"]["OIMS_content"][0]["OIMS_content_object_properties"]["metadata"][0]["valid_entity_class"].append("publication")
+
+    for plan in (ValidationPlan.compile(_with_entity_class(mapping, "publication")),
+                 ValidationPlan.compile(_with_entity_class(mapping, "publication"), schema)):
+        violations = _entity_class_violations(plan)
+        assert [violation.message for violation in violations] == ["Invalid entity class 'publication' in sheet 'Dataset'."]
+
+#============================   End Of File   ================================
@@ -0,0 +1,166 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : column_types.py
+# Author    : ForesightInitiative
+# Version   : 1.0.1
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Bulk clean-up and type coercion of DataFrame columns by OIMS data_type.
+
+Every column is cleaned in one vectorized pass per step: strings are stripped,
+empty strings become missing values, and the values are coerced to the
+data_type of the OIMS attribute:
+    - string, text, url, email, controlled_vocabulary: str
+    - number, percentage: int or float (whole numbers beyond the int64
+      range stay float)
+    - integer: int
+    - boolean: bool ("true"/"yes"/"1" and "false"/"no"/"0", case-insensitive)
+    - date: "YYYY-MM-DD" (with the time when it is not midnight)
+Values that cannot be coerced are kept as they are, so the output validator
+can report them. Infinite numbers are not numbers in JSON: text such as "inf"
+is kept as it is, infinite cell values become missing values. Other data types (e.g. compound_object) are only cleaned,
+and their dates are written like the date data_type.
+
+The returned columns have object dtype and hold plain Python values, ready
+for JSON serialization.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the bulk column coercion.
+- Version 1.0.1: Whole numbers beyond the int64 range stay float; infinite numbers are not coerced.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import datetime
+
+import numpy as np
+import pandas as pd
+
+TEXT_DATA_TYPES = ("string", "text", "url", "email", "controlled_vocabulary")
+NUMBER_DATA_TYPES = ("number", "percentage")
+
+# whole floats below this magnitude are written as int
+INT64_LIMIT = 2.0 ** 63
+
+BOOLEAN_VALUES = {
+    "true": True, "yes": True, "1": True, "1.0": True,
+    "false": False, "no": False, "0": False, "0.0": False,
+}
+
+#! <%GTREE 2 Cleaning%>
+def clean_column(series):
+    """
+    Strip strings and turn empty strings into missing values.
+
+    :param series: pandas Series.
+    :return: Series with object dtype.
+    """
+    series = series.astype(object)
+    try:
+        stripped = series.str.strip()
+    except AttributeError:
+        # no string values in the column
+        return series.where(series.notna(), None)
+    series = stripped.where(stripped.notna(), series)
+    return series.where(series.notna() & (series != ""), None)
+
+def _dates_as_text(series):
+    # untyped columns: dates and times are written like the date data_type
+    kind = pd.api.types.infer_dtype(series, skipna=True)
+    if kind in ("datetime", "datetime64", "date"):
+        return _as_date(series)
+    if kind.startswith("mixed"):
+        is_date = series.map(lambda value: isinstance(value, (datetime.date, pd.Timestamp)))
+        if is_date.any():
+            series = series.copy()
+            series[is_date] = _as_date(series[is_date])
+    return series
+
+#! <%GTREE 3 Coercion per data type%>
+def _keep_uncoerced(coerced, original):
+    # values that could not be coerced keep their original value
+    return coerced.where(coerced.notna() | original.isna(), original)
+
+def _as_text(series):
+    present = series.notna()
+    return series.astype(str).astype(object).where(present, None)
+
+def _as_number(series, integer=False):
+    numbers = pd.to_numeric(series, errors="coerce")
+    if numbers.dtype.kind in "iu":
+        # only integer cells (Python ints, also beyond the int64 range)
+        return numbers.astype(object)
+    original = series
+    infinite = np.isinf(numbers)
+    if infinite.any():
+        # text such as "inf" is kept for the output validator, infinite floats have no JSON value
+        original = series.where(~(infinite & series.map(lambda value: isinstance(value, float))), None)
+        numbers = numbers.where(~infinite)
+    whole = numbers.notna() & (numbers % 1 == 0)
+    # whole numbers become int (Excel stores 12 as 12.0), others stay float;
+    # so do whole numbers int64 cannot hold
+    as_int = whole & (numbers.abs() < INT64_LIMIT)
+    integers = numbers.where(as_int).astype("Int64").astype(object)
+    if integer:
+        coerced = integers.where(as_int, numbers.where(whole).astype(object))
+    else:
+        coerced = integers.where(as_int, numbers.astype(object))
+    coerced = coerced.where(whole | (numbers.notna() & (not integer)), None)
+    return _keep_uncoerced(coerced, original)
+
+def _as_boolean(series):
+    booleans = series.astype(str).str.strip().str.lower().map(BOOLEAN_VALUES)
+    return _keep_uncoerced(booleans.astype(object).where(booleans.notna(), None), series)
+
+def _to_datetime64(series):
+    if pd.api.types.infer_dtype(series, skipna=True) in ("datetime", "datetime64", "date"):
+        # cells Excel already stored as dates
+        try:
+            return pd.DatetimeIndex(series.to_numpy()).to_numpy(dtype="datetime64[s]")
+        except (TypeError, ValueError):
+            pass
+    # numbers are not dates (they would become offsets from 1970)
+    numeric = pd.to_numeric(series, errors="coerce").notna()
+    dates = pd.to_datetime(series.where(~numeric, None), errors="coerce", format="mixed")
+    return dates.to_numpy(dtype="datetime64[s]")
+
+def _as_date(series):
+    values = _to_datetime64(series)
+    present = ~np.isnat(values)
+    days = values.astype("datetime64[D]")
+    text = np.datetime_as_string(days, unit="D").astype(object)
+    with_time = present & (values != days)
+    if with_time.any():
+        text[with_time] = np.datetime_as_string(values[with_time], unit="s")
+    text[~present] = None
+    return _keep_uncoerced(pd.Series(text, index=series.index, dtype=object), series)
+
+def coerce_column(series, data_type):
+    """
+    Clean a column and coerce it to an OIMS data_type.
+
+    :param series: pandas Series with the raw cell values.
+    :param data_type: data_type of the OIMS attribute (None: only clean).
+    :return: Series with object dtype; missing values are None.
+    """
+    series = clean_column(series)
+    if not series.notna().any():
+        return series
+    if data_type in TEXT_DATA_TYPES:
+        return _as_text(series)
+    if data_type in NUMBER_DATA_TYPES:
+        return _as_number(series)
+    if data_type == "integer":
+        return _as_number(series, integer=True)
+    if data_type == "boolean":
+        return _as_boolean(series)
+    if data_type == "date":
+        return _as_date(series)
+    return _dates_as_text(series)
+
+#============================   End Of File   ================================
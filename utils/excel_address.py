@@ -0,0 +1,161 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : excel_address.py
+# Author    : ForesightInitiative
+# Version   : 1.1.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Helpers to translate MS Excel A1-style cell references (e.g. "E2", "AB17",
+"$E$2") and ranges (e.g. "E2:E200") into zero-based (row, column) positions
+and back, plus vectorized helpers that compile many references into NumPy
+index arrays and gather the referenced values from a sheet in one step.
+
+Row and column indices returned here refer to the raw cell grid of the
+sheet: "A1" is (0, 0), independent of any header row pandas may use.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the cell reference helpers.
+- Version 1.1.0: Ranges, compiled index arrays and vectorized gathering.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import re
+
+import numpy as np
+
+CELL_REFERENCE_PATTERN = re.compile(r"^\$?([A-Za-z]{1,3})\$?([1-9][0-9]*)$")
+
+#! <%GTREE 2 Column letters%>
+def column_index(letters):
+    """
+    Convert column letters into a zero-based column index ("A" -> 0, "AA" -> 26).
+
+    :param letters: Column letters.
+    :return: Zero-based column index.
+    """
+    index = 0
+    for letter in letters.upper():
+        index = index * 26 + (ord(letter) - ord("A") + 1)
+    return index - 1
+
+def column_letters(index):
+    """
+    Convert a zero-based column index into column letters (0 -> "A", 26 -> "AA").
+
+    :param index: Zero-based column index.
+    :return: Column letters.
+    """
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+#! <%GTREE 3 Cell references%>
+def is_cell_reference(value):
+    """
+    :param value: Any value.
+    :return: True if the value is an A1-style cell reference.
+    """
+    return isinstance(value, str) and CELL_REFERENCE_PATTERN.match(value.strip()) is not None
+
+def parse_cell(reference):
+    """
+    Parse an A1-style cell reference (e.g. "E2" or "$E$2") into a zero-based
+    (row, col) tuple.
+
+    :param reference: Cell reference.
+    :return: Tuple (row, col).
+    :raises ValueError: If the reference is not a valid cell reference.
+    """
+    match = CELL_REFERENCE_PATTERN.match(str(reference).strip())
+    if not match:
+        raise ValueError(f"Invalid Excel cell reference '{reference}'.")
+    letters, row = match.groups()
+    return int(row) - 1, column_index(letters)
+
+def format_cell(row, col):
+    """
+    Format a zero-based (row, col) position as a canonical A1 reference.
+
+    :param row: Zero-based row index.
+    :param col: Zero-based column index.
+    :return: Cell reference such as "E2".
+    """
+    return f"{column_letters(col)}{row + 1}"
+
+#! <%GTREE 4 Ranges%>
+def parse_range(reference):
+    """
+    Parse an A1-style range (e.g. "E2:E200") or a single cell reference into
+    zero-based start and end positions.
+
+    :param reference: Range or cell reference.
+    :return: Tuple ((start_row, start_col), (end_row, end_col)).
+    :raises ValueError: If the reference is not a valid range.
+    """
+    parts = str(reference).split(":")
+    if len(parts) > 2:
+        raise ValueError(f"Invalid Excel range '{reference}'.")
+    start = parse_cell(parts[0])
+    end = parse_cell(parts[-1])
+    if end[0] < start[0] or end[1] < start[1]:
+        raise ValueError(f"Invalid Excel range '{reference}': end lies before start.")
+    return start, end
+
+def range_indices(reference):
+    """
+    Expand a range into the row and column index arrays of all its cells
+    (row by row).
+
+    :param reference: Range or cell reference.
+    :return: Tuple (rows, cols) of NumPy integer arrays.
+    """
+    (start_row, start_col), (end_row, end_col) = parse_range(reference)
+    rows, cols = np.meshgrid(
+        np.arange(start_row, end_row + 1),
+        np.arange(start_col, end_col + 1),
+        indexing="ij"
+    )
+    return rows.ravel(), cols.ravel()
+
+#! <%GTREE 5 Vectorized resolution%>
+def compile_locations(references):
+    """
+    Compile a list of cell references into integer index arrays. For ranges
+    the start cell is used.
+
+    :param references: Iterable of cell or range references.
+    :return: Tuple (rows, cols) of NumPy integer arrays, in input order.
+    """
+    starts = [parse_range(reference)[0] for reference in references]
+    if not starts:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    rows, cols = zip(*starts)
+    return np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)
+
+def gather(values, rows, cols, fill=None):
+    """
+    Fetch many cells from a 2-D array of sheet values in one NumPy gather.
+    Positions outside the sheet resolve to `fill`.
+
+    :param values: 2-D NumPy array with the raw cell grid of a sheet.
+    :param rows: Row index array.
+    :param cols: Column index array.
+    :param fill: Value for positions outside the grid.
+    :return: Object array with the gathered values.
+    """
+    gathered = np.full(len(rows), fill, dtype=object)
+    n_rows, n_cols = values.shape
+    inside = (rows < n_rows) & (cols < n_cols)
+    gathered[inside] = values[rows[inside], cols[inside]]
+    return gathered
+
+#============================   End Of File   ================================
@@ -2,34 +2,287 @@
 #=============================================================================
 # File      : excel_reader.py
 # Author    : Gideon Kruseman <g.kruseman@cgiar.org>
-# Version   : 1.0.0
+# Version   : 1.3.1
 # Date      : 2024-12-06
 # Changed   : <date of changes relative to last version>
 # Changed by: <author of the changes>
 # Remarks   :
 """
+ExcelReader offers two modes:
+- read_excel(): open the whole workbook as a pandas ExcelFile (sheets are
+  parsed into DataFrames, see utils/workbook_session.py).
+- read_cells(): stream only the cells a mapping refers to with openpyxl in
+  read-only mode and return a compact address -> value lookup. This is the
+  low-memory mode of MetadataConverter: no sheet is held as a DataFrame.
+
+With a SheetCache (utils/sheet_cache.py) every sheet parsed from the
+workbook is stored on disk under the hash of the workbook, and later runs
+load it from there (see WorkbookSession.parse) without opening the workbook.
 """
 # version history information   :
 """
 - Version 1.0.0: Initial implementation of the Excel reading functionality.
+- Version 1.1.0: Cell-addressed streaming reader driven by the mapping locations.
+- Version 1.1.1: pandas and openpyxl are imported on first use, so importing the
+                 module does not slow down CLI commands that never read Excel.
+- Version 1.2.0: read_cells keeps the values to the right of a range start
+                 (multi-value attributes) and the CellLookup can serve the
+                 validation plan, so a whole conversion can run on it.
+- Version 1.3.0: Optional SheetCache of the parsed sheets, keyed by the workbook hash.
+- Version 1.3.1: CellLookup.column slices a per-sheet column index instead of sorting the sheet.
 """
 #=============================================================================
 #<%/REGION File header%>
 
 #! <%GTREE 1 Initialization%>
-import pandas as pd
+import bisect
+
+# pandas and openpyxl are imported in the methods that need them (CLI start-up time)
+from utils.excel_address import format_cell, is_cell_reference, parse_cell
+
+# attribute pair properties that hold a single cell reference
+CELL_LOCATION_KEYS = ("excel_field_name_loc", "excel_value_loc_range_start", "user_comments")
 
 #! <%GTREE 2 ExcelReader Class%>
 class ExcelReader:
     #! <%GTREE 2.1 Initialization%>
-    def __init__(self, file_path):
+    def __init__(self, file_path, sheet_cache=None):
+        """
+        :param file_path: Path to the MS Excel workbook.
+        :param sheet_cache: Optional SheetCache for the parsed sheets.
+        """
         self.file_path = file_path
+        self.sheet_cache = sheet_cache
+        self._cache_key = None
 
     #! <%GTREE 2.2 Read Excel File%>
     def read_excel(self):
+        import pandas as pd
+
         try:
             return pd.ExcelFile(self.file_path)
         except Exception as e:
             raise FileNotFoundError(f"Error loading Excel file: {e}")
 
+    #! <%GTREE 2.3 Collect the cells referenced by a mapping%>
+    @staticmethod
+    def collect_cell_addresses(mapping):
+        """
+        Collect, per sheet, every cell the mapping refers to.
+
+        For sheets with table_orientation "attributes_in_columns" the value
+        location is the start of a column that runs to the end of the sheet,
+        so it is recorded as an open column range. In the other sheets a value
+        location may be the start of several values that continue to the
+        right, so it is recorded as the start of a row run.
+
+        :param mapping: OIMS mapping dictionary.
+        :return: Dictionary {sheetname: {"cells": set of (row, col), "columns": {col: start_row},
+                 "runs": set of (row, col)}}.
+        """
+        metadata = mapping["OIMS"]["OIMS_content"]["OIMS_content"][0]["OIMS_content_object_properties"]["metadata"]
+        cell_addresses = {}
+        for metadata_item in metadata:
+            sheet_addresses = cell_addresses.setdefault(
+                metadata_item["sheetname"], {"cells": set(), "columns": {}, "runs": set()}
+            )
+            in_columns = metadata_item.get("table_orientation") == "attributes_in_columns"
+            for attribute_pair in metadata_item.get("attribute_pairs", []):
+                for key in CELL_LOCATION_KEYS:
+                    location = attribute_pair.get(key)
+                    if not is_cell_reference(location):
+                        continue
+                    row, col = parse_cell(location)
+                    if in_columns and key == "excel_value_loc_range_start":
+                        start_row = sheet_addresses["columns"].get(col, row)
+                        sheet_addresses["columns"][col] = min(start_row, row)
+                    else:
+                        sheet_addresses["cells"].add((row, col))
+                        if key == "excel_value_loc_range_start":
+                            sheet_addresses["runs"].add((row, col))
+        return cell_addresses
+
+    #! <%GTREE 2.4 Read only the referenced cells%>
+    def read_cells(self, cell_addresses):
+        """
+        Read only the referenced cells of a workbook in a single forward pass
+        per sheet using openpyxl in read-only mode.
+
+        :param cell_addresses: Output of collect_cell_addresses().
+        :return: CellLookup with the values of the non-empty referenced cells.
+        """
+        import openpyxl
+
+        try:
+            workbook = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+        except Exception as e:
+            raise FileNotFoundError(f"Error loading Excel file: {e}")
+
+        try:
+            values = {}
+            for sheetname, sheet_addresses in cell_addresses.items():
+                if sheetname not in workbook.sheetnames:
+                    continue
+                values[sheetname] = self._read_sheet_cells(workbook[sheetname], sheet_addresses)
+            return CellLookup(workbook.sheetnames, values, file_path=self.file_path)
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _read_sheet_cells(worksheet, sheet_addresses):
+        cells_by_row = {}
+        for row, col in sheet_addresses["cells"]:
+            cells_by_row.setdefault(row, []).append(col)
+        columns = sheet_addresses["columns"]
+        runs_by_row = {}
+        for row, col in sheet_addresses.get("runs", ()):
+            runs_by_row.setdefault(row, []).append(col)
+        if not cells_by_row and not columns:
+            return {}
+
+        first_row = min(list(cells_by_row) + list(columns.values()))
+        # open column ranges run to the last row of the sheet, row runs to the last column
+        last_row = None if columns else max(cells_by_row)
+        last_col = None if runs_by_row else max([col for cols in cells_by_row.values() for col in cols] + list(columns))
+
+        sheet_values = {}
+        rows = worksheet.iter_rows(
+            min_row=first_row + 1,
+            max_row=None if last_row is None else last_row + 1,
+            max_col=None if last_col is None else last_col + 1,
+            values_only=True
+        )
+        for row, row_values in enumerate(rows, start=first_row):
+            wanted = list(cells_by_row.get(row, ()))
+            wanted.extend(col for col, start_row in columns.items() if row >= start_row)
+            for col in wanted:
+                if col < len(row_values) and row_values[col] is not None:
+                    sheet_values[(row, col)] = row_values[col]
+            for start_col in runs_by_row.get(row, ()):
+                # the values of a run continue to the right until the first empty cell
+                for col in range(start_col + 1, len(row_values)):
+                    if row_values[col] is None:
+                        break
+                    sheet_values[(row, col)] = row_values[col]
+        return sheet_values
+
+    #! <%GTREE 2.5 Parsed sheet cache%>
+    def cache_key(self):
+        """
+        :return: SheetCache key of the workbook, or None without a cache (or
+                 when the workbook cannot be read, which read_excel reports).
+        """
+        if self.sheet_cache is None:
+            return None
+        if self._cache_key is None:
+            try:
+                self._cache_key = self.sheet_cache.key(self.file_path)
+            except OSError:
+                return None
+        return self._cache_key
+
+    def cached_sheet_names(self):
+        """
+        :return: Sheet names of the workbook from the cache, or None.
+        """
+        key = self.cache_key()
+        return None if key is None else self.sheet_cache.sheet_names(key)
+
+    def cached_sheet(self, sheetname, parse_options):
+        """
+        :param sheetname: Name of the sheet.
+        :param parse_options: Keyword arguments of ExcelFile.parse.
+        :return: The cached DataFrame, or None.
+        """
+        key = self.cache_key()
+        return None if key is None else self.sheet_cache.get(key, sheetname, parse_options)
+
+    def cache_sheet(self, sheet_names, sheetname, parse_options, frame):
+        """
+        Store a sheet parsed from the workbook in the cache.
+
+        :return: Format the sheet was stored in, or None.
+        """
+        key = self.cache_key()
+        return None if key is None else self.sheet_cache.put(key, sheet_names, sheetname, parse_options, frame)
+
+#! <%GTREE 3 CellLookup Class%>
+class CellLookup:
+    """
+    Compact address -> value lookup returned by ExcelReader.read_cells.
+    Empty and unreferenced cells are not stored and read as None.
+    """
+    def __init__(self, sheet_names, values, file_path=None):
+        self.sheet_names = list(sheet_names)
+        self.file_path = file_path
+        self._values = values
+        # sheet name -> {col: sorted rows of the non-empty cells}, built by column()
+        self._column_rows = {}
+        # Instrumentation of the run (see utils/instrumentation.py), set by the caller
+        self.instrumentation = None
+
+    def value(self, sheetname, row, col):
+        """
+        :return: Value of the zero-based (row, col) cell in a sheet, or None.
+        """
+        return self._values.get(sheetname, {}).get((row, col))
+
+    def gather(self, sheetname, rows, cols):
+        """
+        :return: List with the values of the (row, col) cells of a sheet (None when empty).
+        """
+        sheet_values = self._values.get(sheetname, {})
+        return [sheet_values.get((int(row), int(col))) for row, col in zip(rows, cols)]
+
+    def values_to_the_right(self, sheetname, row, col):
+        """
+        :return: List with the value of a cell and the values to its right up to the first empty cell.
+        """
+        sheet_values = self._values.get(sheetname, {})
+        values = []
+        while (row, col) in sheet_values:
+            values.append(sheet_values[(row, col)])
+            col += 1
+        return values
+
+    def get(self, sheetname, reference):
+        """
+        :param reference: A1-style cell reference, e.g. "E2".
+        :return: Value of the cell, or None.
+        """
+        return self.value(sheetname, *parse_cell(reference))
+
+    def column(self, sheetname, col, start_row):
+        """
+        :return: Dictionary {row: value} of the non-empty cells of a column from start_row on.
+        """
+        sheet_values = self._values.get(sheetname, {})
+        rows = self._sheet_columns(sheetname).get(col, [])
+        return {row: sheet_values[(row, col)] for row in rows[bisect.bisect_left(rows, start_row):]}
+
+    def _sheet_columns(self, sheetname):
+        # indexed once per sheet; every mapped column of the sheet is then a slice
+        sheet_columns = self._column_rows.get(sheetname)
+        if sheet_columns is None:
+            sheet_columns = {}
+            for row, col in sorted(self._values.get(sheetname, {})):
+                sheet_columns.setdefault(col, []).append(row)
+            self._column_rows[sheetname] = sheet_columns
+        return sheet_columns
+
+    def sheet(self, sheetname):
+        """
+        :return: Dictionary {"A2": value, ...} with the referenced cells of a sheet.
+        """
+        return {format_cell(row, col): value for (row, col), value in self._values.get(sheetname, {}).items()}
+
+    def stats(self):
+        """
+        :return: Dictionary with the number of sheets and non-empty cells read.
+        """
+        return {
+            "sheets_read": len(self._values),
+            "cells_read": sum(len(sheet_values) for sheet_values in self._values.values()),
+        }
+
 #============================   End Of File   ================================
\ No newline at end of file
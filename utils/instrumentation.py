@@ -0,0 +1,285 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : instrumentation.py
+# Author    : ForesightInitiative
+# Version   : 1.2.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Lightweight run instrumentation: wall and CPU time per stage and per sheet,
+memory per stage, and named counters.
+
+    instrumentation = Instrumentation()
+    with instrumentation.stage("convert_data"):
+        with instrumentation.sheet("Variables"):
+            ...
+        instrumentation.count("values_mapped", 120)
+    instrumentation.report()
+
+Sheet timings are recorded under the stage that is running on the same
+thread. A sheet context inside a context for the same sheet (e.g. parsing a
+sheet while validating it) is not counted twice. Stages may nest; the time
+of a nested stage is also part of the stage around it.
+
+Every stage records the peak resident set size of the process at its end
+(a high-water mark, so it includes the stages before it). With
+trace_memory=True the stages are also traced with tracemalloc: the peak of
+the Python allocations during the stage and the largest allocation sites
+still alive at its end. tracemalloc slows the run down noticeably and traces
+all threads of the process, so it is only meant for investigating a workbook.
+
+Components that receive a WorkbookSession find the instrumentation of the run
+on the session (instrumentation_of(workbook)); without one, the no-op
+NULL_INSTRUMENTATION is used. Work that runs on a pool records into its own
+Instrumentation, whose sheet timings and counters are merged into the run's.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the run instrumentation.
+- Version 1.1.0: Peak RSS per stage and optional tracemalloc tracing.
+- Version 1.2.0: merge() adds the sheet timings and counters recorded by another
+                 instrumentation (sheets run on a worker pool).
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import functools
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+from utils.memory_usage import MEGABYTE, peak_rss_mb
+
+# number of allocation sites reported per traced stage
+TOP_ALLOCATIONS = 5
+
+#! <%GTREE 2 Timing records%>
+class Timing:
+    __slots__ = ("wall_seconds", "cpu_seconds", "calls", "peak_rss_mb", "traced_peak_mb", "top_allocations")
+
+    def __init__(self):
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.calls = 0
+        self.peak_rss_mb = None
+        self.traced_peak_mb = None
+        self.top_allocations = None
+
+    def add(self, wall_seconds, cpu_seconds):
+        self.wall_seconds += wall_seconds
+        self.cpu_seconds += cpu_seconds
+        self.calls += 1
+
+    def merge(self, other):
+        self.wall_seconds += other.wall_seconds
+        self.cpu_seconds += other.cpu_seconds
+        self.calls += other.calls
+        self.add_memory(other.peak_rss_mb, other.traced_peak_mb, other.top_allocations)
+
+    def add_memory(self, peak_rss_mb, traced_peak_mb=None, top_allocations=None):
+        if peak_rss_mb is not None:
+            self.peak_rss_mb = max(self.peak_rss_mb or 0.0, peak_rss_mb)
+        if traced_peak_mb is not None and traced_peak_mb >= (self.traced_peak_mb or 0.0):
+            self.traced_peak_mb = traced_peak_mb
+            self.top_allocations = top_allocations
+
+    def as_dict(self):
+        timing = {
+            "wall_seconds": round(self.wall_seconds, 6),
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "calls": self.calls,
+        }
+        if self.peak_rss_mb is not None:
+            timing["peak_rss_mb"] = round(self.peak_rss_mb, 1)
+        if self.traced_peak_mb is not None:
+            timing["traced_peak_mb"] = round(self.traced_peak_mb, 1)
+            timing["top_allocations"] = self.top_allocations
+        return timing
+
+#! <%GTREE 3 Instrumentation Class%>
+class Instrumentation:
+    #! <%GTREE 3.1 Initialization%>
+    def __init__(self, trace_memory=False):
+        """
+        :param trace_memory: Also trace the stages with tracemalloc (slow).
+        """
+        self.stages = {}
+        self.sheets = {}
+        self.counters = Counter()
+        self.trace_memory = trace_memory
+        self._started_tracing = False
+        # running peak of the traced memory of every open stage, innermost last
+        self._traced_peaks = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _context(self):
+        if not hasattr(self._local, "stages"):
+            self._local.stages = []
+            self._local.sheets = []
+        return self._local
+
+    #! <%GTREE 3.2 Timed contexts%>
+    @contextmanager
+    def stage(self, name):
+        """Time a stage of the run (e.g. "load_inputs")."""
+        context = self._context()
+        context.stages.append(name)
+        if self.trace_memory:
+            self._start_traced_stage()
+        started_wall, started_cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall_seconds, cpu_seconds = time.perf_counter() - started_wall, time.thread_time() - started_cpu
+            context.stages.pop()
+            traced_peak_mb, top_allocations = self._end_traced_stage() if self.trace_memory else (None, None)
+            with self._lock:
+                timing = self.stages.setdefault(name, Timing())
+                timing.add(wall_seconds, cpu_seconds)
+                timing.add_memory(peak_rss_mb(), traced_peak_mb, top_allocations)
+
+    @contextmanager
+    def sheet(self, sheetname, stage=None):
+        """
+        Time the work on one sheet within the current stage.
+
+        :param stage: Stage to record under (default: the innermost stage of this thread).
+        """
+        context = self._context()
+        stage = stage or (context.stages[-1] if context.stages else None)
+        if (stage, sheetname) in context.sheets:
+            # already timed by a surrounding context
+            yield
+            return
+        context.sheets.append((stage, sheetname))
+        started_wall, started_cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall_seconds, cpu_seconds = time.perf_counter() - started_wall, time.thread_time() - started_cpu
+            context.sheets.pop()
+            with self._lock:
+                self.sheets.setdefault(stage, {}).setdefault(sheetname, Timing()).add(wall_seconds, cpu_seconds)
+
+    #! <%GTREE 3.3 Memory tracing%>
+    def _start_traced_stage(self):
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            if self._traced_peaks:
+                # keep the peak of the surrounding stage before the peak is reset for this one
+                self._traced_peaks[-1] = max(self._traced_peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self._traced_peaks.append(0)
+
+    def _end_traced_stage(self):
+        with self._lock:
+            traced_peak = max(self._traced_peaks.pop(), tracemalloc.get_traced_memory()[1])
+            if self._traced_peaks:
+                self._traced_peaks[-1] = max(self._traced_peaks[-1], traced_peak)
+        statistics = tracemalloc.take_snapshot().statistics("lineno")[:TOP_ALLOCATIONS]
+        top_allocations = [
+            {"location": f"{statistic.traceback[0].filename}:{statistic.traceback[0].lineno}",
+             "size_mb": round(statistic.size / MEGABYTE, 2)}
+            for statistic in statistics
+        ]
+        return traced_peak / MEGABYTE, top_allocations
+
+    def close(self):
+        """Stop tracemalloc if this instrumentation started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    #! <%GTREE 3.4 Counters%>
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def merge(self, sheets, counters):
+        """
+        Add the sheet timings and counters recorded by another Instrumentation,
+        e.g. in a worker thread or process (its stage timings are not added:
+        they overlap with the stage that waited for the worker).
+
+        :param sheets: Its `sheets` dictionary {stage: {sheet: Timing}}.
+        :param counters: Its counters.
+        """
+        with self._lock:
+            for stage, stage_sheets in sheets.items():
+                for sheetname, timing in stage_sheets.items():
+                    self.sheets.setdefault(stage, {}).setdefault(sheetname, Timing()).merge(timing)
+            self.counters.update(counters)
+
+    #! <%GTREE 3.5 Report%>
+    def report(self):
+        """
+        :return: Dictionary {"stages": {stage: {..., "sheets": {sheet: {...}}}}, "counters": {...},
+                 "memory": {"peak_rss_mb": ...}}.
+        """
+        with self._lock:
+            stages = {}
+            for name, timing in self.stages.items():
+                stages[name] = timing.as_dict()
+                if name in self.sheets:
+                    stages[name]["sheets"] = {sheet: sheet_timing.as_dict() for sheet, sheet_timing in self.sheets[name].items()}
+            if None in self.sheets:
+                stages["(no stage)"] = {"sheets": {sheet: timing.as_dict() for sheet, timing in self.sheets[None].items()}}
+            peak_rss = peak_rss_mb()
+            memory = {"peak_rss_mb": None if peak_rss is None else round(peak_rss, 1)}
+            traced_peaks = [timing.traced_peak_mb for timing in self.stages.values() if timing.traced_peak_mb is not None]
+            if traced_peaks:
+                memory["traced_peak_mb"] = round(max(traced_peaks), 1)
+            return {"stages": stages, "counters": dict(self.counters), "memory": memory}
+
+#! <%GTREE 4 No-op instrumentation%>
+class NullInstrumentation:
+    """Instrumentation that records nothing."""
+    @contextmanager
+    def stage(self, name):
+        yield
+
+    @contextmanager
+    def sheet(self, sheetname, stage=None):
+        yield
+
+    def count(self, name, amount=1):
+        pass
+
+    def close(self):
+        pass
+
+    def report(self):
+        return {"stages": {}, "counters": {}, "memory": {}}
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+def instrumentation_of(workbook):
+    """
+    :return: The instrumentation attached to a WorkbookSession, or NULL_INSTRUMENTATION.
+    """
+    return getattr(workbook, "instrumentation", None) or NULL_INSTRUMENTATION
+
+#! <%GTREE 5 Stage decorator%>
+def timed_stage(name):
+    """
+    Method decorator that times the method as a stage with self.instrumentation
+    (if the instance has one).
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            instrumentation = getattr(self, "instrumentation", None) or NULL_INSTRUMENTATION
+            with instrumentation.stage(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+#============================   End Of File   ================================
@@ -0,0 +1,183 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : json_writer.py
+# Author    : ForesightInitiative
+# Version   : 1.1.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Incremental writer for OIMS JSON documents.
+
+The outer levels of the document ({"OIMS": {"OIMS_header": ..., "OIMS_content": [...]}})
+are written piece by piece: OIMS_header first, then the OIMS_content objects
+one at a time. OIMS_content (or any other value at those levels) may be a
+generator, so a mapper can yield content objects without the complete tree
+ever being held in memory.
+
+Modes:
+- pretty (default): byte-identical to json.dump(data, file, indent=4)
+- compact: no indentation or spaces, much smaller files
+
+stream_depth sets how many levels are written piece by piece. The default
+streams down to the content objects; a deeper level (LOW_MEMORY_STREAM_DEPTH)
+also streams the properties and the "metadata" entity lists of a content
+object, so no large JSON string is built (low-memory mode). The output is
+the same at every depth.
+
+Encoders:
+- "json":   the standard library encoder (default)
+- "orjson": the faster orjson encoder if it is installed. It is only used in
+            compact mode, pretty mode always uses the standard library to keep
+            the output byte-identical.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the streaming JSON writer.
+- Version 1.1.0: Configurable stream depth for the low-memory mode.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+#! <%GTREE 1.1 Load standard python Libraries%>
+import datetime
+import json
+import os
+
+#! <%GTREE 1.2 Load OIMS converter tool libraries%>
+from utils.logger import get_logger
+
+#! <%GTREE 1.3 Optional faster encoder%>
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = get_logger("OimsJsonWriter")
+
+# levels of the document that are streamed element by element (0 = the root object)
+STREAM_DEPTH = 2
+# also stream content object properties and their "metadata" lists, entity by entity
+LOW_MEMORY_STREAM_DEPTH = 5
+INDENT = 4
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+#! <%GTREE 2 Helpers%>
+def json_default(value):
+    """
+    Serialize values json does not know: NumPy scalars and arrays, pandas
+    Timestamps and dates.
+    """
+    if hasattr(value, "item") and callable(value.item) and getattr(value, "ndim", 0) == 0:
+        return value.item()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _is_stream(value):
+    """True for lists, tuples and generators/iterators (but not strings or dicts)."""
+    if isinstance(value, (list, tuple)):
+        return True
+    return hasattr(value, "__next__")
+
+#! <%GTREE 3 OimsJsonWriter Class%>
+class OimsJsonWriter:
+    #! <%GTREE 3.1 Initialization%>
+    def __init__(self, output_path, compact=False, encoder="json", stream_depth=STREAM_DEPTH):
+        """
+        :param output_path: Path of the JSON file to write.
+        :param compact: Write without indentation and spaces.
+        :param encoder: "json" (standard library) or "orjson" (compact mode, if installed).
+        :param stream_depth: Deepest level that is written piece by piece.
+        """
+        if encoder not in ("json", "orjson"):
+            raise ValueError(f"Unsupported JSON encoder '{encoder}'. Use 'json' or 'orjson'.")
+        self.output_path = output_path
+        self.compact = compact
+        self.stream_depth = stream_depth
+        self.use_orjson = compact and encoder == "orjson" and orjson is not None
+        if encoder == "orjson" and orjson is None:
+            logger.warning("orjson is not installed, using the standard json encoder.")
+
+        if compact:
+            self.item_separator, self.key_separator = ",", ":"
+        else:
+            self.item_separator, self.key_separator = ",", ": "
+
+    #! <%GTREE 3.2 Write a document%>
+    def write(self, data):
+        """
+        Write a JSON document. Values at the outer levels may be generators.
+
+        :param data: Dictionary (e.g. {"OIMS": {...}}) to write.
+        :return: Number of bytes written.
+        """
+        with open(self.output_path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as json_file:
+            self._write_value(json_file, data, 0)
+        return os.path.getsize(self.output_path)
+
+    def write_document(self, oims_header, oims_content):
+        """
+        Write an OIMS document from its header and its content objects.
+
+        :param oims_header: OIMS_header dictionary.
+        :param oims_content: Iterable (e.g. a generator) of OIMS_content objects.
+        :return: Number of bytes written.
+        """
+        return self.write({"OIMS": {"OIMS_header": oims_header, "OIMS_content": oims_content}})
+
+    #! <%GTREE 3.3 Streaming encoder%>
+    def _encode(self, value, level):
+        """Encode a complete value in one call, indented for its level."""
+        if self.use_orjson:
+            return orjson.dumps(
+                value,
+                default=json_default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            ).decode("utf-8")
+        if self.compact:
+            return json.dumps(value, separators=(self.item_separator, self.key_separator), default=json_default)
+        encoded = json.dumps(value, indent=INDENT, default=json_default)
+        # strings escape their newlines, so every newline is structural
+        return encoded.replace("\n", "\n" + " " * (INDENT * level)) if level else encoded
+
+    def _newline(self, level):
+        return "" if self.compact else "\n" + " " * (INDENT * level)
+
+    def _write_value(self, json_file, value, level):
+        if level <= self.stream_depth and isinstance(value, dict) and all(isinstance(key, str) for key in value):
+            self._write_object(json_file, value, level)
+        elif (level <= self.stream_depth and _is_stream(value)) or (hasattr(value, "__next__") and not isinstance(value, dict)):
+            self._write_array(json_file, value, level)
+        else:
+            json_file.write(self._encode(value, level))
+
+    def _write_object(self, json_file, value, level):
+        if not value:
+            json_file.write("{}")
+            return
+        json_file.write("{")
+        first = True
+        for key, item in value.items():
+            if not first:
+                json_file.write(self.item_separator)
+            json_file.write(self._newline(level + 1))
+            json_file.write(json.dumps(key) + self.key_separator)
+            self._write_value(json_file, item, level + 1)
+            first = False
+        json_file.write(self._newline(level) + "}")
+
+    def _write_array(self, json_file, value, level):
+        first = True
+        for item in value:
+            json_file.write("[" if first else self.item_separator)
+            json_file.write(self._newline(level + 1))
+            self._write_value(json_file, item, level + 1)
+            first = False
+        json_file.write("[]" if first else self._newline(level) + "]")
+
+#============================   End Of File   ================================
@@ -2,73 +2,312 @@
 #=============================================================================
 # File      : logger.py
 # Author    : Gideon Kruseman <gkruseman@gmail.com>
-# Version   : 1.0.0
+# Version   : 2.1.2
 # Date      : 2024-12-06
-# Changed   : <date of changes relative to last version>
-# Changed by: <author of the changes>
+# Changed   : 2026-10-18
+# Changed by: ForesightInitiative
 # Remarks   :
 """
 Enhanced logger utility with file logging, dynamic configuration, and multi-level support.
+
+All converter loggers live below the "oims_converter" logger (get_logger).
+Records are put on a queue by a QueueHandler and written by the handlers of
+a QueueListener thread, so formatting and console/file I/O never run on the
+conversion thread.
+
+    configure_logging(log_file="convert_metadata_log.txt", json_format=True,
+                      sampling={"WARNING": 10})
+    logger = get_logger("MetadataConverter")
+    with log_context(run_id="3f2a...", workbook="template.xlsx"):
+        with log_context(sheet="Variables"):
+            logger.warning("Unknown value in row %s", row)
+
+- log_context(): run, workbook and sheet ids are added to every record logged
+  inside the context (per thread / per task, using contextvars).
+- json_format: one JSON object per line with time, level, logger, message,
+  process and the context ids; otherwise the text format with the ids appended.
+- sampling: {level: N} lets 1 of every N records of the same logging call
+  (logger, level, source file and line) through, for messages logged per
+  row. The messages of one call are counted together however they are
+  formatted, and the counts stay bounded by the number of logging calls.
+- Worker processes (batch pool): the parent opens process_logging() and passes
+  the queue to the workers, which call configure_logging(log_queue=queue). Only
+  the parent writes to the console and the log file.
+
+SetupLogger keeps the former interface; the first one configures logging
+with its arguments if nothing is configured yet. Its records carry the source
+file and line of the caller, so sampling keeps the call sites apart.
 """
 # version history information   :
 """
 - Version 1.0.0: Initial implementation of the logger utility.
 - version 1.0.0.1  2024-12-10 Added file logging, configurable logger names, and enhanced format.
-
+- Version 2.0.0: Queue-based non-blocking handlers, JSON log lines with run/workbook/sheet
+                 ids, per-level sampling, logging from worker processes; critical() logs its message.
+- Version 2.1.0: current_log_context() to carry the context ids over to pool workers.
+- Version 2.1.1: Sampling counts per logging call instead of per message text.
+- Version 2.1.2: SetupLogger records carry the caller's source file and line.
 """
 #=============================================================================
 #<%/REGION File header%>
 
 #! <%GTREE 1 Initialization%>
+import atexit
+import contextvars
+import datetime
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+LOGGER_NAME = "oims_converter"
+DEFAULT_LOG_FILE = "convert_metadata_log.txt"
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+CONTEXT_FIELDS = ("run_id", "workbook", "sheet")
+
+_log_context = contextvars.ContextVar("oims_log_context", default={})
+_lock = threading.Lock()
+# process-wide logging state, see configure_logging
+_state = {"configured_pid": None, "listener": None, "handlers": []}
+
+#! <%GTREE 2 Context ids%>
+@contextmanager
+def log_context(**fields):
+    """
+    Add fields (e.g. run_id, workbook, sheet) to every record logged inside the context.
+    """
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+def current_log_context():
+    """
+    :return: The fields of the current log context; pass them to log_context()
+             in a worker thread or process, which does not inherit them.
+    """
+    return dict(_log_context.get())
+
+class ContextFilter(logging.Filter):
+    """Copy the context ids onto the record (runs in the thread that logs, before the record is queued)."""
+    def filter(self, record):
+        for name, value in _log_context.get().items():
+            if not hasattr(record, name):
+                setattr(record, name, value)
+        return True
+
+#! <%GTREE 3 Sampling%>
+class SamplingFilter(logging.Filter):
+    """
+    Let 1 of every N records through per logging call (logger, level,
+    source file and line). The first record of a call is always logged.
+    """
+    def __init__(self, sampling):
+        """
+        :param sampling: Dictionary {level name or number: N}.
+        """
+        super().__init__()
+        self.rates = {
+            (logging.getLevelName(level) if isinstance(level, str) else level): int(rate)
+            for level, rate in sampling.items()
+        }
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        rate = self.rates.get(record.levelno)
+        if not rate or rate <= 1:
+            return True
+        # the call site, not record.msg: f-string messages differ on every call
+        key = (record.name, record.levelno, record.pathname, record.lineno)
+        with self._lock:
+            count = self.counts[key]
+            self.counts[key] += 1
+        return count % rate == 0
+
+#! <%GTREE 4 Formatters%>
+class TextFormatter(logging.Formatter):
+    """The text format of the converter with the context ids appended."""
+    def __init__(self):
+        super().__init__(TEXT_FORMAT)
+
+    def format(self, record):
+        line = super().format(record)
+        context = [f"{name}={getattr(record, name)}" for name in CONTEXT_FIELDS if getattr(record, name, None) is not None]
+        return f"{line} [{', '.join(context)}]" if context else line
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record."""
+    def format(self, record):
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+        }
+        for name in CONTEXT_FIELDS:
+            if getattr(record, name, None) is not None:
+                entry[name] = getattr(record, name)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+#! <%GTREE 5 Configuration%>
+def _output_handlers(log_file, json_format, console):
+    formatter = JsonFormatter() if json_format else TextFormatter()
+    handlers = []
+    if console:
+        handlers.append(logging.StreamHandler())
+    if log_file:
+        log_dir = os.path.dirname(log_file)
+        if log_dir:  # Ensure the directory part is not empty
+            os.makedirs(log_dir, exist_ok=True)
+        handlers.append(logging.FileHandler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+def configure_logging(log_file=DEFAULT_LOG_FILE, level=logging.INFO, json_format=False, console=True,
+                      sampling=None, log_queue=None):
+    """
+    (Re)configure the converter logging of this process.
+
+    :param log_file: Path of the log file (None: no file).
+    :param level: Logging level (number or name, e.g. "DEBUG").
+    :param json_format: Write JSON log lines instead of text.
+    :param console: Also log to the console (stderr).
+    :param sampling: Optional dictionary {level: N}, see SamplingFilter.
+    :param log_queue: Queue of a parent process (process_logging); the records
+                      are then written by the parent and log_file, json_format
+                      and console are ignored.
+    """
+    with _lock:
+        _stop_listener()
+        if log_queue is None:
+            log_queue = queue.SimpleQueue()
+            _state["handlers"] = _output_handlers(log_file, json_format, console)
+            listener = logging.handlers.QueueListener(log_queue, *_state["handlers"], respect_handler_level=True)
+            listener.start()
+            _state["listener"] = listener
+        else:
+            _state["handlers"] = []
+
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(ContextFilter())
+        if sampling:
+            queue_handler.addFilter(SamplingFilter(sampling))
+
+        logger = logging.getLogger(LOGGER_NAME)
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        logger.addHandler(queue_handler)
+        logger.setLevel(logging.getLevelName(level) if isinstance(level, str) else level)
+        logger.propagate = False
+        _state["configured_pid"] = os.getpid()
+
+def is_configured():
+    """:return: True if logging was configured in this process."""
+    return _state["configured_pid"] == os.getpid()
+
+def _stop_listener():
+    listener = _state["listener"]
+    _state["listener"] = None
+    # a forked worker inherits the state of its parent, but not the listener thread
+    if listener is not None and _state["configured_pid"] == os.getpid():
+        listener.stop()
+        for handler in _state["handlers"]:
+            handler.close()
+
+def shutdown_logging():
+    """Write the queued records and stop the listener thread."""
+    with _lock:
+        _stop_listener()
+        _state["configured_pid"] = None
+
+atexit.register(shutdown_logging)
+
+def logging_options(settings):
+    """
+    :param settings: Settings dictionary ("log_file", "log_level", "log_format", "log_sampling").
+    :return: Keyword arguments for configure_logging / SetupLogger.
+    """
+    return {
+        "log_file": settings.get("log_file", DEFAULT_LOG_FILE),
+        "level": settings.get("log_level", "INFO"),
+        "json_format": settings.get("log_format", "text") == "json",
+        "sampling": settings.get("log_sampling"),
+    }
+
+#! <%GTREE 5.1 Worker processes%>
+@contextmanager
+def process_logging():
+    """
+    Queue for worker processes. Records the workers put on it (after
+    configure_logging(log_queue=queue) in the worker) are written by the
+    handlers of this process.
+
+    :return: Context manager yielding a multiprocessing queue.
+    """
+    import multiprocessing
+
+    if not is_configured():
+        configure_logging()
+    log_queue = multiprocessing.Queue()
+    listener = logging.handlers.QueueListener(log_queue, *_state["handlers"], respect_handler_level=True)
+    listener.start()
+    try:
+        yield log_queue
+    finally:
+        listener.stop()
+        log_queue.close()
+
+#! <%GTREE 6 Loggers%>
+def get_logger(name):
+    """
+    :param name: Component name, e.g. "MetadataConverter".
+    :return: The logger "oims_converter.<name>".
+    """
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
 
-#! <%GTREE 2 Logger Setup%>
 class SetupLogger:
-    def __init__(self, name="MetadataConverter", log_file="convert_metadata_log.txt", level=logging.INFO):
+    def __init__(self, name="MetadataConverter", log_file=DEFAULT_LOG_FILE, level=logging.INFO,
+                 json_format=False, sampling=None):
         """
-        Initialize a logger with both console and optional file handlers.
+        Logger of a component; configures the converter logging with these
+        arguments if it is not configured in this process yet.
 
         :param name: Name of the logger (default: "MetadataConverter").
         :param log_file: Path to a file where logs will be saved (default: "convert_metadata_log.txt").
         :param level: Logging level (default: logging.INFO).
+        :param json_format: Write JSON log lines.
+        :param sampling: Optional dictionary {level: N}, see SamplingFilter.
         """
-        self.logger = logging.getLogger(name)
-        self.logger.setLevel(level)
-
-        # Prevent duplicate handlers if logger is already configured
-        if not self.logger.handlers:
-            # Console handler
-            console_handler = logging.StreamHandler()
-            console_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            console_handler.setFormatter(console_formatter)
-            self.logger.addHandler(console_handler)
-
-            # File handler
-            if log_file:
-                log_dir = os.path.dirname(log_file)
-                if log_dir:  # Ensure the directory part is not empty
-                    os.makedirs(log_dir, exist_ok=True)
-                file_handler = logging.FileHandler(log_file)
-                file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-                file_handler.setFormatter(file_formatter)
-                self.logger.addHandler(file_handler)
-
-    def info(self, message):
-        self.logger.info(message)
-
-    def error(self, message):
-        self.logger.error(message)
+        if not is_configured():
+            configure_logging(log_file=log_file, level=level, json_format=json_format, sampling=sampling)
+        self.logger = get_logger(name)
 
-    def debug(self, message):
-        self.logger.debug(message)
+    # stacklevel=2: the record names the caller, not this wrapper (see SamplingFilter)
+    def info(self, message, *args):
+        self.logger.info(message, *args, stacklevel=2)
 
-    def warning(self, message):
-        self.logger.warning(message)
+    def error(self, message, *args):
+        self.logger.error(message, *args, stacklevel=2)
 
-    def critical(self, message):
-        self.logger.critical()
+    def debug(self, message, *args):
+        self.logger.debug(message, *args, stacklevel=2)
 
+    def warning(self, message, *args):
+        self.logger.warning(message, *args, stacklevel=2)
 
+    def critical(self, message, *args):
+        self.logger.critical(message, *args, stacklevel=2)
 
-#============================   End Of File   ================================
\ No newline at end of file
+#============================   End Of File   ================================
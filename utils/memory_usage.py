@@ -0,0 +1,99 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : memory_usage.py
+# Author    : ForesightInitiative
+# Version   : 1.0.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Process memory measurements and the memory estimate of a workbook, used by
+the run instrumentation and by the "max_memory_mb" budget of MetadataConverter.
+
+    - peak_rss_mb():    high-water mark of the resident set size of the process
+    - current_rss_mb(): current resident set size
+    - estimate_workbook_mb(path): expected memory of converting a workbook with
+      whole-sheet DataFrames (parsed grids, output tree and encoded JSON)
+
+The resident set size is read with the standard library where the platform
+offers it (resource, /proc) and with psutil when that is installed; where
+neither is available the functions return None.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the memory measurements.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import os
+import sys
+import zipfile
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+MEGABYTE = 1024 * 1024
+# memory of a conversion with whole-sheet DataFrames per megabyte of
+# uncompressed sheet XML (measured on synthetic workbooks, see benchmarks/)
+WORKBOOK_MEMORY_FACTOR = 8
+# fallback for workbooks that are not zip packages (e.g. .xls) per megabyte of file
+FILE_MEMORY_FACTOR = 20
+
+#! <%GTREE 2 Resident set size%>
+def peak_rss_mb():
+    """
+    :return: Peak resident set size of the process in MB, or None if unknown.
+    """
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak / MEGABYTE if sys.platform == "darwin" else peak / 1024
+    if psutil is not None:
+        memory_info = psutil.Process().memory_info()
+        # peak_wset on Windows
+        return getattr(memory_info, "peak_wset", memory_info.rss) / MEGABYTE
+    return None
+
+def current_rss_mb():
+    """
+    :return: Current resident set size of the process in MB, or None if unknown.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / MEGABYTE
+    except (OSError, ValueError, AttributeError, IndexError):
+        pass
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / MEGABYTE
+    return None
+
+#! <%GTREE 3 Workbook estimate%>
+def estimate_workbook_mb(workbook_path):
+    """
+    Estimate the memory a standard conversion of a workbook needs, from the
+    uncompressed size of its sheets and shared strings.
+
+    :param workbook_path: Path to the workbook.
+    :return: Estimated memory in MB.
+    """
+    try:
+        with zipfile.ZipFile(workbook_path) as archive:
+            xml_bytes = sum(
+                info.file_size for info in archive.infolist()
+                if info.filename.startswith("xl/worksheets/") or info.filename == "xl/sharedStrings.xml"
+            )
+        return xml_bytes * WORKBOOK_MEMORY_FACTOR / MEGABYTE
+    except zipfile.BadZipFile:
+        return os.path.getsize(workbook_path) * FILE_MEMORY_FACTOR / MEGABYTE
+
+#============================   End Of File   ================================
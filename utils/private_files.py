@@ -0,0 +1,49 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : private_files.py
+# Author    : ForesightInitiative
+# Version   : 1.0.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Ownership checks for cache folders that hold pickles.
+
+Loading a pickle runs code, so the sheet cache and the schema index snapshots
+only read pickles from folders (and files) that belong to the current user
+and that no one else can write to, and create their folders that way.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the ownership checks.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import os
+
+PRIVATE_DIR_MODE = 0o700
+
+#! <%GTREE 2 Checks%>
+def owned_by_user(path):
+    """
+    :param path: Path of a file or folder.
+    :return: True if path belongs to the current user and only the user can
+             write to it (always True on platforms without user ids).
+    :raises OSError: If path does not exist.
+    """
+    if not hasattr(os, "getuid"):
+        return True
+    path_stat = os.stat(path)
+    return path_stat.st_uid == os.getuid() and not path_stat.st_mode & 0o022
+
+def make_private_dir(path):
+    """
+    Create a folder (and its missing parents) that only the current user can
+    access. An existing folder is left as it is; check it with owned_by_user.
+    """
+    os.makedirs(path, mode=PRIVATE_DIR_MODE, exist_ok=True)
+
+#============================   End Of File   ================================
@@ -12,22 +12,70 @@
 # version history information   :
 """
 - Version 1.0.0: Initial implementation of the reporting utility.
+- Version 1.1.0: Machine-readable JSON run report with stage timings and counters.
+- Version 1.2.0: Peak memory per stage and the memory mode in the text report.
 """
 #=============================================================================
 #<%/REGION File header%>
 
 #! <%GTREE 1 Initialization%>
 import datetime
+import json
+import os
 
 #! <%GTREE 2 Reporter Class%>
 class Reporter:
     #! <%GTREE 2.1 Generate Report%>
     @staticmethod
-    def generate_report(report_path):
+    def generate_report(report_path, run_report=None):
+        """
+        Write the text report and, when a run report is given, its JSON
+        version next to it (see json_report_path).
+
+        :param report_path: Path of the text report.
+        :param run_report: Optional dictionary with the status, stage timings and counters of the run.
+        """
         try:
             with open(report_path, "w") as report_file:
                 report_file.write(f"Report generated on {datetime.datetime.now()}\n")
-                report_file.write("Conversion process completed successfully.\n")
+                if run_report is None or run_report.get("status") == "success":
+                    report_file.write("Conversion process completed successfully.\n")
+                else:
+                    report_file.write(f"Conversion process failed: {run_report.get('error')}\n")
+                if run_report is not None:
+                    for name, stage in run_report["stages"].items():
+                        if "wall_seconds" in stage:
+                            line = f"{name}: {stage['wall_seconds']:.3f} s wall, {stage['cpu_seconds']:.3f} s CPU"
+                            if stage.get("peak_rss_mb") is not None:
+                                line += f", peak RSS {stage['peak_rss_mb']:.1f} MB"
+                            if stage.get("traced_peak_mb") is not None:
+                                line += f", traced peak {stage['traced_peak_mb']:.1f} MB"
+                            report_file.write(line + "\n")
+                    memory = run_report.get("memory", {})
+                    if memory.get("mode"):
+                        report_file.write(f"memory mode: {memory['mode']}\n")
+                    for name, value in run_report["counters"].items():
+                        report_file.write(f"{name}: {value}\n")
+        except Exception as e:
+            raise IOError(f"Error writing report file: {e}")
+
+        if run_report is not None:
+            Reporter.generate_json_report(Reporter.json_report_path(report_path), run_report)
+
+    #! <%GTREE 2.2 JSON run report%>
+    @staticmethod
+    def json_report_path(report_path):
+        """
+        :return: Path of the JSON report for a text report ("report.txt" -> "report.json").
+        """
+        base, extension = os.path.splitext(report_path)
+        return report_path + ".json" if extension == ".json" else base + ".json"
+
+    @staticmethod
+    def generate_json_report(json_report_path, run_report):
+        try:
+            with open(json_report_path, "w", encoding="utf-8") as report_file:
+                json.dump(run_report, report_file, indent=4)
         except Exception as e:
             raise IOError(f"Error writing report file: {e}")
 
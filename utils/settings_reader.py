@@ -20,6 +20,47 @@ The standard settings file looks like this:
   "path_to_output_oims_metadata_file":"<path/to/oims/compatible/primary/metadata/file.json>"
 }
 
+Optional settings:
+  "mapping_cache_dir":          folder for compiled Excel mappings
+                                (default ~/.cache/oims_converter/mappings, null disables the cache)
+  "mapping_cache_max_entries":  maximum number of cached compiled mappings (default 64)
+  "schema_index_cache_dir":     folder for the compiled schema index snapshots
+                                (default ~/.cache/oims_converter/schemas, null disables the snapshots)
+  "sheet_cache_dir":            folder for the parsed sheets of the primary metadata workbooks, keyed
+                                by workbook hash, see utils/sheet_cache.py; it must belong to the
+                                user running the conversion (default null: no cache)
+  "sheet_cache_max_mb":         maximum total size of the parsed sheet cache (default 1024)
+  "resource_cache":             keep loaded schemas and mappings in the process-wide cache, keyed by
+                                id and file hash, see modules/resource_cache.py (default true)
+  "sheet_workers":              number of sheets validated and mapped at the same time (at most
+                                the number of CPUs), see modules/sheet_scheduler.py (default 1: one
+                                after the other; batch conversions always process them one by one)
+  "sheet_executor":             "process" (default) or "thread" pool for sheet_workers
+  "output_compact":             write the output JSON without indentation (default false)
+  "output_mode":                "single" (default): one JSON document; "jsonl" or "sharded": the
+                                output file holds OIMS_header and a manifest, the OIMS_content
+                                objects go to JSON Lines shard files, see utils/sharded_writer.py
+  "output_shards":              number of shard files in "sharded" mode (default 4)
+  "output_validation":          check the generated metadata against the requirement levels and data
+                                types of the schema (validators/output_validator.py): "report"
+                                (default) logs the violations and lists them in the run report,
+                                "strict" fails the run before the output is written, "off" skips it
+  "json_encoder":               "json" (default) or "orjson" (used in compact mode when installed)
+  "incremental_conversion":     only re-map the sheets that changed since the previous run,
+                                see modules/incremental_conversion.py (default false)
+  "max_memory_mb":              memory budget of a conversion; a workbook that is expected to
+                                exceed it is converted in low-memory mode: only the mapped cells
+                                are streamed from the workbook and the output is streamed while
+                                it is mapped (default: no budget)
+  "trace_memory":               trace every stage with tracemalloc and report its peak and largest
+                                allocation sites in the run report; slows the run down (default false)
+  "log_file":                   log file (default convert_metadata_log.txt, null: console only)
+  "log_level":                  "DEBUG", "INFO" (default), "WARNING", ...
+  "log_format":                 "text" (default) or "json" (one JSON object per line with the
+                                run id, workbook and sheet), see utils/logger.py
+  "log_sampling":               {"<level>": N} logs 1 of every N messages of the same kind at that
+                                level, e.g. {"WARNING": 100} for per-row warnings (default: all)
+
 """
 # version history information   :
 """
@@ -0,0 +1,187 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : sharded_writer.py
+# Author    : ForesightInitiative
+# Version   : 1.0.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Sharded output of OIMS documents for very large OIMS_content sections.
+
+The OIMS_content objects are written as JSON Lines (one compact JSON object
+per line) to one or more shard files next to the output file. The output
+file itself holds OIMS_header and a manifest:
+
+{
+    "OIMS": {"OIMS_header": {...}},
+    "OIMS_manifest": {
+        "format": "oims-sharded",
+        "format_version": 1,
+        "content_objects": 3,
+        "shards": [{"path": "out.content-00000.jsonl", "content_objects": 2, "bytes": 5120}, ...],
+        "index": [
+            {"shard": 0, "offset": 0, "length": 4096,
+             "OIMS_content_object": "DataQualityVariableLevel", "entity_class": "variable", "entities": 20000},
+            ...
+        ]
+    }
+}
+
+The index lists the content objects in document order. A consumer can read
+one content object without loading the rest: open the shard, seek to the
+offset and parse the `length` bytes (see read_content_object). The shard
+paths are relative to the folder of the output file.
+
+Modes (setting "output_mode"):
+- "single":  one JSON document (OimsJsonWriter, default)
+- "jsonl":   header file plus one JSON Lines file <name>.content.jsonl
+- "sharded": header file plus "output_shards" JSON Lines files
+             <name>.content-00000.jsonl, ...; each content object goes to the
+             shard with the fewest bytes so far, which keeps the shards even
+OIMS_content may be a generator (low-memory mode); the content objects are
+written as they are produced.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the sharded and JSON Lines output.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+#! <%GTREE 1.1 Load standard python Libraries%>
+import glob
+import json
+import os
+
+#! <%GTREE 1.2 Load OIMS converter tool libraries%>
+from utils.json_writer import OimsJsonWriter, json_default
+
+OUTPUT_MODES = ("single", "jsonl", "sharded")
+MANIFEST_FORMAT = "oims-sharded"
+MANIFEST_FORMAT_VERSION = 1
+DEFAULT_SHARDS = 4
+
+#! <%GTREE 2 Shard paths%>
+def shard_paths(output_path, shards, mode="sharded"):
+    """
+    :return: List with the paths of the shard files of an output file.
+    """
+    stem = os.path.splitext(output_path)[0]
+    if mode == "jsonl":
+        return [f"{stem}.content.jsonl"]
+    return [f"{stem}.content-{shard:05d}.jsonl" for shard in range(shards)]
+
+def _remove_stale_shards(output_path, keep):
+    stem = os.path.splitext(output_path)[0]
+    for path in glob.glob(glob.escape(stem) + ".content*.jsonl"):
+        if path not in keep:
+            os.remove(path)
+
+#! <%GTREE 3 ShardedOimsWriter Class%>
+class ShardedOimsWriter:
+    #! <%GTREE 3.1 Initialization%>
+    def __init__(self, output_path, mode="sharded", shards=DEFAULT_SHARDS, compact=False):
+        """
+        :param output_path: Path of the header and manifest file.
+        :param mode: "jsonl" (one shard) or "sharded".
+        :param shards: Number of shard files in "sharded" mode.
+        :param compact: Write the header file without indentation.
+        """
+        if mode not in ("jsonl", "sharded"):
+            raise ValueError(f"Unsupported sharded output mode '{mode}'. Use 'jsonl' or 'sharded'.")
+        if mode == "sharded" and (not isinstance(shards, int) or shards < 1):
+            raise ValueError(f"output_shards must be a positive integer, got {shards!r}.")
+        self.output_path = output_path
+        self.mode = mode
+        self.shards = 1 if mode == "jsonl" else shards
+        self.compact = compact
+
+    #! <%GTREE 3.2 Write a document%>
+    def write(self, data):
+        """
+        Write the content objects to the shards, then the header and manifest.
+
+        :param data: OIMS document dictionary ({"OIMS": {"OIMS_header": ..., "OIMS_content": ...}}).
+        :return: Number of bytes written (header file and shards).
+        """
+        oims = data["OIMS"]
+        paths = shard_paths(self.output_path, self.shards, self.mode)
+        _remove_stale_shards(self.output_path, paths)
+
+        index = []
+        shard_bytes = [0] * self.shards
+        shard_counts = [0] * self.shards
+        shard_files = [open(path, "wb") for path in paths]
+        try:
+            for content_object in oims.get("OIMS_content", []):
+                line = (json.dumps(content_object, separators=(",", ":"), default=json_default) + "\n").encode("utf-8")
+                shard = shard_bytes.index(min(shard_bytes))
+                shard_files[shard].write(line)
+                index.append(self.index_entry(content_object, shard, shard_bytes[shard], len(line)))
+                shard_bytes[shard] += len(line)
+                shard_counts[shard] += 1
+        finally:
+            for shard_file in shard_files:
+                shard_file.close()
+
+        manifest = {
+            "format": MANIFEST_FORMAT,
+            "format_version": MANIFEST_FORMAT_VERSION,
+            "content_objects": len(index),
+            "shards": [
+                {"path": os.path.basename(path), "content_objects": count, "bytes": size}
+                for path, count, size in zip(paths, shard_counts, shard_bytes)
+            ],
+            "index": index,
+        }
+        header_document = {"OIMS": {"OIMS_header": oims["OIMS_header"]}, "OIMS_manifest": manifest}
+        header_bytes = OimsJsonWriter(self.output_path, compact=self.compact).write(header_document)
+        return header_bytes + sum(shard_bytes)
+
+    @staticmethod
+    def index_entry(content_object, shard, offset, length):
+        properties = content_object.get("OIMS_content_object_properties", {})
+        entry = {
+            "shard": shard,
+            "offset": offset,
+            "length": length,
+            "OIMS_content_object": content_object.get("OIMS_content_object"),
+            "entity_class": properties.get("entity_class"),
+        }
+        if isinstance(properties.get("metadata"), list):
+            entry["entities"] = len(properties["metadata"])
+        return entry
+
+#! <%GTREE 4 Reading sharded output%>
+def read_manifest(output_path):
+    """
+    :param output_path: Path of the header and manifest file.
+    :return: Tuple (OIMS_header, OIMS_manifest).
+    :raises ValueError: If the file is not a sharded OIMS output.
+    """
+    with open(output_path, "r", encoding="utf-8") as header_file:
+        document = json.load(header_file)
+    manifest = document.get("OIMS_manifest")
+    if not manifest or manifest.get("format") != MANIFEST_FORMAT:
+        raise ValueError(f"'{output_path}' is not a sharded OIMS output.")
+    return document["OIMS"]["OIMS_header"], manifest
+
+def read_content_object(output_path, manifest, position):
+    """
+    Read one content object by seeking into its shard.
+
+    :param output_path: Path of the header and manifest file.
+    :param manifest: OIMS_manifest from read_manifest.
+    :param position: Position of the content object in the document (index entry).
+    :return: The content object dictionary.
+    """
+    entry = manifest["index"][position]
+    shard_path = os.path.join(os.path.dirname(output_path), manifest["shards"][entry["shard"]]["path"])
+    with open(shard_path, "rb") as shard_file:
+        shard_file.seek(entry["offset"])
+        return json.loads(shard_file.read(entry["length"]))
+
+#============================   End Of File   ================================
@@ -0,0 +1,328 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : sheet_cache.py
+# Author    : ForesightInitiative
+# Version   : 1.1.1
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+On-disk cache of parsed primary metadata sheets.
+
+Parsing a sheet with openpyxl is the most expensive step of a conversion, and
+the same unchanged workbooks are read again and again (re-runs, validation,
+reprocessing an archive after a mapping change). With the setting
+"sheet_cache_dir", ExcelReader stores every sheet it parses in the cache and
+later runs load the frame from the cache instead of opening the workbook.
+The cache is off unless a folder is configured.
+
+A workbook is cached under a key derived from its bytes, the cache format
+version and the pandas version (the parsed frame depends on it):
+
+    <cache_dir>/<key>/sheet_names.json
+    <cache_dir>/<key>/<digest of sheet name and parse options>.arrow | .pickle
+    <cache_dir>/size                        running total of the cached bytes
+
+Frames are written as Arrow IPC files when pyarrow is installed and loaded
+memory-mapped. Only frames whose columns Arrow stores exactly are written as
+Arrow: numbers, booleans, dates and pandas string columns. Other frames (e.g.
+raw cell grids with object columns that mix text, numbers and dates), and all
+frames when pyarrow is missing, are stored as pickles, which keep the frame as
+is.
+
+Pickles run code when they are loaded, so the cache is only used if the cache
+folder, the workbook folder and the pickle belong to the current user and no
+one else can write to them. The folders are created that way.
+
+Every file is written to a temporary file and renamed, so parallel sheet
+workers can fill the same workbook entry. The size of every write is added to
+the running total; only when the total exceeds the limit are the folders
+scanned and the least recently used workbooks evicted, down to 90% of the
+limit. Concurrent writers can miss an addition to the total; the scan corrects it.
+Failures to read or write the cache are not fatal: the sheet is parsed from
+the workbook.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the parsed sheet cache.
+- Version 1.1.0: Opt-in cache folder owned by the user; running size total
+                 instead of a folder scan per write; Arrow eligibility is
+                 decided from the dtypes instead of reading the file back.
+- Version 1.1.1: Ownership checks shared with the schema index (utils/private_files.py).
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+#! <%GTREE 1.1 Load standard python Libraries%>
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+
+#! <%GTREE 1.2 Load OIMS converter tool libraries%>
+from utils.logger import get_logger
+from utils.private_files import make_private_dir, owned_by_user
+
+logger = get_logger("SheetCache")
+
+#! <%GTREE 1.3 Defaults%>
+DEFAULT_MAX_MB = 1024
+# eviction frees the cache down to this share of the limit
+EVICTION_LOW_WATER = 0.9
+# part of the key: entries written by an older layout are not read
+CACHE_FORMAT_VERSION = 1
+SHEET_NAMES_FILE = "sheet_names.json"
+SIZE_FILE = "size"
+SHEET_FORMATS = ("arrow", "pickle")
+
+#! <%GTREE 1.4 Optional Arrow support%>
+def _pyarrow():
+    """
+    :return: The pyarrow module, or None if it is not installed.
+    """
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError:
+        return None
+    return pyarrow
+
+def arrow_compatible(frame):
+    """
+    :return: True if Arrow stores the frame with the same values, dtypes and
+             labels: every column is numeric, boolean, a date or a pandas
+             string column, and the labels are all text or all integers.
+    """
+    import pandas as pd
+
+    labels = list(frame.columns)
+    if not (all(isinstance(label, str) for label in labels) or all(isinstance(label, int) for label in labels)):
+        return False
+    for _, column in frame.items():
+        # object columns come back from Arrow with a different dtype (or fail to convert)
+        if not (column.dtype.kind in "biufM" or isinstance(column.dtype, pd.StringDtype)):
+            return False
+    return True
+
+#! <%GTREE 2 SheetCache Class%>
+class SheetCache:
+    #! <%GTREE 2.1 Initialization%>
+    def __init__(self, cache_dir, max_mb=DEFAULT_MAX_MB):
+        """
+        :param cache_dir: Folder that holds the cached sheets.
+        :param max_mb: Maximum total size of the cache in megabytes.
+        """
+        self.cache_dir = cache_dir
+        self.max_mb = max_mb
+        self._untrusted_logged = False
+
+    #! <%GTREE 2.2 Cache key%>
+    @staticmethod
+    def key(workbook_path):
+        """
+        Build the cache key of a workbook from its bytes, the cache format
+        version and the pandas version.
+
+        :param workbook_path: Path to the MS Excel workbook.
+        :return: Hexadecimal SHA-256 digest.
+        """
+        import pandas as pd
+
+        digest = hashlib.sha256(f"{CACHE_FORMAT_VERSION}\0{pd.__version__}\0".encode("utf-8"))
+        with open(workbook_path, "rb") as workbook_file:
+            for block in iter(lambda: workbook_file.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    @staticmethod
+    def _sheet_stem(sheetname, parse_options):
+        """
+        :return: File name (without extension) of a sheet parsed with the given options.
+        """
+        return hashlib.sha1(repr((sheetname, sorted(parse_options.items()))).encode("utf-8")).hexdigest()
+
+    def _trusted(self, *paths):
+        """
+        :return: True if the cache folder and the given paths are owned by the
+                 current user; logs once when they are not.
+        """
+        try:
+            if all(owned_by_user(path) for path in (self.cache_dir,) + paths):
+                return True
+        except OSError:
+            return False
+        if not self._untrusted_logged:
+            logger.warning("Sheet cache '%s' is not owned by the current user or writable by others; not using it.", self.cache_dir)
+            self._untrusted_logged = True
+        return False
+
+    #! <%GTREE 2.3 Lookup%>
+    def sheet_names(self, key):
+        """
+        :param key: Cache key of the workbook.
+        :return: List with the sheet names of the workbook, or None on a miss.
+        """
+        entry_dir = self._entry_dir(key)
+        if not os.path.isdir(entry_dir) or not self._trusted(entry_dir):
+            return None
+        try:
+            with open(os.path.join(entry_dir, SHEET_NAMES_FILE), "r") as sheet_names_file:
+                return json.load(sheet_names_file)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, key, sheetname, parse_options):
+        """
+        :param key: Cache key of the workbook.
+        :param sheetname: Name of the sheet.
+        :param parse_options: Keyword arguments the sheet was parsed with.
+        :return: The cached DataFrame, or None on a miss.
+        """
+        entry_dir = self._entry_dir(key)
+        stem = self._sheet_stem(sheetname, parse_options)
+        for sheet_format in SHEET_FORMATS:
+            sheet_path = os.path.join(entry_dir, f"{stem}.{sheet_format}")
+            if not os.path.exists(sheet_path):
+                continue
+            if not self._trusted(entry_dir, sheet_path):
+                return None
+            try:
+                frame = self._read(sheet_path, sheet_format)
+            except Exception as e:
+                logger.warning("Could not read cached sheet '%s' (%s). Error: %s", sheetname, sheet_path, e)
+                return None
+            # mark the workbook as recently used for the eviction order
+            try:
+                os.utime(entry_dir)
+            except OSError:
+                pass
+            return frame
+        return None
+
+    @staticmethod
+    def _read(sheet_path, sheet_format):
+        if sheet_format == "arrow":
+            pyarrow = _pyarrow()
+            if pyarrow is None:
+                raise ImportError("pyarrow is not installed")
+            with pyarrow.memory_map(sheet_path, "r") as source:
+                return pyarrow.ipc.open_file(source).read_all().to_pandas()
+        with open(sheet_path, "rb") as sheet_file:
+            return pickle.load(sheet_file)
+
+    #! <%GTREE 2.4 Store%>
+    def put(self, key, sheet_names, sheetname, parse_options, frame):
+        """
+        Store a parsed sheet (and the sheet names of its workbook) and evict
+        old workbooks if the cache is full. Failures to write the cache are
+        not fatal.
+
+        :param key: Cache key of the workbook.
+        :param sheet_names: Sheet names of the workbook.
+        :param sheetname: Name of the sheet.
+        :param parse_options: Keyword arguments the sheet was parsed with.
+        :param frame: Parsed DataFrame.
+        :return: Format the sheet was stored in ("arrow" or "pickle"), or None.
+        """
+        entry_dir = self._entry_dir(key)
+        stem = self._sheet_stem(sheetname, parse_options)
+        try:
+            make_private_dir(self.cache_dir)
+            make_private_dir(entry_dir)
+            if not self._trusted(entry_dir):
+                return None
+            written = 0
+            if not os.path.exists(os.path.join(entry_dir, SHEET_NAMES_FILE)):
+                written += self._write(entry_dir, SHEET_NAMES_FILE, lambda target: target.write(json.dumps(list(sheet_names)).encode("utf-8")))
+            pyarrow = _pyarrow()
+            if pyarrow is not None and arrow_compatible(frame):
+                table = pyarrow.Table.from_pandas(frame, preserve_index=True)
+
+                def write_arrow(target):
+                    with pyarrow.ipc.new_file(target, table.schema) as writer:
+                        writer.write_table(table)
+
+                sheet_format = "arrow"
+                written += self._write(entry_dir, f"{stem}.arrow", write_arrow)
+            else:
+                sheet_format = "pickle"
+                written += self._write(entry_dir, f"{stem}.pickle", lambda target: pickle.dump(frame, target, protocol=pickle.HIGHEST_PROTOCOL))
+            if self._add_to_size(written) > self.max_mb * 1024 * 1024:
+                self.evict()
+            return sheet_format
+        except (OSError, TypeError, ValueError, pickle.PicklingError) as e:
+            logger.warning("Could not write the cache of sheet '%s'. Error: %s", sheetname, e)
+            return None
+
+    @staticmethod
+    def _write(directory, file_name, write):
+        """
+        Write a cache file through a temporary file in the same folder.
+
+        :param write: Function write(binary file).
+        :return: Size of the file in bytes.
+        """
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as target:
+                write(target)
+            size = os.path.getsize(temp_path)
+            os.replace(temp_path, os.path.join(directory, file_name))
+            return size
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    #! <%GTREE 2.5 Size-bounded eviction%>
+    def _read_size(self):
+        try:
+            with open(os.path.join(self.cache_dir, SIZE_FILE), "r") as size_file:
+                return int(size_file.read())
+        except (OSError, ValueError):
+            return 0
+
+    def _write_size(self, total_bytes):
+        self._write(self.cache_dir, SIZE_FILE, lambda target: target.write(str(total_bytes).encode("ascii")))
+
+    def _add_to_size(self, written):
+        """
+        :return: The running total of the cached bytes after adding written.
+        """
+        total_bytes = self._read_size() + written
+        self._write_size(total_bytes)
+        return total_bytes
+
+    def evict(self):
+        """
+        Scan the cache and remove the least recently used workbooks until it
+        is within EVICTION_LOW_WATER of its size limit. Resets the running
+        total to the size found.
+        """
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            try:
+                entry_mtime = entry.stat().st_mtime
+                entry_bytes = sum(item.stat().st_size for item in os.scandir(entry.path) if item.is_file())
+            except OSError:
+                continue
+            entries.append((entry_mtime, entry_bytes, entry.path))
+
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        # the most recently used workbook (the one being written) is kept
+        while len(entries) > 1 and total_bytes > EVICTION_LOW_WATER * self.max_mb * 1024 * 1024:
+            _, size, entry_dir = entries.pop(0)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_bytes -= size
+        self._write_size(total_bytes)
+
+#============================   End Of File   ================================
@@ -0,0 +1,142 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : sheet_fingerprint.py
+# Author    : ForesightInitiative
+# Version   : 1.1.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Per-sheet content fingerprints of an .xlsx workbook, read directly from the
+zip parts without parsing the cells.
+
+The fingerprint of a sheet is a digest of
+    - the sheet's XML part (xl/worksheets/sheetN.xml)
+    - the shared strings the sheet refers to (index and text), because a
+      string can change in xl/sharedStrings.xml while the sheet XML keeps
+      referring to the same index
+    - the styles part, because number formats decide whether a number is
+      read as a date
+A changed fingerprint means the sheet may read differently. Unchanged
+fingerprints mean the sheet reads exactly as before.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the sheet fingerprints.
+- Version 1.1.0: sheet_sizes() for scheduling the largest sheets first.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+import hashlib
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ElementTree
+
+SPREADSHEET_NAMESPACE = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+RELATIONSHIP_NAMESPACE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PACKAGE_RELATIONSHIP_NAMESPACE = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+# a cell with its attributes and (optional) body, e.g. <c r="A1" t="s"><v>4</v></c>
+CELL_PATTERN = re.compile(rb"<c\b([^>]*?)(?:/>|>(.*?)</c>)", re.DOTALL)
+SHARED_STRING_TYPE_PATTERN = re.compile(rb'\bt\s*=\s*["\']s["\']')
+VALUE_PATTERN = re.compile(rb"<v>\s*(\d+)\s*</v>")
+
+#! <%GTREE 2 Workbook structure%>
+def _sheet_parts(archive):
+    """
+    :return: Dictionary {sheet name: zip part name of the sheet XML}.
+    """
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    relationships = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {
+        relationship.get("Id"): relationship.get("Target")
+        for relationship in relationships.iter(f"{{{PACKAGE_RELATIONSHIP_NAMESPACE}}}Relationship")
+    }
+
+    sheet_parts = {}
+    for sheet in workbook.iter(f"{{{SPREADSHEET_NAMESPACE}}}sheet"):
+        target = targets.get(sheet.get(f"{{{RELATIONSHIP_NAMESPACE}}}id"))
+        if target is None:
+            continue
+        # targets are relative to xl/ unless they are absolute
+        part = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+        sheet_parts[sheet.get("name")] = part
+    return sheet_parts
+
+def _shared_strings(archive):
+    """
+    :return: List with the text of every shared string.
+    """
+    try:
+        shared_strings = ElementTree.fromstring(archive.read("xl/sharedStrings.xml"))
+    except KeyError:
+        return []
+    text_tag = f"{{{SPREADSHEET_NAMESPACE}}}t"
+    return [
+        "".join(text.text or "" for text in string_item.iter(text_tag))
+        for string_item in shared_strings.iter(f"{{{SPREADSHEET_NAMESPACE}}}si")
+    ]
+
+def _shared_string_indices(sheet_xml):
+    indices = set()
+    for attributes, body in CELL_PATTERN.findall(sheet_xml):
+        if body and SHARED_STRING_TYPE_PATTERN.search(attributes):
+            value = VALUE_PATTERN.search(body)
+            if value:
+                indices.add(int(value.group(1)))
+    return indices
+
+#! <%GTREE 3 Fingerprints%>
+def sheet_fingerprints(workbook_path):
+    """
+    Fingerprint every sheet of an .xlsx workbook.
+
+    :param workbook_path: Path to the .xlsx file.
+    :return: Dictionary {sheet name: hexadecimal digest}.
+    :raises ValueError: If the file is not an .xlsx (zip) workbook.
+    """
+    try:
+        archive = zipfile.ZipFile(workbook_path)
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Cannot fingerprint '{workbook_path}': {e}")
+
+    with archive:
+        try:
+            styles_digest = hashlib.sha256(archive.read("xl/styles.xml")).digest()
+        except KeyError:
+            styles_digest = b""
+        shared_strings = None
+
+        fingerprints = {}
+        for sheetname, part in _sheet_parts(archive).items():
+            sheet_xml = archive.read(part)
+            digest = hashlib.sha256(styles_digest)
+            digest.update(sheet_xml)
+
+            indices = _shared_string_indices(sheet_xml)
+            if indices:
+                if shared_strings is None:
+                    shared_strings = _shared_strings(archive)
+                for index in sorted(indices):
+                    text = shared_strings[index] if index < len(shared_strings) else ""
+                    digest.update(f"{index}\0{text}\0".encode("utf-8"))
+            fingerprints[sheetname] = digest.hexdigest()
+        return fingerprints
+
+def sheet_sizes(workbook_path):
+    """
+    :param workbook_path: Path to the .xlsx file.
+    :return: Dictionary {sheet name: uncompressed size of the sheet XML in bytes};
+             empty if the file is not an .xlsx (zip) workbook.
+    """
+    try:
+        with zipfile.ZipFile(workbook_path) as archive:
+            return {sheetname: archive.getinfo(part).file_size for sheetname, part in _sheet_parts(archive).items()}
+    except (zipfile.BadZipFile, KeyError, OSError, ElementTree.ParseError):
+        return {}
+
+#============================   End Of File   ================================
@@ -0,0 +1,130 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : workbook_session.py
+# Author    : ForesightInitiative
+# Version   : 1.3.0
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+A workbook session wraps the ExcelFile returned by ExcelReader and makes sure
+every sheet is parsed at most once per run. The parsed DataFrames are shared
+by the validators, the mapping converter and the mappers.
+
+The session exposes the same `sheet_names` / `parse()` interface as
+pandas.ExcelFile so it can be passed wherever an ExcelFile was used before.
+
+With max_frames the session keeps only the most recently parsed frames and
+releases the others (low-memory mode); a released sheet is parsed again
+when it is needed again.
+
+If the ExcelReader has a SheetCache, a sheet is loaded from the cache when
+the workbook was parsed before, and stored in it after it is parsed. The
+workbook itself is only opened for sheets that are not cached.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the memoizing workbook session.
+- Version 1.1.0: Carries the run instrumentation; sheet parses are timed and counted.
+- Version 1.2.0: Optional max_frames limit that releases the least recently used frames.
+- Version 1.3.0: Sheets and sheet names are read from the ExcelReader's SheetCache.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+#! <%GTREE 1.2 Load OIMS converter tool libraries%>
+from utils.excel_reader import ExcelReader
+from utils.instrumentation import instrumentation_of
+
+#! <%GTREE 2 WorkbookSession Class%>
+class WorkbookSession:
+    #! <%GTREE 2.1 Initialization%>
+    def __init__(self, file_path=None, excel_reader=None, instrumentation=None, max_frames=None):
+        """
+        Open a workbook session on top of an ExcelReader.
+
+        :param file_path: Path to the MS Excel workbook.
+        :param excel_reader: Optional ExcelReader instance (takes precedence over file_path).
+        :param instrumentation: Optional Instrumentation of the run (see utils/instrumentation.py).
+        :param max_frames: Optional maximum number of parsed frames to keep (default: all).
+        """
+        self.instrumentation = instrumentation
+        self.max_frames = max_frames
+        self.excel_reader = excel_reader or ExcelReader(file_path)
+        self.file_path = self.excel_reader.file_path
+        self._excel_file = None
+        self._frames = {}
+        self.hits = 0
+        self.misses = 0
+
+    #! <%GTREE 2.2 Lazy access to the underlying ExcelFile%>
+    @property
+    def excel_file(self):
+        if self._excel_file is None:
+            self._excel_file = self.excel_reader.read_excel()
+        return self._excel_file
+
+    @property
+    def sheet_names(self):
+        sheet_names = self.excel_reader.cached_sheet_names()
+        return self.excel_file.sheet_names if sheet_names is None else sheet_names
+
+    #! <%GTREE 2.3 Parse a sheet at most once%>
+    def parse(self, sheetname, **kwargs):
+        """
+        Return the parsed DataFrame for a sheet, parsing it on first access only.
+
+        Different parse options (e.g. header=None for the raw cell grid) are
+        memoized separately.
+
+        :param sheetname: Name of the sheet to parse.
+        :param kwargs: Extra keyword arguments passed on to ExcelFile.parse.
+        :return: pandas DataFrame with the sheet content.
+        """
+        key = (sheetname, tuple(sorted(kwargs.items())))
+        if key in self._frames:
+            self.hits += 1
+            # most recently used last
+            self._frames[key] = self._frames.pop(key)
+            return self._frames[key]
+
+        self.misses += 1
+        instrumentation = instrumentation_of(self)
+        with instrumentation.sheet(sheetname):
+            frame = self.excel_reader.cached_sheet(sheetname, kwargs)
+            if frame is None:
+                frame = self.excel_file.parse(sheetname, **kwargs)
+                self.excel_reader.cache_sheet(self.excel_file.sheet_names, sheetname, kwargs, frame)
+                instrumentation.count("sheets_parsed")
+            else:
+                instrumentation.count("sheets_from_cache")
+        instrumentation.count("rows_read", frame.shape[0])
+        instrumentation.count("cells_read", frame.size)
+        self._frames[key] = frame
+        if self.max_frames is not None:
+            while len(self._frames) > self.max_frames:
+                del self._frames[next(iter(self._frames))]
+                instrumentation.count("frames_released")
+        return frame
+
+    #! <%GTREE 2.4 Cache statistics%>
+    def stats(self):
+        """
+        :return: Dictionary with the number of cache hits, misses and parsed frames.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "parsed_frames": len(self._frames),
+        }
+
+    #! <%GTREE 2.5 Release resources%>
+    def close(self):
+        self._frames.clear()
+        if self._excel_file is not None:
+            self._excel_file.close()
+            self._excel_file = None
+
+#============================   End Of File   ================================
@@ -16,7 +16,6 @@
 """
 #=============================================================================
 #<%/REGION File header%>
-import pandas as pd  # Add this import at the top of the file
 
 class BaseValidators:
     @staticmethod
@@ -28,6 +27,8 @@ class BaseValidators:
         :param context: Contextual information for error messaging (optional).
         :raises ValueError: If a mandatory field is missing.
         """
+        import pandas as pd  # imported on first use to keep the CLI start-up fast
+
         missing_fields = [field for field in mandatory_fields if field not in data or pd.isna(data[field])]
         if missing_fields:
             raise ValueError(f"Missing mandatory fields in {context}: {missing_fields}")
@@ -0,0 +1,336 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : output_validator.py
+# Author    : ForesightInitiative
+# Version   : 1.0.1
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+Validation of generated OIMS metadata against the metametadata schema.
+
+OutputValidator.compile() turns the schema attributes into one AttributeCheck
+per attribute (data_type, multiple, valid_entity_class, requirement_level).
+The checks are run per content object and per attribute, not per entity:
+the entities of a content object's "metadata" list are first gathered into
+one column of values per attribute, and every check then runs over a whole
+column. Type checks look at the set of Python types in a column first and
+only inspect single values when that set is not already acceptable;
+pattern checks (date, url, email) test every distinct string once.
+
+Checks (OutputViolation.check):
+    unknown_attribute    the attribute is not defined in the schema
+    valid_entity_class   the attribute is not valid for the entity class of its content object
+    multiple             a list for an attribute that is not "multiple"
+    data_type            a value that does not match the attribute's data_type
+    requirement_level    a "required" attribute (other than a compound object) is
+                         missing: for every entity of a "metadata" list, and across
+                         all attributes_in_rows content objects of the same entity
+                         class of the document
+Every violation is returned; OutputViolation.entities holds the positions of
+all offending entities in the "metadata" list (empty for attributes_in_rows
+content objects).
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the compiled output validator.
+- Version 1.0.1: data_type messages name the attribute's own data_type.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+#! <%GTREE 1.1 Load standard python Libraries%>
+import re
+from collections import namedtuple
+
+#! <%GTREE 1.2 Load OIMS converter tool libraries%>
+from oims_structures.schema_index import SchemaIndex
+from validators.validation_plan import _normalize_entity_class
+
+# number of entity positions quoted in a violation message
+QUOTED_ENTITIES = 5
+
+#! <%GTREE 2 Data structures%>
+OutputViolation = namedtuple("OutputViolation", ["position", "content_object", "attribute", "check", "message", "entities"])
+
+AttributeCheck = namedtuple(
+    "AttributeCheck",
+    ["attribute_name", "data_type_name", "data_type", "multiple", "valid_entity_classes", "required"]
+)
+
+class OutputValidationError(ValueError):
+    """Raised with the complete list of violations found in a generated output."""
+    def __init__(self, violations):
+        self.violations = list(violations)
+        details = "\n".join(f"- {violation.message}" for violation in self.violations)
+        super().__init__(f"{len(self.violations)} output validation error(s):\n{details}")
+
+#! <%GTREE 3 Data type checks%>
+DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?")
+URL_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9+.-]*://\S+")
+EMAIL_PATTERN = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+# (types that are always valid, test for a single value)
+DataTypeCheck = namedtuple("DataTypeCheck", ["valid_types", "accepts"])
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _is_integer(value):
+    if isinstance(value, float):
+        return value.is_integer()
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _matches(pattern):
+    return lambda value: isinstance(value, str) and pattern.fullmatch(value) is not None
+
+TEXT_CHECK = DataTypeCheck(frozenset({str}), lambda value: isinstance(value, str))
+DATA_TYPE_CHECKS = {
+    "string": TEXT_CHECK,
+    "text": TEXT_CHECK,
+    "controlled_vocabulary": TEXT_CHECK,
+    "number": DataTypeCheck(frozenset({int, float}), _is_number),
+    "percentage": DataTypeCheck(frozenset({int, float}), _is_number),
+    "integer": DataTypeCheck(frozenset({int}), _is_integer),
+    "boolean": DataTypeCheck(frozenset({bool}), lambda value: isinstance(value, bool)),
+    "date": DataTypeCheck(frozenset(), _matches(DATE_PATTERN)),
+    "url": DataTypeCheck(frozenset(), _matches(URL_PATTERN)),
+    "email": DataTypeCheck(frozenset(), _matches(EMAIL_PATTERN)),
+    "compound_object": DataTypeCheck(frozenset({dict}), lambda value: isinstance(value, dict)),
+}
+
+def invalid_indices(data_type_check, values):
+    """
+    :param data_type_check: DataTypeCheck of the attribute.
+    :param values: List of values of one attribute.
+    :return: List with the indices of the values that do not match.
+    """
+    if data_type_check.valid_types and set(map(type, values)) <= data_type_check.valid_types:
+        return []
+    # strings repeat a lot (vocabularies, dates): test every distinct string once
+    verdicts = {}
+    invalid = []
+    for index, value in enumerate(values):
+        if type(value) is str:
+            valid = verdicts.get(value)
+            if valid is None:
+                valid = verdicts[value] = data_type_check.accepts(value)
+        else:
+            valid = data_type_check.accepts(value)
+        if not valid:
+            invalid.append(index)
+    return invalid
+
+#! <%GTREE 4 OutputValidator Class%>
+class OutputValidator:
+    #! <%GTREE 4.1 Compile the checks%>
+    def __init__(self, checks):
+        """
+        :param checks: Dictionary {attribute name: AttributeCheck} (see compile).
+        """
+        self.checks = checks
+        self._required = {}
+
+    @classmethod
+    def compile(cls, schema):
+        """
+        :param schema: SchemaIndex or schema dictionary.
+        :return: OutputValidator with one AttributeCheck per schema attribute.
+        """
+        schema_index = schema if isinstance(schema, SchemaIndex) else SchemaIndex(schema)
+        checks = {}
+        for attribute_name, attribute in schema_index.attributes.items():
+            requirement_level = attribute.get("requirement_level")
+            data_type_name = str(attribute.get("data_type")).strip()
+            checks[attribute_name] = AttributeCheck(
+                attribute_name,
+                data_type_name,
+                DATA_TYPE_CHECKS.get(data_type_name),
+                bool(attribute.get("multiple")),
+                frozenset(_normalize_entity_class(entity_class) for entity_class in attribute.get("valid_entity_class") or []),
+                # a compound object groups the attributes that follow it in the (flat) schema;
+                # the mappers write those members, whose own requirement levels are checked
+                isinstance(requirement_level, str) and requirement_level.strip() == "required"
+                and data_type_name != "compound_object",
+            )
+        return cls(checks)
+
+    def required_attributes(self, entity_class):
+        """
+        :return: Names of the required attributes that are valid for an entity class.
+        """
+        entity_class = _normalize_entity_class(entity_class)
+        if entity_class not in self._required:
+            self._required[entity_class] = tuple(
+                check.attribute_name for check in self.checks.values()
+                if check.required and entity_class in check.valid_entity_classes
+            )
+        return self._required[entity_class]
+
+    #! <%GTREE 4.2 Validate a document%>
+    def validate(self, output_data):
+        """
+        :param output_data: OIMS document dictionary.
+        :return: List of OutputViolation (empty if the output is valid).
+        """
+        violations = []
+        for _ in self.checked(output_data["OIMS"].get("OIMS_content", []), violations):
+            pass
+        return violations
+
+    def checked(self, content_objects, violations):
+        """
+        Check content objects while they pass through, e.g. on their way to the
+        output writer (OIMS_content may be a generator).
+
+        :param content_objects: Iterable of OIMS_content objects.
+        :param violations: List the violations are appended to; the document-level
+                           checks are appended once the content objects are exhausted.
+        :return: Generator yielding the content objects unchanged.
+        """
+        # attributes of the attributes_in_rows content objects per entity class
+        row_attributes = {}
+        for position, content_object in enumerate(content_objects):
+            violations.extend(self.check_content_object(position, content_object, row_attributes))
+            yield content_object
+
+        violations.extend(self.check_row_attributes(row_attributes))
+
+    def check_row_attributes(self, row_attributes):
+        """
+        :param row_attributes: Attributes of the attributes_in_rows content objects
+                               per entity class, collected by check_content_object.
+        :return: List of OutputViolation for the required attributes that are missing.
+        """
+        violations = []
+        for entity_class, (attribute_names, first_position, content_object_name) in row_attributes.items():
+            for attribute_name in self.required_attributes(entity_class):
+                if attribute_name not in attribute_names:
+                    violations.append(OutputViolation(
+                        first_position, content_object_name, attribute_name, "requirement_level",
+                        f"Required attribute '{attribute_name}' is missing for entity class '{entity_class}'.", ()
+                    ))
+        return violations
+
+    #! <%GTREE 4.3 Check one content object%>
+    def check_content_object(self, position, content_object, row_attributes=None):
+        """
+        :param position: Position of the content object in OIMS_content.
+        :param content_object: OIMS_content object.
+        :param row_attributes: Optional dictionary collecting the attributes of
+                               attributes_in_rows content objects per entity class.
+        :return: List of OutputViolation.
+        """
+        name = content_object.get("OIMS_content_object")
+        properties = content_object.get("OIMS_content_object_properties") or {}
+        entity_class = properties.get("entity_class")
+        entities = properties.get("metadata")
+        if isinstance(entities, list):
+            columns = self.columns(entities)
+            number_of_entities = len(entities)
+        else:
+            columns = {
+                attribute_name: ([0], [value]) for attribute_name, value in properties.items()
+                if attribute_name not in ("entity_class", "metadata")
+            }
+            number_of_entities = None
+            if row_attributes is not None:
+                attribute_names, _, _ = row_attributes.setdefault(
+                    _normalize_entity_class(entity_class), (set(), position, name)
+                )
+                attribute_names.update(columns)
+
+        violations = []
+        context = f"content object {position} ({name})"
+        normalized_entity_class = _normalize_entity_class(entity_class)
+        for attribute_name, (entity_positions, values) in columns.items():
+            violations.extend(self.check_column(
+                position, name, context, normalized_entity_class, attribute_name,
+                entity_positions, values, number_of_entities is not None
+            ))
+
+        if number_of_entities:
+            for attribute_name in self.required_attributes(entity_class):
+                present = columns.get(attribute_name, ((), ()))[0]
+                if len(present) < number_of_entities:
+                    missing = sorted(set(range(number_of_entities)).difference(present))
+                    violations.append(self.violation(
+                        position, name, attribute_name, "requirement_level",
+                        f"Required attribute '{attribute_name}' is missing in {context}", missing
+                    ))
+        return violations
+
+    @staticmethod
+    def columns(entities):
+        """
+        :return: Dictionary {attribute name: (entity positions, values)} of a "metadata" list.
+        """
+        columns = {}
+        for entity_position, entity in enumerate(entities):
+            for attribute_name, value in entity.items():
+                column = columns.get(attribute_name)
+                if column is None:
+                    column = columns[attribute_name] = ([], [])
+                column[0].append(entity_position)
+                column[1].append(value)
+        return columns
+
+    def check_column(self, position, name, context, entity_class, attribute_name, entity_positions, values, in_list):
+        check = self.checks.get(attribute_name)
+        if check is None:
+            return [self.violation(
+                position, name, attribute_name, "unknown_attribute",
+                f"Attribute '{attribute_name}' in {context} is not defined in the schema", entity_positions, in_list
+            )]
+
+        violations = []
+        if check.valid_entity_classes and entity_class not in check.valid_entity_classes:
+            violations.append(self.violation(
+                position, name, attribute_name, "valid_entity_class",
+                f"Attribute '{attribute_name}' is not valid for entity class '{entity_class}' in {context}",
+                entity_positions, in_list
+            ))
+
+        if list in set(map(type, values)):
+            if not check.multiple:
+                violations.append(self.violation(
+                    position, name, attribute_name, "multiple",
+                    f"Attribute '{attribute_name}' has several values but is not 'multiple' in {context}",
+                    [entity_position for entity_position, value in zip(entity_positions, values) if type(value) is list],
+                    in_list
+                ))
+            # check the items of the lists
+            flat_positions, flat_values = [], []
+            for entity_position, value in zip(entity_positions, values):
+                items = value if type(value) is list else (value,)
+                flat_positions.extend([entity_position] * len(items))
+                flat_values.extend(items)
+            entity_positions, values = flat_positions, flat_values
+
+        if check.data_type is not None:
+            invalid = invalid_indices(check.data_type, values)
+            if invalid:
+                examples = ", ".join(repr(values[index]) for index in invalid[:QUOTED_ENTITIES])
+                violations.append(self.violation(
+                    position, name, attribute_name, "data_type",
+                    f"Attribute '{attribute_name}' has values that are not of data type "
+                    f"'{check.data_type_name}' in {context} "
+                    f"({examples})",
+                    sorted(set(entity_positions[index] for index in invalid)), in_list
+                ))
+        return violations
+
+    @staticmethod
+    def violation(position, name, attribute_name, check, message, entity_positions, in_list=True):
+        entity_positions = tuple(entity_positions) if in_list else ()
+        if entity_positions:
+            quoted = ", ".join(str(entity_position) for entity_position in entity_positions[:QUOTED_ENTITIES])
+            more = f" and {len(entity_positions) - QUOTED_ENTITIES} more" if len(entity_positions) > QUOTED_ENTITIES else ""
+            message = f"{message} (entities {quoted}{more})."
+        else:
+            message = f"{message}."
+        return OutputViolation(position, name, attribute_name, check, message, entity_positions)
+
+#============================   End Of File   ================================
@@ -0,0 +1,274 @@
+#<%REGION File header%>
+#=============================================================================
+# File      : validation_plan.py
+# Author    : ForesightInitiative
+# Version   : 1.1.1
+# Date      : 2026-10-18
+# Changed   :
+# Changed by:
+# Remarks   :
+"""
+A validation plan is the compiled form of the checks in
+ExcelToOimsMappingValidator. It is built once from a mapping (and optionally
+the schema) and holds, per mapped sheet:
+    - the expected sheet name (and whether it may be missing or is skipped)
+    - the result of the orientation, subsection, content object and
+      entity class checks, which only depend on the mapping
+    - the field-name location assertions, compiled into index arrays
+
+Entity classes are checked against VALID_ENTITY_CLASSES only; entity classes
+that a schema happens to list do not widen that set.
+
+Applying the plan to a workbook only gathers the asserted cells and compares
+them. Every violation is collected and returned instead of stopping at the
+first one. Plans are immutable and can be pickled, so one plan can be shared
+by all workbooks (and worker processes) of a batch.
+"""
+# version history information   :
+"""
+- Version 1.0.0: Initial implementation of the compiled validation plan.
+- Version 1.1.0: The plan can be applied to a CellLookup (low-memory mode).
+- Version 1.1.1: The schema no longer widens the allowed entity classes.
+"""
+#=============================================================================
+#<%/REGION File header%>
+
+#! <%GTREE 1 Initialization%>
+#! <%GTREE 1.1 Load standard python Libraries%>
+from collections import namedtuple
+
+import numpy as np
+
+#! <%GTREE 1.2 Load OIMS converter tool libraries%>
+from utils.excel_address import compile_locations, gather
+from utils.instrumentation import instrumentation_of
+from oims_structures.schema_index import SchemaIndex
+from oims_structures.converter_data import (
+    OIMS_HEADER_SUBSECTIONS,
+    VALID_ENTITY_CLASSES,
+    VALID_TABLE_ORIENTATIONS,
+)
+
+#! <%GTREE 2 Data structures%>
+Violation = namedtuple("Violation", ["sheetname", "check", "message"])
+
+SheetChecks = namedtuple(
+    "SheetChecks",
+    ["sheetname", "mapping_violations", "field_names", "field_locs", "rows", "cols"]
+)
+
+class MappingValidationError(ValueError):
+    """Raised with the complete list of violations found by a validation plan."""
+    def __init__(self, violations):
+        self.violations = list(violations)
+        details = "\n".join(f"- {violation.message}" for violation in self.violations)
+        super().__init__(f"{len(self.violations)} validation error(s):\n{details}")
+
+def _normalize_entity_class(entity_class):
+    return str(entity_class).strip().replace(" ", "_") if entity_class else entity_class
+
+def _read_only(array):
+    array.setflags(write=False)
+    return array
+
+def _restore_plan(sheet_checks, schema_violations, allowed_missing_sheets):
+    # NumPy arrays come back writeable after unpickling
+    for checks in sheet_checks:
+        for array in (checks.field_names, checks.rows, checks.cols):
+            _read_only(array)
+    return ValidationPlan(sheet_checks, schema_violations, allowed_missing_sheets)
+
+#! <%GTREE 3 ValidationPlan Class%>
+class ValidationPlan(namedtuple("ValidationPlan", ["sheet_checks", "schema_violations", "allowed_missing_sheets"])):
+    __slots__ = ()
+
+    def __reduce__(self):
+        return (_restore_plan, tuple(self))
+
+    #! <%GTREE 3.1 Compile the plan%>
+    @classmethod
+    def compile(cls, mapping, schema=None, allowed_missing_sheets=None, sheets_to_skip=None):
+        """
+        Compile the checks for a mapping.
+
+        :param mapping: OIMS mapping dictionary.
+        :param schema: Optional SchemaIndex (or schema dictionary) to check the mapping against.
+        :param allowed_missing_sheets: Sheets that may be missing from a workbook.
+        :param sheets_to_skip: Sheets that are not validated.
+        :return: ValidationPlan instance.
+        """
+        sheets_to_skip = set(sheets_to_skip or [])
+        schema_index = None
+        if schema is not None:
+            schema_index = schema if isinstance(schema, SchemaIndex) else SchemaIndex(schema)
+        valid_entity_classes = set(VALID_ENTITY_CLASSES)
+
+        mapping_properties = mapping["OIMS"]["OIMS_content"]["OIMS_content"][0]["OIMS_content_object_properties"]
+        sheet_checks = []
+        for metadata_item in mapping_properties["metadata"]:
+            if metadata_item["sheetname"] in sheets_to_skip:
+                continue
+            sheet_checks.append(cls._compile_sheet(metadata_item, valid_entity_classes))
+
+        schema_violations = ()
+        if schema_index is not None:
+            schema_violations = tuple(cls._compile_schema_checks(mapping_properties, schema_index))
+
+        return cls(tuple(sheet_checks), tuple(schema_violations), frozenset(allowed_missing_sheets or []))
+
+    @staticmethod
+    def _compile_sheet(metadata_item, valid_entity_classes):
+        sheetname = metadata_item["sheetname"]
+        violations = []
+
+        # a. table orientation
+        table_orientation = metadata_item.get("table_orientation")
+        if table_orientation not in VALID_TABLE_ORIENTATIONS:
+            violations.append(Violation(sheetname, "table_orientation",
+                f"Invalid table orientation '{table_orientation}' for sheet '{sheetname}'."))
+
+        # b. field name locations, compiled into index arrays
+        field_names, field_locs = [], []
+        for attribute_pair in metadata_item.get("attribute_pairs", []):
+            if "excel_field_name" not in attribute_pair or "excel_field_name_loc" not in attribute_pair:
+                continue
+            try:
+                compile_locations([attribute_pair["excel_field_name_loc"]])
+            except ValueError as e:
+                violations.append(Violation(sheetname, "field_location", f"{e} Sheet '{sheetname}'."))
+                continue
+            field_names.append(attribute_pair["excel_field_name"])
+            field_locs.append(attribute_pair["excel_field_name_loc"])
+        rows, cols = compile_locations(field_locs)
+        field_name_array = np.empty(len(field_names), dtype=object)
+        field_name_array[:] = field_names
+
+        # c. OIMS_header subsections
+        if metadata_item.get("oims_section") == "OIMS_header":
+            oims_subsection = metadata_item.get("oims_subsection", "")
+            if oims_subsection not in OIMS_HEADER_SUBSECTIONS:
+                violations.append(Violation(sheetname, "oims_subsection",
+                    f"Invalid oims_subsection '{oims_subsection}' in sheet '{sheetname}'."))
+
+        # d. OIMS_content objects and entity classes
+        if metadata_item.get("oims_section") == "OIMS_content":
+            if not metadata_item.get("oims_content_object", None):
+                violations.append(Violation(sheetname, "oims_content_object",
+                    f"Missing oims_content_object in sheet '{sheetname}'."))
+            entity_class = metadata_item.get("entity_class", None)
+            if _normalize_entity_class(entity_class) not in valid_entity_classes:
+                violations.append(Violation(sheetname, "entity_class",
+                    f"Invalid entity class '{entity_class}' in sheet '{sheetname}'."))
+
+        return SheetChecks(
+            sheetname,
+            tuple(violations),
+            _read_only(field_name_array),
+            tuple(field_locs),
+            _read_only(rows),
+            _read_only(cols)
+        )
+
+    @staticmethod
+    def _compile_schema_checks(mapping_properties, schema_index):
+        # 1. the mapping must be validated for this schema
+        validated_schema_name = mapping_properties["validated_oims_metadata_schema"][0]
+        if validated_schema_name != schema_index.metadata_name:
+            yield Violation(None, "schema",
+                f"Schema mismatch: Mapping references '{validated_schema_name}', "
+                f"but schema defines '{schema_index.metadata_name}'.")
+
+        for metadata_item in mapping_properties["metadata"]:
+            # header attributes are OIMS header properties, content attributes come from the schema
+            if metadata_item.get("oims_section") == "OIMS_header":
+                expected_attributes = OIMS_HEADER_SUBSECTIONS.get(metadata_item.get("oims_subsection"))
+                if expected_attributes is None:
+                    continue
+            else:
+                expected_attributes = schema_index.attribute_names
+
+            for attribute_pair in metadata_item.get("attribute_pairs", []):
+                # 2. skip pairs where information_type is not "metadata_field_value"
+                if attribute_pair.get("information_type", "metadata_field_value") != "metadata_field_value":
+                    continue
+                # 3. the oims_attribute_id must be known
+                oims_attribute_id = attribute_pair.get("oims_attribute_id", None)
+                if oims_attribute_id and oims_attribute_id not in expected_attributes:
+                    yield Violation(metadata_item["sheetname"], "oims_attribute_id",
+                        f"Invalid oims_attribute_id '{oims_attribute_id}' in sheet '{metadata_item['sheetname']}'.")
+
+    #! <%GTREE 3.2 Apply the plan to a workbook%>
+    def apply(self, workbook, sheets=None):
+        """
+        Run the workbook checks of the plan.
+
+        :param workbook: WorkbookSession (or ExcelFile, or CellLookup) with the primary metadata.
+        :param sheets: Optional collection of sheet names to restrict the checks to.
+        :return: List of Violation tuples (empty if the workbook is valid).
+        """
+        violations = []
+        excel_sheets = set(workbook.sheet_names)
+        instrumentation = instrumentation_of(workbook)
+        for sheet_checks in self.sheet_checks:
+            sheetname = sheet_checks.sheetname
+            if sheets is not None and sheetname not in sheets:
+                continue
+
+            if sheetname not in excel_sheets:
+                if sheetname not in self.allowed_missing_sheets:
+                    violations.append(Violation(sheetname, "missing_sheet", f"Missing sheet '{sheetname}' in Excel file."))
+                continue
+
+            violations.extend(sheet_checks.mapping_violations)
+            with instrumentation.sheet(sheetname):
+                if hasattr(workbook, "gather"):
+                    # CellLookup from ExcelReader.read_cells: only the referenced cells are available
+                    found = np.array(workbook.gather(sheetname, sheet_checks.rows, sheet_checks.cols), dtype=object)
+                    violations.extend(self.check_found_values(sheet_checks, found))
+                else:
+                    violations.extend(self.check_field_locations(sheet_checks, workbook.parse(sheetname, header=None)))
+            instrumentation.count("sheets_validated")
+            instrumentation.count("field_locations_checked", len(sheet_checks.rows))
+        return violations
+
+    @staticmethod
+    def check_field_locations(sheet_checks, sheet_data):
+        """
+        Check all field-name locations of a sheet with a single NumPy gather.
+
+        :param sheet_checks: SheetChecks of the sheet.
+        :param sheet_data: DataFrame with the raw cell grid of the sheet (parsed with header=None).
+        :return: List of Violation tuples, one per mismatch.
+        """
+        if not len(sheet_checks.rows):
+            return []
+        found = gather(sheet_data.to_numpy(dtype=object), sheet_checks.rows, sheet_checks.cols)
+        return ValidationPlan.check_found_values(sheet_checks, found)
+
+    @staticmethod
+    def check_found_values(sheet_checks, found):
+        """
+        :param found: Object array with the values found at the field-name locations of a sheet.
+        :return: List of Violation tuples, one per mismatch.
+        """
+        if not len(sheet_checks.rows):
+            return []
+        mismatched = np.flatnonzero(found != sheet_checks.field_names)
+        return [
+            Violation(
+                sheet_checks.sheetname,
+                "field_location",
+                f"Field '{sheet_checks.field_names[i]}' not found at location '{sheet_checks.field_locs[i]}' "
+                f"in sheet '{sheet_checks.sheetname}' (found '{found[i]}')."
+            )
+            for i in mismatched
+        ]
+
+    #! <%GTREE 3.3 Mapping against schema%>
+    def check_schema(self):
+        """
+        :return: List of Violation tuples of the mapping against the schema (compiled once).
+        """
+        return list(self.schema_violations)
+
+#============================   End Of File   ================================